@@ -6,6 +6,12 @@ from compas_rhino.artists import MeshArtist
 # create a proxy for the numerical package of COMPAS
 numerical = Proxy('compas.numerical')
 
+# or, for large meshes,
+# create a proxy that transfers the data as packed binary arrays
+# and use the force density solver of the workshop package
+# from digitalfutures.utilities import PackedProxy
+# numerical = PackedProxy('digitalfutures.numerical')
+
 # make a mesh from a sample OBJ file
 mesh = Mesh.from_obj(compas.get('faces.obj'))
 
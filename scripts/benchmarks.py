@@ -0,0 +1,230 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import sys
+import glob
+import json
+
+from compas.datastructures import mesh_quads_to_triangles
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import mesh_unroll
+from digitalfutures.datastructures import mesh_subdivide_quad_tracked
+from digitalfutures.datastructures import mesh_offsets_numpy
+from digitalfutures.datastructures import shell_materialise_numpy
+from digitalfutures.numerical import FDSolver
+from digitalfutures.numerical import shell_dr_numpy
+from digitalfutures.utilities import Benchmark
+from digitalfutures.utilities import benchmark_compare
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+def load(filepath):
+    with open(filepath, 'r') as fp:
+        data = json.load(fp)
+    # session files store the shell together with the settings
+    if 'shell' in data and 'vertex' not in data:
+        data = data['shell']
+    return Shell.from_data(data)
+
+
+def subdivide(shell, k):
+    meshes = [shell]
+    for subd, edge_vertex, face_vertex, face_children in mesh_subdivide_quad_tracked(shell, k):
+        for fkey, children in face_children.items():
+            attr = meshes[-1].facedata.get(fkey)
+            if attr:
+                for child in children:
+                    subd.facedata[child] = attr.copy()
+        meshes.append(subd)
+    return meshes
+
+
+def fd_problem(shell):
+    key_index = shell.key_index()
+    vertices = shell.get_vertices_attributes('xyz')
+    edges = [(key_index[u], key_index[v]) for u, v in shell.edges()]
+    fixed = [key_index[key] for key in shell.vertices_where({'is_anchor': True})]
+    if not fixed:
+        fixed = [key_index[key] for key in shell.vertices_on_boundary()]
+    q = [shell.get_edge_attribute((u, v), 'q', 1.0) for u, v in shell.edges()]
+    loads = shell.get_vertices_attributes(('px', 'py', 'pz'), (0.0, 0.0, 0.0))
+    return vertices, edges, fixed, q, loads
+
+
+def fd(vertices, edges, fixed, q, loads):
+    return FDSolver(edges, fixed, len(vertices)).solve(vertices, q, loads)
+
+
+def materialised(shell):
+    vertices, edges, fixed, q, loads = fd_problem(shell)
+    xyz, q, f, l, _ = fd(vertices, edges, fixed, q, loads)
+    shell = shell.copy()
+    fixed = set(fixed)
+    for index, (key, attr) in enumerate(shell.vertices(True)):
+        attr['x'], attr['y'], attr['z'] = xyz[index]
+        attr['is_anchor'] = index in fixed
+    for index, (u, v, attr) in enumerate(shell.edges(True)):
+        attr['f'] = f[index, 0]
+        attr['is_edge'] = True
+    shell_materialise_numpy(shell, E=E, r=r, cables=False)
+    return shell
+
+
+def strips(shell):
+    return shell.face_groups(STRIP)
+
+
+def triangulated_strips(shell):
+    trimeshes = []
+    for faces in strips(shell).values():
+        vertices = {key: shell.vertex[key] for fkey in faces for key in shell.face[fkey]}
+        trimesh = Shell()
+        for key in vertices:
+            trimesh.add_vertex(key=key, attr_dict=vertices[key].copy())
+        for fkey in faces:
+            trimesh.add_face(shell.face_vertices(fkey), fkey=fkey)
+        mesh_quads_to_triangles(trimesh, check_angles=True)
+        trimeshes.append(trimesh)
+    return trimeshes
+
+
+def unroll(trimeshes):
+    for trimesh in trimeshes:
+        fkey = trimesh.get_any_face()
+        u, v = trimesh.face_halfedges(fkey)[0]
+        mesh_unroll(trimesh, (u, v))
+
+
+def lazy(func):
+    # the inputs of the cases are only prepared if the cases are run
+    result = []
+    def get():
+        if not result:
+            result.append(func())
+        return result[0]
+    return get
+
+
+def add_cases(bench, name, levels, level):
+    shell = lazy(lambda: levels()[level])
+    text = lazy(lambda: json.dumps(shell().to_data()))
+    problem = lazy(lambda: fd_problem(shell()))
+    materialised_shell = lazy(lambda: materialised(shell()))
+    trimeshes = lazy(lambda: triangulated_strips(shell()))
+
+    tags = {
+        'design': name,
+        'level': level,
+        'vertices': lambda: shell().number_of_vertices(),
+        'faces': lambda: shell().number_of_faces()}
+
+    def case(operation, func, setup=None):
+        bench.add('{}/{}/{}'.format(name, level, operation), func, setup, operation=operation, **tags)
+
+    case('json', lambda text: Shell.from_data(json.loads(text)), lambda: (text(), ))
+    case('offsets', mesh_offsets_numpy, lambda: (shell(), THICKNESS))
+    case('triangulation', mesh_quads_to_triangles, lambda: (shell().copy(), ))
+    case('fd', fd, problem)
+    case('dr', lambda shell: shell_dr_numpy(shell, kmax=KMAX), lambda: (materialised_shell().copy(), ))
+
+    # only the designs with strips are unrolled
+    if name in STRIPS:
+        case('strips', strips, lambda: (shell(), ))
+        case('unroll', unroll, lambda: (trimeshes(), ))
+
+# ==============================================================================
+# Initialise
+# ==============================================================================
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
+TEMP = os.path.join(DATA, '__temp__')
+CACHE = os.path.join(TEMP, '__cache__', 'benchmarks')
+
+FILE_O = os.path.join(CACHE, 'results.json')
+FILE_B = os.path.join(CACHE, 'baseline.json')
+
+DESIGNS = [
+    ('data', os.path.join(DATA, 'data.json')),
+    ('fabric', os.path.join(DATA, 'fabric.json')),
+    ('iteration1', os.path.join(TEMP, 'iteration1.json')),
+    ('iteration2', os.path.join(TEMP, 'iteration2.json')),
+    ('iteration3', os.path.join(TEMP, 'iteration3.json')),
+    ('iteration4', os.path.join(TEMP, 'iteration4.json')),
+    ('iterations5', os.path.join(TEMP, 'iterations5.json')),
+    ('caged', os.path.join(TEMP, 'caged.json')),
+    ('caged2', os.path.join(TEMP, 'caged2.json')),
+    ('caged3', os.path.join(TEMP, 'caged3.json')),
+    ('caged4', os.path.join(TEMP, 'caged4.json')),
+    ('torus4', os.path.join(TEMP, 'torus4.json')),
+    ('helix', os.path.join(TEMP, 'helix.json')),
+    ('hypar', os.path.join(TEMP, 'hypar.json')),
+    ('shajay', os.path.join(TEMP, 'shajay.json'))]
+
+# the synthetic shells generated by scripts/synthetic.py are measured without subdivision
+SYNTHETIC = [(os.path.splitext(os.path.basename(path))[0], path) for path in sorted(glob.glob(os.path.join(TEMP, 'synthetic', '*.json')))]
+
+# the number of levels of subdivision of every design
+LEVELS = 2
+
+# the number of timed runs per case
+REPEAT = 3
+
+# the relative increase of time or memory that counts as a regression
+THRESHOLD = 0.25
+
+STRIP = 'strip'
+STRIPS = ['fabric'] + [name for name, path in SYNTHETIC if name.startswith('fabric')]
+THICKNESS = 0.04
+KMAX = 100
+E = 210
+r = 2
+
+# ==============================================================================
+# Run
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    # only the cases of which the name contains one of the arguments are run
+    # for example, all cases of the design data, or the unrolling of all designs
+    # python scripts/benchmarks.py data/ /unroll
+
+    BENCH = Benchmark(repeat=REPEAT)
+
+    for NAME, FILE_I in DESIGNS:
+        SHELLS = lazy(lambda path=FILE_I: subdivide(load(path), LEVELS))
+        for LEVEL in range(LEVELS + 1):
+            add_cases(BENCH, NAME, SHELLS, LEVEL)
+
+    for NAME, FILE_I in SYNTHETIC:
+        add_cases(BENCH, NAME, lazy(lambda path=FILE_I: [load(path)]), 0)
+
+    RESULTS = BENCH.run(sys.argv[1:])
+
+    if not os.path.isdir(CACHE):
+        os.makedirs(CACHE)
+
+    Benchmark.to_json(RESULTS, FILE_O)
+
+    # the first results are stored as the baseline
+    # delete the baseline file to replace it with the next results
+
+    if not os.path.isfile(FILE_B):
+        Benchmark.to_json(RESULTS, FILE_B)
+        print("Baseline stored in {}".format(FILE_B))
+
+    else:
+        BASELINE = Benchmark.from_json(FILE_B)
+        COMPARISON = benchmark_compare(RESULTS, BASELINE, threshold=THRESHOLD)
+        for ITEM in COMPARISON:
+            if ITEM['regression']:
+                print("REGRESSION {}: time x{:.2f}, memory x{}".format(
+                    ITEM['name'], ITEM['time'], '-' if ITEM['peak'] is None else '{:.2f}'.format(ITEM['peak'])))
+        print("{} of {} cases slower or larger than the baseline by more than {:.0%}".format(
+            sum(ITEM['regression'] for ITEM in COMPARISON), len(COMPARISON), THRESHOLD))
@@ -5,7 +5,7 @@ from __future__ import division
 import os
 
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+from digitalfutures.artists import ShellArtist
 
 # ==============================================================================
 # Initialise
@@ -5,14 +5,16 @@ from __future__ import division
 import os
 
 from compas.geometry import add_vectors
-from compas.geometry import intersection_line_plane
 from compas.geometry import subtract_vectors
 from compas.geometry import normalize_vector
 from compas.geometry import scale_vector
 from compas.geometry import cross_vectors
 
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+from digitalfutures.artists import ShellArtist
+from compas.rpc import Proxy
+
+GEOMETRY = Proxy('digitalfutures.geometry')
 
 # ==============================================================================
 # Helpers
@@ -75,6 +77,10 @@ BEAMS = [
 POINTS = []
 LINES = []
 
+KEYS = []
+EXTENSIONS = []
+PLANES = []
+
 # ==============================================================================
 # Clamps
 # ==============================================================================
@@ -99,20 +105,26 @@ for keys in BEAMS:
     origin = add_vectors(origin, scale_vector(normal, OFFSET))
     plane = (origin, normal)
 
-    points = []
     for key in keys:
         a = SHELL.vertex_coordinates(key)
         r = SHELL.get_vertex_attributes(key, ['rx', 'ry', 'rz'])
-        b = add_vectors(a, r)
+        KEYS.append(key)
+        EXTENSIONS.append([a, add_vectors(a, r)])
+        PLANES.append(plane)
+
+# ==============================================================================
+# Extensions
+# ==============================================================================
 
-        line = a, b
-        x = intersection_line_plane(line, plane)
+XYZ, _, MASK = GEOMETRY.intersection_lines_planes_numpy(EXTENSIONS, PLANES)
 
-        points.append(x)
-        POINTS.append({
-            'pos'   : x,
-            'color' : (0, 0, 255),
-            'name'  : "{}.{}.extensions".format(SHELL.name, key)})
+for key, x, hit in zip(KEYS, XYZ, MASK):
+    if not hit:
+        continue
+    POINTS.append({
+        'pos'   : x,
+        'color' : (0, 0, 255),
+        'name'  : "{}.{}.extensions".format(SHELL.name, key)})
 
 # ==============================================================================
 # Visualize
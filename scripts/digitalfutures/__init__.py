@@ -0,0 +1,34 @@
+"""
+********************************************************************************
+digitalfutures
+********************************************************************************
+
+.. currentmodule:: digitalfutures
+
+Shared data structures and algorithms for the scripts of the workshop.
+
+.. note::
+
+    As in COMPAS, the suffix `_numpy` indicates that a function uses Numpy and/or Scipy.
+    In Rhino, these variants are not available directly and have to be accessed
+    through an `RPC` service (:class:`compas.rpc.Proxy`).
+
+.. toctree::
+    :maxdepth: 1
+
+    digitalfutures.artists
+    digitalfutures.datastructures
+    digitalfutures.geometry
+    digitalfutures.numerical
+    digitalfutures.utilities
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+
+__version__ = '0.1.0'
+
+
+__all__ = []
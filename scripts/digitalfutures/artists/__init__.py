@@ -0,0 +1,56 @@
+"""
+********************************************************************************
+digitalfutures.artists
+********************************************************************************
+
+.. currentmodule:: digitalfutures.artists
+
+Artists for the visualisation of the results of the scripts.
+In Rhino, :class:`MeshArtist` is the artist of :mod:`compas_rhino`,
+and :class:`ShellArtist` extends the artist of :mod:`compas_fofin.rhino`
+with batched drawing of groups of faces (:meth:`ShellArtist.draw_facegroups`).
+Elsewhere, they are the headless recording artists,
+such that the scripts run unchanged, for example on a build server.
+
+
+Classes
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    MeshArtist
+    ShellArtist
+    Recording
+    RecordingMeshArtist
+    RecordingShellArtist
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from .recording import *
+
+
+
+def _is_rhino():
+    try:
+        import rhinoscriptsyntax  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+HEADLESS = not _is_rhino()
+
+if HEADLESS:
+    MeshArtist = RecordingMeshArtist
+    ShellArtist = RecordingShellArtist
+else:
+    from compas_rhino.artists import MeshArtist
+    from .shellartist import ShellArtist
+
+
+__all__ = [name for name in dir() if not name.startswith('_')]
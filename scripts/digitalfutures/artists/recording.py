@@ -0,0 +1,511 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import json
+import atexit
+
+from array import array
+
+from compas.geometry import add_vectors
+from compas.geometry import scale_vector
+
+
+__all__ = [
+    'Recording',
+    'RecordingMeshArtist',
+    'RecordingShellArtist',
+    'RECORDING',
+]
+
+
+class _Table(object):
+
+    def __init__(self):
+        self.xyz = array('d')
+        self.offsets = array('i', [0])
+        self.color = array('B')
+        self.layer = array('i')
+        self.name = []
+        self.data = []
+
+    def __len__(self):
+        return len(self.layer)
+
+    def append(self, points, color, layer, name, data):
+        for point in points:
+            self.xyz.extend(point[:3])
+        self.offsets.append(len(self.xyz) // 3)
+        self.color.extend(color)
+        self.layer.append(layer)
+        self.name.append(name)
+        self.data.append(data)
+        return len(self.layer) - 1
+
+    def points(self, index):
+        xyz = self.xyz[3 * self.offsets[index]:3 * self.offsets[index + 1]]
+        return [list(xyz[i:i + 3]) for i in range(0, len(xyz), 3)]
+
+    def keep(self, indices):
+        table = _Table()
+        for index in indices:
+            table.append(self.points(index), self.color[3 * index:3 * index + 3], self.layer[index], self.name[index], self.data[index])
+        self.__dict__.update(table.__dict__)
+
+    def to_data(self):
+        return {
+            'xyz': self.xyz.tolist(),
+            'offsets': self.offsets.tolist(),
+            'color': self.color.tolist(),
+            'layer': self.layer.tolist(),
+            'name': self.name,
+            'data': self.data}
+
+
+class Recording(object):
+    """Geometry drawn by headless artists, stored in flat arrays.
+
+    Attributes
+    ----------
+    layers : list
+        The names of the layers, in the order in which they were first used.
+    points : object
+        The recorded points.
+    lines : object
+        The recorded lines.
+    polygons : object
+        The recorded polygons.
+    labels : object
+        The recorded text labels.
+
+    Notes
+    -----
+    Every kind of geometry is stored in a table of flat arrays (:mod:`array`):
+    the coordinates of all items (``xyz``), the offsets of the coordinates of every item
+    in compressed row format (``offsets``), the RGB colors (``color``),
+    and the indices of the layers (``layer``).
+    The names of the items and additional data (the text of labels,
+    the arrow heads of lines, the radius of force lines) are stored in lists (``name``, ``data``).
+
+    The arrays are available in IronPython as well.
+
+    Examples
+    --------
+    >>> recording = Recording()
+    >>> artist = RecordingShellArtist(shell, layer="Shell", recording=recording)
+    >>> artist.draw_edges()
+    >>> recording.to_svg('shell.svg')
+
+    """
+
+    def __init__(self):
+        self.layers = []
+        self._layer_index = {}
+        self.points = _Table()
+        self.lines = _Table()
+        self.polygons = _Table()
+        self.labels = _Table()
+
+    def __len__(self):
+        return len(self.points) + len(self.lines) + len(self.polygons) + len(self.labels)
+
+    def tables(self):
+        """The tables of the recorded geometry.
+
+        Returns
+        -------
+        list
+            The name and table of every kind of geometry.
+
+        """
+        return [('points', self.points), ('lines', self.lines), ('polygons', self.polygons), ('labels', self.labels)]
+
+    def layer_index(self, layer):
+        """The index of a layer, adding the layer if it is new.
+
+        Parameters
+        ----------
+        layer : str
+            The name of the layer.
+
+        Returns
+        -------
+        int
+            The index of the layer.
+
+        """
+        layer = layer or ''
+        if layer not in self._layer_index:
+            self._layer_index[layer] = len(self.layers)
+            self.layers.append(layer)
+        return self._layer_index[layer]
+
+    def add(self, kind, points, color, layer, name, data=None):
+        """Record an item.
+
+        Parameters
+        ----------
+        kind : {'points', 'lines', 'polygons', 'labels'}
+            The kind of geometry.
+        points : list
+            The coordinates of the points of the item.
+        color : tuple
+            The RGB color of the item.
+        layer : str
+            The name of the layer.
+        name : str
+            The name of the item.
+        data : object, optional
+            Additional data.
+
+        Returns
+        -------
+        int
+            The index of the item in the table of its kind.
+
+        """
+        table = getattr(self, kind)
+        return table.append(points, color or (0, 0, 0), self.layer_index(layer), name, data)
+
+    def clear(self, layer=None):
+        """Remove the recorded items of a layer and its sublayers.
+
+        Parameters
+        ----------
+        layer : str, optional
+            The name of the layer.
+            Default is to remove all items.
+
+        """
+        if not layer:
+            self.__init__()
+            return
+        layers = set(index for name, index in self._layer_index.items() if name == layer or name.startswith(layer + '::'))
+        if not layers:
+            return
+        for kind, table in self.tables():
+            table.keep([index for index in range(len(table)) if table.layer[index] not in layers])
+
+    def to_data(self):
+        """The recorded geometry as a dict of lists.
+
+        Returns
+        -------
+        dict
+            The layers and the arrays of all tables.
+
+        """
+        data = {'layers': self.layers}
+        for kind, table in self.tables():
+            data[kind] = table.to_data()
+        return data
+
+    def to_json(self, filepath):
+        """Write the recorded geometry to a JSON file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file.
+
+        """
+        with open(filepath, 'w') as fp:
+            json.dump(self.to_data(), fp)
+
+    def save(self, filepath):
+        """Write the recorded geometry to a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file.
+            The geometry is written as SVG if the name of the file ends with ``.svg``,
+            and as JSON otherwise.
+
+        """
+        if filepath.endswith('.svg'):
+            self.to_svg(filepath)
+        else:
+            self.to_json(filepath)
+
+    def to_svg(self, filepath, width=1000, margin=20):
+        """Write a top view (XY) of the recorded geometry to an SVG file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file.
+        width : int, optional
+            The width of the drawing in pixels.
+            Default is ``1000``.
+        margin : int, optional
+            The margin around the geometry in pixels.
+            Default is ``20``.
+
+        """
+        xy = [(x, y) for table in (self.points, self.lines, self.polygons, self.labels) for x, y in zip(table.xyz[0::3], table.xyz[1::3])]
+        if xy:
+            xmin = min(x for x, y in xy)
+            xmax = max(x for x, y in xy)
+            ymin = min(y for x, y in xy)
+            ymax = max(y for x, y in xy)
+        else:
+            xmin = xmax = ymin = ymax = 0.0
+        scale = (width - 2 * margin) / max(xmax - xmin, ymax - ymin, 1e-12)
+        height = int(2 * margin + scale * (ymax - ymin))
+
+        def coordinates(points):
+            return ' '.join('{:.2f},{:.2f}'.format(margin + scale * (x - xmin), height - margin - scale * (y - ymin)) for x, y, z in points)
+
+        def rgb(table, index):
+            return 'rgb({},{},{})'.format(*table.color[3 * index:3 * index + 3])
+
+        elements = []
+        for index in range(len(self.polygons)):
+            elements.append('<polygon points="{}" fill="{}" fill-opacity="0.5" stroke="none"/>'.format(
+                coordinates(self.polygons.points(index)), rgb(self.polygons, index)))
+        for index in range(len(self.lines)):
+            elements.append('<polyline points="{}" fill="none" stroke="{}" stroke-width="1"/>'.format(
+                coordinates(self.lines.points(index)), rgb(self.lines, index)))
+        for index in range(len(self.points)):
+            x, y = coordinates(self.points.points(index)).split(',')
+            elements.append('<circle cx="{}" cy="{}" r="2" fill="{}"/>'.format(x, y, rgb(self.points, index)))
+        for index in range(len(self.labels)):
+            x, y = coordinates(self.labels.points(index)).split(',')
+            elements.append('<text x="{}" y="{}" font-size="8" fill="{}">{}</text>'.format(x, y, rgb(self.labels, index), self.labels.data[index]))
+
+        with open(filepath, 'w') as fp:
+            fp.write('<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}">\n'.format(width, height))
+            for element in elements:
+                fp.write(element + '\n')
+            fp.write('</svg>\n')
+
+
+RECORDING = Recording()
+
+
+def _finish(filepath):
+    if len(RECORDING):
+        RECORDING.save(filepath)
+        print("Recording written to {}".format(filepath))
+
+
+# the shared recording is written to the file in the environment variable
+# DIGITALFUTURES_RECORDING when the script exits
+# such that scripts that never call redraw are recorded as well
+
+if os.environ.get('DIGITALFUTURES_RECORDING'):
+    atexit.register(_finish, os.environ['DIGITALFUTURES_RECORDING'])
+
+
+def _colors(keys, color, default):
+    if isinstance(color, dict):
+        return {key: color.get(key, default) for key in keys}
+    return {key: color or default for key in keys}
+
+
+class RecordingMeshArtist(object):
+    """Headless artist with the drawing interface of :class:`compas_rhino.artists.MeshArtist`.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The mesh, or ``None``.
+    layer : str, optional
+        The name of the layer.
+    recording : Recording, optional
+        The recording to draw into.
+        Default is the shared recording :data:`RECORDING`.
+
+    Notes
+    -----
+    The draw methods return the indices of the recorded items, instead of the guids of Rhino objects.
+    :meth:`redraw` writes the recording to the file in the environment variable
+    ``DIGITALFUTURES_RECORDING``, if it is set,
+    as SVG if the name of the file ends with ``.svg``, and as JSON otherwise.
+    The shared recording is also written to this file when the script exits.
+
+    Examples
+    --------
+    >>> artist = RecordingMeshArtist(mesh, layer="Mesh")
+    >>> artist.clear_layer()
+    >>> artist.draw_mesh()
+    >>> artist.draw_faces(color=(255, 0, 0))
+    >>> artist.redraw()
+
+    """
+
+    defaults = {
+        'color.vertex': (255, 255, 255),
+        'color.edge': (0, 0, 0),
+        'color.face': (210, 210, 210),
+        'color.normal': (0, 255, 0),
+        'color.label': (0, 0, 0),
+    }
+
+    def __init__(self, mesh, layer=None, recording=None):
+        self.mesh = mesh
+        self.layer = layer
+        self.recording = recording or RECORDING
+
+    @property
+    def _name(self):
+        return self.mesh.name if self.mesh is not None else 'Mesh'
+
+    def _add(self, kind, points, color, name, data=None):
+        return self.recording.add(kind, points, color, self.layer, name, data)
+
+    # --------------------------------------------------------------------------
+    # layers
+    # --------------------------------------------------------------------------
+
+    def clear_layer(self):
+        """Remove the recorded items of the layer of the artist and its sublayers."""
+        self.recording.clear(self.layer)
+
+    def redraw(self, timeout=None):
+        """Write the recording to the file in ``DIGITALFUTURES_RECORDING``, if set."""
+        filepath = os.environ.get('DIGITALFUTURES_RECORDING')
+        if filepath:
+            self.recording.save(filepath)
+
+    # --------------------------------------------------------------------------
+    # primitives
+    # --------------------------------------------------------------------------
+
+    def draw_points(self, points):
+        return [self._add('points', [point['pos']], point.get('color'), point.get('name')) for point in points]
+
+    def draw_lines(self, lines):
+        return [self._add('lines', [line['start'], line['end']], line.get('color'), line.get('name'), line.get('arrow')) for line in lines]
+
+    def draw_polygons(self, polygons):
+        return [self._add('polygons', polygon['points'], polygon.get('color'), polygon.get('name')) for polygon in polygons]
+
+    # --------------------------------------------------------------------------
+    # mesh
+    # --------------------------------------------------------------------------
+
+    def draw_mesh(self, color=None, disjoint=False):
+        color = color or self.defaults['color.face']
+        name = "{}.mesh".format(self._name)
+        return [self._add('polygons', self.mesh.face_coordinates(fkey), color, name) for fkey in self.mesh.faces()]
+
+    def draw_vertices(self, keys=None, color=None):
+        keys = keys or list(self.mesh.vertices())
+        colors = _colors(keys, color, self.defaults['color.vertex'])
+        return [self._add('points', [self.mesh.vertex_coordinates(key)], colors[key], "{}.vertex.{}".format(self._name, key)) for key in keys]
+
+    def draw_edges(self, keys=None, color=None):
+        keys = keys or list(self.mesh.edges())
+        colors = _colors(keys, color, self.defaults['color.edge'])
+        return [self._add('lines', [self.mesh.vertex_coordinates(u), self.mesh.vertex_coordinates(v)], colors[u, v], "{}.edge.{}-{}".format(self._name, u, v)) for u, v in keys]
+
+    def draw_faces(self, keys=None, color=None, join_faces=False):
+        keys = keys or list(self.mesh.faces())
+        colors = _colors(keys, color, self.defaults['color.face'])
+        return [self._add('polygons', self.mesh.face_coordinates(fkey), colors[fkey], "{}.face.{}".format(self._name, fkey)) for fkey in keys]
+
+    def draw_facenormals(self, color=None, scale=1.0):
+        color = color or self.defaults['color.normal']
+        guids = []
+        for fkey in self.mesh.faces():
+            a = self.mesh.face_centroid(fkey)
+            b = add_vectors(a, scale_vector(self.mesh.face_normal(fkey), scale))
+            guids.append(self._add('lines', [a, b], color, "{}.face.normal.{}".format(self._name, fkey), 'end'))
+        return guids
+
+    def draw_vertexlabels(self, text=None, color=None):
+        text = text or {key: str(key) for key in self.mesh.vertices()}
+        colors = _colors(text, color, self.defaults['color.label'])
+        return [self._add('labels', [self.mesh.vertex_coordinates(key)], colors[key], "{}.vertex.label.{}".format(self._name, key), text[key]) for key in text]
+
+    def draw_facelabels(self, text=None, color=None):
+        text = text or {fkey: str(fkey) for fkey in self.mesh.faces()}
+        colors = _colors(text, color, self.defaults['color.label'])
+        return [self._add('labels', [self.mesh.face_centroid(fkey)], colors[fkey], "{}.face.label.{}".format(self._name, fkey), text[fkey]) for fkey in text]
+
+
+    def draw_facegroups(self, groups):
+        """Draw groups of faces, with their labels, points and polygons.
+
+        Parameters
+        ----------
+        groups : list of dict
+            The groups, as for :meth:`digitalfutures.artists.ShellArtist.draw_facegroups`.
+
+        Returns
+        -------
+        list
+            The indices of the recorded faces of every group.
+
+        """
+        layer = self.layer
+        for group in groups:
+            if group.get('clear'):
+                self.recording.clear(group.get('layer') or layer)
+        indices = []
+        for group in groups:
+            mesh = group.get('mesh') or self.mesh
+            keys = group.get('keys') or list(mesh.faces())
+            name = group.get('name') or "{}.mesh".format(mesh.name)
+            color = group.get('color') or self.defaults['color.face']
+            self.layer = group.get('layer') or layer
+            indices.append([self._add('polygons', mesh.face_coordinates(fkey), color, name) for fkey in keys])
+            labels = group.get('labels') or {}
+            for fkey, text in labels.items():
+                self._add('labels', [mesh.face_centroid(fkey)], self.defaults['color.label'], "{}.face.label.{}".format(mesh.name, fkey), text)
+            self.draw_points(group.get('points') or [])
+            self.draw_polygons(group.get('polygons') or [])
+        self.layer = layer
+        return indices
+
+
+class RecordingShellArtist(RecordingMeshArtist):
+    """Headless artist with the drawing interface of :class:`compas_fofin.rhino.ShellArtist`.
+
+    Parameters
+    ----------
+    shell : Shell
+        The shell, or ``None``.
+    layer : str, optional
+        The name of the layer.
+    recording : Recording, optional
+        The recording to draw into.
+        Default is the shared recording :data:`RECORDING`.
+
+    Notes
+    -----
+    Reactions are recorded as lines from the anchors in the opposite direction of the residual forces.
+    Forces are recorded as lines along the edges, with the radius of the force pipe as data.
+
+    """
+
+    defaults = dict(RecordingMeshArtist.defaults)
+    defaults.update({
+        'color.reaction': (0, 255, 0),
+        'color.tension': (255, 0, 0),
+        'color.compression': (0, 0, 255),
+    })
+
+    def draw_reactions(self, scale=1.0, color=None):
+        color = color or self.defaults['color.reaction']
+        guids = []
+        for key, attr in self.mesh.vertices_where({'is_anchor': True}, True):
+            a = self.mesh.vertex_coordinates(key)
+            b = add_vectors(a, scale_vector([attr['rx'], attr['ry'], attr['rz']], -scale))
+            guids.append(self._add('lines', [a, b], color, "{}.reaction.{}".format(self._name, key), 'start'))
+        return guids
+
+    def draw_forces(self, scale=1.0, color=None):
+        guids = []
+        for u, v, attr in self.mesh.edges(True):
+            f = attr['f']
+            if color:
+                c = color
+            else:
+                c = self.defaults['color.tension'] if f >= 0 else self.defaults['color.compression']
+            points = [self.mesh.vertex_coordinates(u), self.mesh.vertex_coordinates(v)]
+            guids.append(self._add('lines', points, c, "{}.force.{}-{}".format(self._name, u, v), scale * abs(f)))
+        return guids
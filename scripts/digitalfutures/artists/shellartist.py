@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas
+import compas_rhino
+
+from compas.geometry import centroid_points
+
+from compas_fofin.rhino import ShellArtist as FofinShellArtist
+
+try:
+    import rhinoscriptsyntax as rs
+except ImportError:
+    compas.raise_if_ironpython()
+
+
+__all__ = [
+    'ShellArtist',
+]
+
+
+def _facegroup_mesh(mesh, keys):
+    key_index = {}
+    vertices = []
+    faces = []
+    for fkey in keys:
+        face = []
+        for key in mesh.face_vertices(fkey):
+            if key not in key_index:
+                key_index[key] = len(vertices)
+                vertices.append(mesh.vertex_coordinates(key))
+            face.append(key_index[key])
+        if len(face) == 3:
+            faces.append(face + face[-1:])
+        elif len(face) == 4:
+            faces.append(face)
+        else:
+            c = len(vertices)
+            vertices.append(centroid_points([vertices[i] for i in face]))
+            faces += [[a, b, c, c] for a, b in zip(face, face[1:] + face[:1])]
+    return vertices, faces
+
+
+class ShellArtist(FofinShellArtist):
+    """Extension of the ``compas_fofin`` shell artist with batched drawing of face groups.
+
+    Parameters
+    ----------
+    shell : Shell
+        The shell, or ``None``.
+    layer : str, optional
+        The name of the layer.
+
+    Examples
+    --------
+    >>> artist = ShellArtist(fabric, layer="Fabric")
+    >>> artist.draw_facegroups([
+    ...     {'keys': faces, 'layer': "Fabric::SOUTH-{}".format(i), 'color': (255, 0, 0)}
+    ...     for i, faces in enumerate(strips)])
+    >>> artist.redraw()
+
+    """
+
+    def draw_facegroups(self, groups):
+        """Draw groups of faces as joined meshes, with their labels, points and polygons.
+
+        Parameters
+        ----------
+        groups : list of dict
+            The groups, with the following items, all optional:
+
+            * ``'mesh'``: the mesh of the faces, defaults to the mesh of the artist,
+            * ``'keys'``: the faces, defaults to all faces of the mesh,
+            * ``'layer'``: the layer, defaults to the layer of the artist,
+            * ``'clear'``: clear the layer first, defaults to ``False``,
+            * ``'color'``: the color of the joined mesh,
+            * ``'name'``: the name of the joined mesh, defaults to ``"{mesh.name}.mesh"``,
+            * ``'labels'``: a dict mapping faces to the text of their labels,
+            * ``'points'``: points, as for :meth:`draw_points`,
+            * ``'polygons'``: polygons, as for :meth:`draw_polygons`.
+
+        Returns
+        -------
+        list
+            The guid of the mesh of every group.
+
+        Notes
+        -----
+        The faces of every group are added as a single mesh, instead of adding every face
+        as a separate mesh and joining them afterwards, as :meth:`draw_faces` does with ``join_faces=True``.
+        Redrawing is disabled until the next call to :meth:`redraw`.
+
+        """
+        rs.EnableRedraw(False)
+        layers = [group.get('layer') or self.layer for group in groups if group.get('clear')]
+        if layers:
+            compas_rhino.clear_layers(layers)
+        guids = []
+        for group in groups:
+            mesh = group.get('mesh') or self.mesh
+            keys = group.get('keys') or list(mesh.faces())
+            layer = group.get('layer') or self.layer
+            name = group.get('name') or "{}.mesh".format(mesh.name)
+            vertices, faces = _facegroup_mesh(mesh, keys)
+            guids.append(compas_rhino.draw_mesh(vertices, faces, name=name, color=group.get('color'), layer=layer, clear=False, redraw=False))
+            labels = group.get('labels')
+            if labels:
+                compas_rhino.draw_labels([{
+                    'pos': mesh.face_centroid(fkey),
+                    'text': text,
+                    'name': "{}.face.label.{}".format(mesh.name, fkey)} for fkey, text in labels.items()], layer=layer, clear=False, redraw=False)
+            if group.get('points'):
+                compas_rhino.draw_points(group['points'], layer=layer, clear=False, redraw=False)
+            if group.get('polygons'):
+                compas_rhino.draw_polylines(group['polygons'], layer=layer, clear=False, redraw=False)
+        return guids
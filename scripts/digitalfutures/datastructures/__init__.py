@@ -0,0 +1,72 @@
+"""
+********************************************************************************
+digitalfutures.datastructures
+********************************************************************************
+
+.. currentmodule:: digitalfutures.datastructures
+
+
+Classes
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Shell
+    CableIndex
+    FaceHierarchy
+    MeshSnapshot
+
+
+Functions
+=========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    mesh_unroll
+    mesh_subdivide_quad_tracked
+    shell_subdivide_labelled
+    shell_synthetic
+    shell_materialise_numpy
+    mesh_to_snapshot_numpy
+    mesh_from_snapshot_numpy
+    json_to_snapshot_numpy
+    mesh_xyz_numpy
+    mesh_face_indices_numpy
+    mesh_edge_indices_numpy
+    mesh_vertex_normals_numpy
+    mesh_offset_numpy
+    mesh_offsets_numpy
+    mesh_solid_numpy
+    shell_volume_numpy
+    mesh_vertex_pairs_numpy
+    mesh_vertex_map_numpy
+    mesh_transfer_attributes_numpy
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas
+
+from .shell import *
+from .cables import *
+from .unroll import *
+from .subdivision import *
+from .synthetic import *
+from .hierarchy import *
+
+if not compas.IPY:
+    from .snapshot_numpy import *
+    from .arrays_numpy import *
+    from .offsets_numpy import *
+    from .materialise_numpy import *
+    from .volume_numpy import *
+    from .transfer_numpy import *
+
+
+__all__ = [name for name in dir() if not name.startswith('_')]
@@ -0,0 +1,107 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import array
+from numpy import cumsum
+from numpy import int64
+from numpy import zeros
+
+
+__all__ = [
+    'mesh_xyz_numpy',
+    'mesh_face_indices_numpy',
+    'mesh_edge_indices_numpy',
+]
+
+
+def mesh_xyz_numpy(mesh):
+    """Get the vertex coordinates of a mesh as an array.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        The coordinates of the vertices, in the order of ``mesh.vertices()``.
+
+    """
+    return array([[attr['x'], attr['y'], attr['z']] for key, attr in mesh.vertices(True)], dtype=float).reshape((-1, 3))
+
+
+def mesh_face_indices_numpy(mesh):
+    """Get the vertices of the faces of a mesh as index arrays in compressed row format.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    tuple
+        The face offsets (an array of length ``f + 1``) and the vertex indices of
+        all faces, such that the vertices of face ``i`` are ``indices[offsets[i]:offsets[i + 1]]``.
+        Faces are in the order of ``mesh.faces()``, vertex indices refer to the order of ``mesh.vertices()``.
+
+    """
+    key_index = mesh.key_index()
+    faces = [mesh.face_vertices(fkey) for fkey in mesh.faces()]
+    offsets = zeros(len(faces) + 1, dtype=int64)
+    offsets[1:] = cumsum([len(vertices) for vertices in faces])
+    indices = array([key_index[key] for vertices in faces for key in vertices], dtype=int64)
+    return offsets, indices
+
+
+def mesh_edge_indices_numpy(mesh, data=False):
+    """Get the vertices of the edges of a mesh as an index array.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    data : bool, optional
+        Return the attribute dicts of the edges as well.
+        Default is ``False``.
+
+    Returns
+    -------
+    array or tuple
+        The vertex indices of the edges, as an array of shape ``(e, 2)``,
+        with the edges in the order (and orientation) of ``mesh.edges()``,
+        and vertex indices referring to the order of ``mesh.vertices()``.
+        If ``data`` is ``True``, also the list of attribute dicts of the edges.
+
+    Notes
+    -----
+    The edges are collected in a single pass over the halfedges of the mesh,
+    which avoids the overhead of the edge generator of the mesh on large meshes.
+
+    """
+    key_index = mesh.key_index()
+    edgedata = mesh.edgedata
+    seen = set()
+    indices = []
+    attrs = []
+    for u, nbrs in mesh.halfedge.items():
+        for v in nbrs:
+            if (v, u) in seen:
+                continue
+            seen.add((u, v))
+            indices.append(key_index[u])
+            indices.append(key_index[v])
+            if data:
+                attr = edgedata.get((u, v))
+                if attr is None:
+                    attr = edgedata.get((v, u))
+                if attr is None:
+                    attr = mesh.default_edge_attributes.copy()
+                edgedata[u, v] = edgedata[v, u] = attr
+                attrs.append(attr)
+    indices = array(indices, dtype=int64).reshape((-1, 2))
+    if data:
+        return indices, attrs
+    return indices
@@ -0,0 +1,226 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.geometry import distance_point_point
+
+
+__all__ = [
+    'CableIndex',
+]
+
+
+class CableIndex(object):
+    """Decomposition of the edges of a quad mesh into continuous cables.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A quad mesh.
+
+    Attributes
+    ----------
+    cables : list
+        For every cable, the ordered list of its vertices.
+        The first vertex of a closed cable is not repeated at the end.
+    closed : list
+        For every cable, ``True`` if the cable is a closed loop.
+    lengths : list
+        For every cable, the cumulative lengths along its vertices,
+        starting at zero at the first vertex.
+        For a closed cable, the last value is the total length of the loop.
+    edge_cable : dict
+        A mapping of every edge (in both directions) to the index of its cable,
+        the position of the edge in the cable, and ``True`` if the direction
+        of the edge is the direction of the cable.
+
+    Notes
+    -----
+    A cable continues straight through every interior vertex with four neighbours,
+    to the neighbour opposite the one it came from.
+    It ends at vertices on the boundary and at vertices with another number of neighbours.
+    Every edge belongs to exactly one cable.
+
+    The index is built in a single pass over the edges of the mesh.
+    Afterwards, all queries are dict and list lookups,
+    instead of a walk over the topology of the mesh per query.
+    The index does not track changes of the mesh; build a new one after modifications.
+
+    Examples
+    --------
+    >>> index = CableIndex(shell)
+    >>> edges = index.continuous_edges((136, 203))
+    >>> cable, position, forward = index.edge_cable[136, 203]
+    >>> index.lengths[cable][-1]
+
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.cables = []
+        self.closed = []
+        self.lengths = []
+        self.edge_cable = {}
+        self._build()
+
+    def _build(self):
+        mesh = self.mesh
+        boundary = set(mesh.vertices_on_boundary())
+        opposite = {}
+        for key in mesh.vertices():
+            if key in boundary:
+                continue
+            nbrs = mesh.vertex_neighbors(key, ordered=True)
+            if len(nbrs) != 4:
+                continue
+            opposite[key] = {nbr: nbrs[i - 2] for i, nbr in enumerate(nbrs)}
+
+        def walk(u, v):
+            a, b = u, v
+            vertices = []
+            while b in opposite:
+                a, b = b, opposite[b][a]
+                if a == u and b == v:
+                    return vertices, True
+                vertices.append(b)
+            return vertices, False
+
+        for u, v in mesh.edges():
+            if (u, v) in self.edge_cable:
+                continue
+            forward, closed = walk(u, v)
+            if closed:
+                vertices = [u, v] + forward[:-1]
+            else:
+                backward, _ = walk(v, u)
+                vertices = backward[::-1] + [u, v] + forward
+            self._add(vertices, closed)
+
+    def _add(self, vertices, closed):
+        mesh = self.mesh
+        index = len(self.cables)
+        points = [mesh.vertex_coordinates(key) for key in vertices]
+        pairs = list(zip(vertices[:-1], vertices[1:]))
+        segments = list(zip(points[:-1], points[1:]))
+        if closed:
+            pairs.append((vertices[-1], vertices[0]))
+            segments.append((points[-1], points[0]))
+        lengths = [0.0]
+        for position, ((u, v), (a, b)) in enumerate(zip(pairs, segments)):
+            self.edge_cable[u, v] = index, position, True
+            self.edge_cable[v, u] = index, position, False
+            lengths.append(lengths[-1] + distance_point_point(a, b))
+        self.cables.append(vertices)
+        self.closed.append(closed)
+        self.lengths.append(lengths)
+
+    def cable_edges(self, cable):
+        """The edges of a cable, in order and in the direction of the cable.
+
+        Parameters
+        ----------
+        cable : int
+            The index of the cable.
+
+        Returns
+        -------
+        list
+            The edges of the cable.
+
+        """
+        vertices = self.cables[cable]
+        edges = list(zip(vertices[:-1], vertices[1:]))
+        if self.closed[cable]:
+            edges.append((vertices[-1], vertices[0]))
+        return edges
+
+    def edge_lengths(self, cable):
+        """The lengths of the edges of a cable, in order.
+
+        Parameters
+        ----------
+        cable : int
+            The index of the cable.
+
+        Returns
+        -------
+        list
+            The lengths of the edges of the cable.
+
+        """
+        lengths = self.lengths[cable]
+        return [b - a for a, b in zip(lengths[:-1], lengths[1:])]
+
+    def edge_families(self, closed='ring', open='cable'):
+        """Label the edges of the mesh with the family of their cable.
+
+        Parameters
+        ----------
+        closed : str, optional
+            The family of the edges of closed cables.
+            Default is ``'ring'``.
+        open : str, optional
+            The family of the edges of open cables.
+            Default is ``'cable'``.
+
+        Returns
+        -------
+        dict
+            A mapping of every edge (in both directions) to its family.
+
+        Examples
+        --------
+        >>> families = index.edge_families()
+        >>> shell_materialise_numpy(shell, {'ring': {'E': 210, 'r': 3}}, families=families, cables=index)
+
+        """
+        return {edge: closed if self.closed[cable] else open for edge, (cable, position, forward) in self.edge_cable.items()}
+
+    def _continuous(self, edge, values):
+        cable, position, forward = self.edge_cable[edge]
+        if not forward:
+            values = values[::-1]
+            position = len(values) - 1 - position
+        if self.closed[cable]:
+            values = values[position:] + values[:position]
+        return values
+
+    def continuous_edges(self, edge):
+        """The edges of the cable of an edge, starting from the edge, in the direction of the edge.
+
+        Parameters
+        ----------
+        edge : tuple
+            A (directed) edge of the mesh.
+
+        Returns
+        -------
+        list
+            The edges of the cable.
+            For an open cable, all edges from the end behind the given edge
+            to the end in front of it.
+            For a closed cable, all edges of the loop, starting with the given edge.
+
+        """
+        cable, position, forward = self.edge_cable[edge]
+        edges = self.cable_edges(cable)
+        if not forward:
+            edges = [(v, u) for u, v in edges]
+        return self._continuous(edge, edges)
+
+    def continuous_lengths(self, edge):
+        """The lengths of the edges of the cable of an edge, in the order of :meth:`continuous_edges`.
+
+        Parameters
+        ----------
+        edge : tuple
+            A (directed) edge of the mesh.
+
+        Returns
+        -------
+        list
+            The lengths of the edges.
+
+        """
+        cable, position, forward = self.edge_cable[edge]
+        return self._continuous(edge, self.edge_lengths(cable))
@@ -0,0 +1,156 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from digitalfutures.datastructures.subdivision import mesh_subdivide_quad_tracked
+
+
+__all__ = [
+    'FaceHierarchy',
+]
+
+
+class FaceHierarchy(object):
+    """Hierarchy of the faces of a stack of subdivision levels of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The coarsest mesh (level ``0``).
+    levels : list
+        The subdivision levels of the mesh, as returned by
+        :func:`mesh_subdivide_quad_tracked`.
+
+    Attributes
+    ----------
+    meshes : list
+        The meshes of all levels, starting with the coarsest mesh.
+    children : list
+        For every level except the finest, a dict mapping the faces of the level
+        to their child faces on the next level.
+    ancestors : list
+        For every level, a dict mapping the faces of the level to the list of their
+        ancestors on all coarser levels, starting with level ``0``.
+
+    Notes
+    -----
+    The ancestors of all faces are computed once, at construction.
+    Therefore, the ancestor of a face on any coarser level is a lookup,
+    and the descendants of a face on any finer level are collected
+    without touching the topology of the meshes.
+
+    Examples
+    --------
+    >>> hierarchy = FaceHierarchy.from_mesh(shell, k=2)
+    >>> faces = hierarchy.descendants([root], 2)
+    >>> hierarchy.ancestor(faces[0], 2, 0) == root
+    True
+    >>> patches = hierarchy.patches(2)
+
+    """
+
+    def __init__(self, mesh, levels):
+        self.meshes = [mesh] + [level[0] for level in levels]
+        self.children = [level[3] for level in levels]
+        self.ancestors = [{fkey: [] for fkey in mesh.faces()}]
+        for children in self.children:
+            ancestors = self.ancestors[-1]
+            self.ancestors.append({child: ancestors[fkey] + [fkey] for fkey in children for child in children[fkey]})
+
+    @classmethod
+    def from_mesh(cls, mesh, k=1):
+        """Construct the hierarchy of ``k`` levels of quad subdivision of a mesh.
+
+        Parameters
+        ----------
+        mesh : Mesh
+            The mesh.
+        k : int, optional
+            The number of levels of subdivision.
+            Default is ``1``.
+
+        Returns
+        -------
+        FaceHierarchy
+            The hierarchy.
+
+        """
+        return cls(mesh, mesh_subdivide_quad_tracked(mesh, k=k))
+
+    @property
+    def depth(self):
+        """int: The number of subdivision levels."""
+        return len(self.children)
+
+    def ancestor(self, fkey, level, ancestor_level=0):
+        """The ancestor of a face on a coarser level.
+
+        Parameters
+        ----------
+        fkey : hashable
+            The identifier of the face.
+        level : int
+            The level of the face.
+        ancestor_level : int, optional
+            The level of the ancestor.
+            Default is ``0``.
+
+        Returns
+        -------
+        hashable
+            The identifier of the ancestor.
+
+        """
+        if ancestor_level == level:
+            return fkey
+        return self.ancestors[level][fkey][ancestor_level]
+
+    def descendants(self, fkeys, level, fkeys_level=0):
+        """The descendants of faces on a finer level.
+
+        Parameters
+        ----------
+        fkeys : list
+            The identifiers of the faces.
+        level : int
+            The level of the descendants.
+        fkeys_level : int, optional
+            The level of the faces.
+            Default is ``0``.
+
+        Returns
+        -------
+        list
+            The identifiers of the descendants, grouped per face in the order of ``fkeys``.
+
+        """
+        faces = list(fkeys)
+        for children in self.children[fkeys_level:level]:
+            faces = [child for fkey in faces for child in children[fkey]]
+        return faces
+
+    def patches(self, level, root_level=0):
+        """The descendants of all faces of a level on a finer level.
+
+        Parameters
+        ----------
+        level : int
+            The level of the descendants.
+        root_level : int, optional
+            The level of the roots of the patches.
+            Default is ``0``.
+
+        Returns
+        -------
+        dict
+            A dict mapping every face of the root level to the list of its descendants.
+
+        """
+        patches = {fkey: [] for fkey in self.meshes[root_level].faces()}
+        if level == root_level:
+            for fkey in patches:
+                patches[fkey].append(fkey)
+            return patches
+        for fkey, ancestors in self.ancestors[level].items():
+            patches[ancestors[root_level]].append(fkey)
+        return patches
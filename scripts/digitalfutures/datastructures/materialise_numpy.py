@@ -0,0 +1,174 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import arange
+from numpy import argsort
+from numpy import array
+from numpy import int64
+from numpy import percentile
+from numpy import searchsorted
+
+from compas.numerical import normrow
+
+from digitalfutures.datastructures.arrays_numpy import mesh_xyz_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_edge_indices_numpy
+from digitalfutures.datastructures.cables import CableIndex
+
+
+__all__ = [
+    'shell_materialise_numpy',
+]
+
+
+def _distribution(values, percentiles):
+    stats = {'min': float(values.min()), 'max': float(values.max()), 'mean': float(values.mean())}
+    for p, value in zip(percentiles, percentile(values, percentiles)):
+        stats['p{}'.format(p)] = float(value)
+    return stats
+
+
+def _codes(labels):
+    names = sorted(set(labels), key=lambda name: (name is not None, str(name)))
+    name_index = {name: index for index, name in enumerate(names)}
+    return names, array([name_index[name] for name in labels], dtype=int64)
+
+
+def _group_stats(labels, f, stress, strain, percentiles):
+    # the edges are sorted by label once, such that every group is a slice
+    names, codes = _codes(labels)
+    order = argsort(codes, kind='mergesort')
+    bounds = searchsorted(codes[order], arange(len(names) + 1))
+    stats = {}
+    for index, name in enumerate(names):
+        group = order[bounds[index]:bounds[index + 1]]
+        stats[name] = {
+            'count': len(group),
+            'force': _distribution(f[group], percentiles),
+            'stress': _distribution(stress[group], percentiles),
+            'strain': _distribution(strain[group], percentiles),
+        }
+    return stats
+
+
+def shell_materialise_numpy(shell, materials=None, E=210, r=2, families=None, cables=None, family_attr_name='family', percentiles=(5, 50, 95)):
+    """Assign material properties to the cables of a shell per cable family and compute their unstressed lengths.
+
+    Parameters
+    ----------
+    shell : Shell
+        A shell with the forces of the form found state stored in the edge attribute ``'f'``.
+    materials : dict, optional
+        A table of material properties per cable family,
+        mapping the name of a family to a dict with the Young's modulus ``'E'`` (in kN/mm2)
+        and the radius ``'r'`` (in mm) of the cables of that family.
+        Properties missing from the table are taken from ``E`` and ``r``.
+    E : float, optional
+        The default Young's modulus of the cables, in kN/mm2 (GPa).
+        Default is ``210``.
+    r : float, optional
+        The default radius of the cables, in mm.
+        Default is ``2``.
+    families : dict, optional
+        A mapping of the edges to the names of their cable families,
+        for example :meth:`CableIndex.edge_families`.
+        The edges are keyed in both directions, or in the direction of ``shell.edges()``.
+        If not provided, the families are taken from the edge attribute ``family_attr_name``.
+    cables : CableIndex or dict or bool, optional
+        The cables for the statistics per cable.
+        A cable index, or a mapping of the edges to cable labels, keyed like ``families``.
+        If not provided, a cable index of the shell is built.
+        If ``False``, no statistics per cable are computed.
+    family_attr_name : str, optional
+        The name of the edge attribute with the cable family of an edge.
+        Edges without a family belong to the family ``None``.
+        Default is ``'family'``.
+    percentiles : tuple, optional
+        The percentiles of the distributions in the statistics.
+        Default is ``(5, 50, 95)``.
+
+    Returns
+    -------
+    tuple
+        The forces, stresses and strains of the cables (the edges with ``'is_edge'`` set to ``True``),
+        as arrays, and the statistics of their distributions per cable family and per cable.
+        The statistics map every family or cable to its number of edges (``'count'``),
+        and to the minimum, maximum, mean and percentiles of the forces, stresses and strains
+        (``'force'``, ``'stress'``, ``'strain'``), keyed by ``'min'``, ``'max'``, ``'mean'``, ``'p5'``, ...
+        With a cable index, the cables are identified by their index in :attr:`CableIndex.cables`.
+        The statistics per cable are ``None`` if ``cables`` is ``False``.
+
+    Notes
+    -----
+    The families are not stored in the data files of the workshop.
+    They are assigned per cable, with :meth:`CableIndex.edge_families`,
+    which labels the edges of closed cables as ``'ring'`` and the other edges as ``'cable'``,
+    or by setting the edge attribute ``'family'``, for example per group of faces of the strips.
+
+    The unstressed lengths are computed for all edges at once, with array operations.
+    The edges are collected in a single pass over the halfedges
+    (see :func:`mesh_edge_indices_numpy`), instead of a filtered query per edge.
+    The material properties and the unstressed lengths are stored in the
+    edge attributes ``'E'``, ``'r'`` and ``'l0'``, in a single pass over the edges.
+    Building a cable index takes longer than the materialisation itself.
+    Pass an existing index, or ``False``, to avoid this.
+
+    Examples
+    --------
+    >>> index = CableIndex(shell)
+    >>> materials = {'ring': {'E': 210, 'r': 3}, 'cable': {'E': 210, 'r': 2}}
+    >>> force, stress, strain, family_stats, cable_stats = shell_materialise_numpy(
+    ...     shell, materials, families=index.edge_families(), cables=index)
+    >>> family_stats['ring']['stress']['max']
+    >>> cable_stats[index.edge_cable[136, 203][0]]['force']['p50']
+
+    """
+    materials = materials or {}
+    is_edge = shell.default_edge_attributes.get('is_edge')
+    uv, attrs = mesh_edge_indices_numpy(shell, data=True)
+    select = array([bool(attr.get('is_edge', is_edge)) for attr in attrs], dtype=bool)
+    uv = uv[select]
+    attrs = [attr for attr, selected in zip(attrs, select) if selected]
+
+    keys = list(shell.vertices())
+    edges = [(keys[u], keys[v]) for u, v in uv.tolist()]
+
+    if cables is None:
+        cables = CableIndex(shell)
+    if isinstance(cables, CableIndex):
+        cables = {edge: cable for edge, (cable, position, forward) in cables.edge_cable.items()}
+
+    if families is None:
+        labels = [attr.get(family_attr_name) for attr in attrs]
+    else:
+        labels = [families.get(edge) for edge in edges]
+
+    xyz = mesh_xyz_numpy(shell)
+    l = normrow(xyz[uv[:, 1]] - xyz[uv[:, 0]]).ravel()
+    f = array([attr['f'] for attr in attrs], dtype=float)
+
+    names, codes = _codes(labels)
+
+    E_family = array([materials.get(name, {}).get('E', E) for name in names], dtype=float)
+    r_family = array([materials.get(name, {}).get('r', r) for name in names], dtype=float)
+
+    E_edge = E_family[codes]
+    r_edge = r_family[codes]
+    A = 3.14159 * r_edge ** 2
+
+    x = f / (E_edge * A)
+    l0 = l / (1 + x)
+    stress = f / A
+    strain = l / l0
+
+    for attr, E_, r_, l0_ in zip(attrs, E_edge.tolist(), r_edge.tolist(), l0.tolist()):
+        attr['E'] = E_
+        attr['r'] = r_
+        attr['l0'] = l0_
+
+    family_stats = _group_stats(labels, f, stress, strain, percentiles)
+    cable_stats = None
+    if cables is not False:
+        cable_stats = _group_stats([cables.get(edge) for edge in edges], f, stress, strain, percentiles)
+
+    return f, stress, strain, family_stats, cable_stats
@@ -0,0 +1,104 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import asarray
+
+from digitalfutures.geometry import vertex_normals_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_xyz_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_face_indices_numpy
+
+
+__all__ = [
+    'mesh_vertex_normals_numpy',
+    'mesh_offset_numpy',
+    'mesh_offsets_numpy',
+]
+
+
+def mesh_vertex_normals_numpy(mesh):
+    """Compute the normals of all vertices of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+
+    Returns
+    -------
+    array
+        The unit vertex normals, in the order of ``mesh.vertices()``.
+
+    """
+    xyz = mesh_xyz_numpy(mesh)
+    offsets, indices = mesh_face_indices_numpy(mesh)
+    return vertex_normals_numpy(xyz, offsets, indices)
+
+
+def mesh_offset_numpy(mesh, distance):
+    """Offset the vertices of a mesh along their normals.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    distance : float or list
+        The offset distance.
+        A single value for all vertices, or one value per vertex in the order of ``mesh.vertices()``.
+
+    Returns
+    -------
+    array
+        The offset vertex coordinates, in the order of ``mesh.vertices()``.
+
+    Examples
+    --------
+    >>> xyz = mesh_offset_numpy(fabric, +0.020)
+    >>> key_index = fabric.key_index()
+    >>> for key, attr in fabric.vertices(True):
+    ...     index = key_index[key]
+    ...     attr['x'] = xyz[index, 0]
+    ...     attr['y'] = xyz[index, 1]
+    ...     attr['z'] = xyz[index, 2]
+
+    """
+    xyz = mesh_xyz_numpy(mesh)
+    offsets, indices = mesh_face_indices_numpy(mesh)
+    normals = vertex_normals_numpy(xyz, offsets, indices)
+    distance = asarray(distance, dtype=float).reshape((-1, 1))
+    return xyz + distance * normals
+
+
+def mesh_offsets_numpy(mesh, thickness=None, name='t'):
+    """Compute the extrados and intrados of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    thickness : float or list, optional
+        The distance between extrados and intrados.
+        A single value for all vertices, or one value per vertex in the order of ``mesh.vertices()``.
+        If no value is provided, the thickness is taken from a vertex attribute.
+    name : str, optional
+        The name of the vertex attribute containing the thickness.
+        Default is ``'t'``.
+
+    Returns
+    -------
+    tuple
+        The coordinates of the extrados and of the intrados, in the order of ``mesh.vertices()``.
+        Both are offset by half the thickness, on either side of the mesh.
+
+    Examples
+    --------
+    >>> edos, idos = mesh_offsets_numpy(shell, 0.04)
+
+    """
+    if thickness is None:
+        thickness = mesh.get_vertices_attribute(name)
+    xyz = mesh_xyz_numpy(mesh)
+    offsets, indices = mesh_face_indices_numpy(mesh)
+    normals = vertex_normals_numpy(xyz, offsets, indices)
+    thickness = asarray(thickness, dtype=float).reshape((-1, 1))
+    return xyz + 0.5 * thickness * normals, xyz - 0.5 * thickness * normals
@@ -0,0 +1,461 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+
+import compas
+
+from compas.geometry import area_polygon
+from compas.geometry import centroid_points
+from compas.geometry import normal_polygon
+from compas.geometry import normalize_vector
+
+from compas_fofin.datastructures import Shell as FofinShell
+
+
+__all__ = ['Shell']
+
+
+class Shell(FofinShell):
+    """Extension of the ``compas_fofin`` shell with the data management used in the workshop scripts.
+
+    Examples
+    --------
+    >>> shell = Shell.from_json(FILE_I)
+    >>> shell.to_snapshot(FILE_S)
+    >>> shell = Shell.from_snapshot(FILE_S)
+
+    >>> strips = shell.face_groups('strip', {'panel': 'SOUTH'}, sort_by='count')
+
+    Notes
+    -----
+    Face attribute queries (:meth:`faces_where`, :meth:`face_groups`) are answered
+    from an inverted index of the face attributes, which is built on first use
+    per attribute and kept up to date by :meth:`set_face_attribute`.
+    Adding or deleting faces resets the index.
+    Face attributes that are modified directly through the attribute dicts
+    (for example ``attr[name] = value`` in a loop over ``shell.faces(True)``)
+    are not tracked; call :meth:`reset_face_index` afterwards.
+
+    The normals, centroids and areas of the faces, and the normals of the vertices
+    (:meth:`face_normal`, :meth:`face_centroid`, :meth:`face_area`, :meth:`vertex_normal`)
+    are computed for all faces and vertices at once, on first use,
+    and cached until the geometry changes.
+    Every change of the coordinates through :meth:`set_vertex_attribute`,
+    and every change of the topology through the methods that add or delete vertices and faces,
+    increments :attr:`geometry_version`, which invalidates the cache.
+    Coordinates that are modified directly through the attribute dicts
+    (for example ``attr['x'] = x`` in a loop over ``shell.vertices(True)``),
+    and faces that are modified directly
+    (for example by :func:`compas.datastructures.mesh_flip_cycles`, or ``del shell.face[fkey]``)
+    are not tracked; call :meth:`invalidate_geometry` afterwards.
+
+    """
+
+    def __init__(self):
+        self._geometry_version = 0
+        self._geometry = {}
+        super(Shell, self).__init__()
+        self._face_index = {}
+
+    # --------------------------------------------------------------------------
+    # constructors
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def from_snapshot(cls, filepath, mmap=True):
+        """Construct a shell from the data in a snapshot file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the snapshot file.
+        mmap : bool, optional
+            Map the arrays of the file into memory instead of reading them.
+            Default is ``True``.
+
+        Returns
+        -------
+        Shell
+            The shell.
+
+        Notes
+        -----
+        Requires Numpy.
+        To access the arrays of the snapshot without constructing a shell,
+        use :class:`digitalfutures.datastructures.MeshSnapshot`.
+
+        """
+        from digitalfutures.datastructures.snapshot_numpy import mesh_from_snapshot_numpy
+        return mesh_from_snapshot_numpy(filepath, cls=cls, mmap=mmap)
+
+    # --------------------------------------------------------------------------
+    # serialisation
+    # --------------------------------------------------------------------------
+
+    def to_snapshot(self, filepath):
+        """Write the data of the shell to a snapshot file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the snapshot file.
+
+        Notes
+        -----
+        Requires Numpy.
+
+        """
+        from digitalfutures.datastructures.snapshot_numpy import mesh_to_snapshot_numpy
+        mesh_to_snapshot_numpy(self, filepath)
+
+    # --------------------------------------------------------------------------
+    # modifiers
+    # --------------------------------------------------------------------------
+
+    def add_vertex(self, key=None, attr_dict=None, **kwattr):
+        self._geometry_version += 1
+        return super(Shell, self).add_vertex(key=key, attr_dict=attr_dict, **kwattr)
+
+    def delete_vertex(self, key):
+        self._face_index = {}
+        self._geometry_version += 1
+        super(Shell, self).delete_vertex(key)
+
+    def add_face(self, vertices, fkey=None, attr_dict=None, **kwattr):
+        self._face_index = {}
+        self._geometry_version += 1
+        return super(Shell, self).add_face(vertices, fkey=fkey, attr_dict=attr_dict, **kwattr)
+
+    def delete_face(self, fkey):
+        self._face_index = {}
+        self._geometry_version += 1
+        super(Shell, self).delete_face(fkey)
+
+    def clear(self):
+        self._face_index = {}
+        self._geometry_version += 1
+        super(Shell, self).clear()
+
+    # --------------------------------------------------------------------------
+    # attributes
+    # --------------------------------------------------------------------------
+
+    def set_vertex_attribute(self, key, name, value):
+        if name in ('x', 'y', 'z'):
+            self._geometry_version += 1
+        super(Shell, self).set_vertex_attribute(key, name, value)
+
+    def set_face_attribute(self, key, name, value):
+        index = self._face_index.get(name)
+        if index is not None:
+            attr = self.facedata.get(key)
+            if attr is not None and name in attr and attr[name] in index:
+                index[attr[name]].pop(key, None)
+            try:
+                index.setdefault(value, OrderedDict())[key] = None
+            except TypeError:
+                del self._face_index[name]
+        super(Shell, self).set_face_attribute(key, name, value)
+
+    # --------------------------------------------------------------------------
+    # face index
+    # --------------------------------------------------------------------------
+
+    def reset_face_index(self):
+        """Discard the index of the face attributes.
+
+        The index is rebuilt when it is needed.
+        """
+        self._face_index = {}
+
+    def face_index(self, name):
+        """Get the inverted index of a face attribute.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+
+        Returns
+        -------
+        dict or None
+            A dict mapping every value of the attribute to the (ordered) collection of faces with that value,
+            or ``None`` if the attribute has unhashable values (such as lists).
+
+        """
+        if name not in self._face_index:
+            index = {}
+            for fkey in self.face:
+                attr = self.facedata.get(fkey)
+                if attr is None or name not in attr:
+                    continue
+                try:
+                    index.setdefault(attr[name], OrderedDict())[fkey] = None
+                except TypeError:
+                    return None
+            self._face_index[name] = index
+        return self._face_index[name]
+
+    def _indexed_faces(self, conditions):
+        buckets = []
+        for name, value in conditions.items():
+            if callable(getattr(self, name, None)):
+                return None
+            if isinstance(value, (list, tuple, dict, set)):
+                return None
+            index = self.face_index(name)
+            if index is None:
+                return None
+            buckets.append(index.get(value, ()))
+        if not buckets:
+            return list(self.face)
+        buckets.sort(key=len)
+        return [fkey for fkey in buckets[0] if all(fkey in bucket for bucket in buckets[1:])]
+
+    def faces_where(self, conditions, data=False):
+        """Get faces for which a certain condition or set of conditions is true.
+
+        Parameters
+        ----------
+        conditions : dict
+            A set of conditions in the form of key-value pairs.
+            The keys should be attribute names. The values can be attribute
+            values or ranges of attribute values in the form of min/max pairs.
+        data : bool, optional
+            Yield the faces and their data attributes.
+            Default is ``False``.
+
+        Yields
+        ------
+        key: hashable
+            The next face that matches the condition.
+        2-tuple
+            The next face and its attributes, if ``data=True``.
+
+        Notes
+        -----
+        Conditions that test for equality of attribute values are answered from
+        the face index, without visiting the other faces.
+        All other conditions are handled by the original implementation.
+
+        """
+        fkeys = self._indexed_faces(conditions)
+        if fkeys is None:
+            for item in super(Shell, self).faces_where(conditions, data):
+                yield item
+            return
+        for fkey in fkeys:
+            if data:
+                yield fkey, self.facedata.setdefault(fkey, self.default_face_attributes.copy())
+            else:
+                yield fkey
+
+    def face_groups(self, names, conditions=None, sort_by=None):
+        """Group faces by the values of one or more attributes.
+
+        Parameters
+        ----------
+        names : str or list of str
+            The name(s) of the attributes defining the groups.
+        conditions : dict, optional
+            Only group the faces matching these conditions (see :meth:`faces_where`).
+        sort_by : str, optional
+            The name of an attribute by which the faces of each group are sorted.
+
+        Returns
+        -------
+        OrderedDict
+            A dict mapping the (tuples of) attribute values to the list of faces of each group,
+            with the groups in the order of their values.
+            Faces without a value for one of the attributes are ignored.
+
+        Examples
+        --------
+        >>> strips = fabric.face_groups('strip', {'panel': 'SOUTH'}, sort_by='count')
+        >>> strips['00']
+        [...]
+
+        >>> strips = fabric.face_groups(['panel', 'strip'], sort_by='count')
+        >>> strips['SOUTH', '00']
+        [...]
+
+        """
+        single = not isinstance(names, (list, tuple))
+        if single:
+            names = [names]
+
+        fkeys = self.faces_where(conditions) if conditions else self.faces()
+
+        groups = {}
+        for fkey in fkeys:
+            attr = self.facedata.get(fkey) or self.default_face_attributes
+            try:
+                values = tuple(attr[name] for name in names)
+            except KeyError:
+                continue
+            groups.setdefault(values[0] if single else values, []).append(fkey)
+
+        if sort_by:
+            for faces in groups.values():
+                faces.sort(key=lambda fkey: _sortkey(self.get_face_attribute(fkey, sort_by)))
+
+        return OrderedDict((values, groups[values]) for values in sorted(groups, key=_sortkey))
+
+
+    # --------------------------------------------------------------------------
+    # geometry cache
+    # --------------------------------------------------------------------------
+
+    @property
+    def geometry_version(self):
+        """int: The version of the geometry, incremented by every tracked change of coordinates or topology, and by :meth:`invalidate_geometry`."""
+        return self._geometry_version
+
+    def invalidate_geometry(self):
+        """Discard the cached geometry of the faces and vertices.
+
+        The cache is rebuilt when it is needed.
+        """
+        self._geometry_version += 1
+
+    def _cached(self, name, compute):
+        version, value = self._geometry.get(name, (None, None))
+        if version != self._geometry_version:
+            value = compute()
+            self._geometry[name] = self._geometry_version, value
+        return value
+
+    def _face_geometry(self):
+        if compas.IPY:
+            return self._face_geometry_python()
+        return self._face_geometry_numpy()
+
+    def _face_geometry_python(self):
+        index = {}
+        centroids = []
+        normals = []
+        units = []
+        areas = []
+        for fkey in self.faces():
+            points = self.face_coordinates(fkey)
+            normal = list(normal_polygon(points, unitized=False))
+            index[fkey] = len(index)
+            centroids.append(centroid_points(points))
+            normals.append(normal)
+            units.append(normalize_vector(normal))
+            areas.append(area_polygon(points))
+        return index, centroids, normals, units, areas
+
+    def _face_geometry_numpy(self):
+        from numpy import arange
+        from numpy import diff
+        from numpy import repeat
+        from compas.numerical import normrow
+        from digitalfutures.geometry import face_normals_numpy
+        from digitalfutures.geometry import face_areas_numpy
+        from digitalfutures.geometry.normals_numpy import _face_sums
+        from digitalfutures.datastructures.arrays_numpy import mesh_xyz_numpy
+        from digitalfutures.datastructures.arrays_numpy import mesh_face_indices_numpy
+        xyz = mesh_xyz_numpy(self)
+        offsets, indices = mesh_face_indices_numpy(self)
+        index = {fkey: i for i, fkey in enumerate(self.faces())}
+        sizes = diff(offsets)
+        centroids = _face_sums(xyz[indices], repeat(arange(len(sizes)), sizes), len(sizes)) / sizes.reshape((-1, 1))
+        normals = face_normals_numpy(xyz, offsets, indices, unitized=False)
+        lengths = normrow(normals)
+        lengths[lengths == 0] = 1.0
+        areas = face_areas_numpy(xyz, offsets, indices)
+        return index, centroids.tolist(), normals.tolist(), (normals / lengths).tolist(), areas.tolist()
+
+    def _vertex_normals(self):
+        index, centroids, normals, units, areas = self._cached('faces', self._face_geometry)
+        vertex_normals = {}
+        for fkey, i in index.items():
+            nx, ny, nz = normals[i]
+            for key in self.face_vertices(fkey):
+                normal = vertex_normals.setdefault(key, [0.0, 0.0, 0.0])
+                normal[0] += nx
+                normal[1] += ny
+                normal[2] += nz
+        return {key: normalize_vector(normal) for key, normal in vertex_normals.items()}
+
+    def face_normal(self, fkey, unitized=True):
+        """Compute the normal of a face.
+
+        Parameters
+        ----------
+        fkey : hashable
+            The identifier of the face.
+        unitized : bool, optional
+            Unitize the normal vector.
+            Default is ``True``.
+
+        Returns
+        -------
+        list
+            The components of the normal vector.
+
+        """
+        index, centroids, normals, units, areas = self._cached('faces', self._face_geometry)
+        if unitized:
+            return units[index[fkey]][:]
+        return normals[index[fkey]][:]
+
+    def face_centroid(self, fkey):
+        """Compute the location of the centroid of a face.
+
+        Parameters
+        ----------
+        fkey : hashable
+            The identifier of the face.
+
+        Returns
+        -------
+        list
+            The coordinates of the centroid.
+
+        """
+        index, centroids, normals, units, areas = self._cached('faces', self._face_geometry)
+        return centroids[index[fkey]][:]
+
+    def face_area(self, fkey):
+        """Compute the area of a face.
+
+        Parameters
+        ----------
+        fkey : hashable
+            The identifier of the face.
+
+        Returns
+        -------
+        float
+            The area of the face.
+
+        """
+        index, centroids, normals, units, areas = self._cached('faces', self._face_geometry)
+        return areas[index[fkey]]
+
+    def vertex_normal(self, key):
+        """Return the normal vector at the vertex as the weighted average of the
+        normals of the neighboring faces.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the vertex.
+
+        Returns
+        -------
+        list
+            The components of the normal vector.
+
+        """
+        return self._cached('vertices', self._vertex_normals)[key][:]
+
+
+def _sortkey(value):
+    if isinstance(value, tuple):
+        return tuple(_sortkey(item) for item in value)
+    return value is not None, value
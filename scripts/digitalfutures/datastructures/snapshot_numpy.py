@@ -0,0 +1,680 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import struct
+
+from numpy import arange
+from numpy import array
+from numpy import ascontiguousarray
+from numpy import cumsum
+from numpy import dtype
+from numpy import empty
+from numpy import fromfile
+from numpy import int64
+from numpy import memmap
+from numpy import nonzero
+from numpy import repeat
+from numpy import vstack
+from numpy import zeros
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+
+__all__ = [
+    'MeshSnapshot',
+    'mesh_to_snapshot_numpy',
+    'mesh_from_snapshot_numpy',
+    'json_to_snapshot_numpy',
+]
+
+
+MAGIC = b'DFSNAP\x00\x01'
+ALIGN = 64
+
+ABSENT = object()
+
+
+# ==============================================================================
+# Columns
+# ==============================================================================
+
+def _encode_column(values):
+    """Encode a list of attribute values as a column of arrays.
+
+    The kind of the column is chosen such that decoding reproduces the original
+    values exactly, including their Python type.
+    Missing values (``ABSENT``) and ``None`` values are recorded in separate masks.
+    """
+    absent = array([value is ABSENT for value in values], dtype=bool)
+    present = [value for value in values if value is not ABSENT]
+    null = array([value is None for value in values], dtype=bool)
+    types = set(type(value) for value in present if value is not None)
+
+    spec = {}
+    arrays = {}
+
+    if types and types <= set([bool]):
+        spec['kind'] = 'bool'
+        arrays['values'] = array([bool(value) if value not in (ABSENT, None) else False for value in values], dtype=bool)
+    elif types and types <= set([int]):
+        spec['kind'] = 'int'
+        arrays['values'] = array([value if value not in (ABSENT, None) else 0 for value in values], dtype=int64)
+    elif types and types <= set([float]):
+        spec['kind'] = 'float'
+        arrays['values'] = array([value if value not in (ABSENT, None) else 0.0 for value in values], dtype=float)
+    elif all(value is None or isinstance(value, basestring) for value in present):
+        categories = []
+        code = {}
+        codes = []
+        for value in values:
+            if value is ABSENT:
+                codes.append(-1)
+                continue
+            if value not in code:
+                code[value] = len(categories)
+                categories.append(value)
+            codes.append(code[value])
+        spec['kind'] = 'category'
+        spec['categories'] = categories
+        arrays['values'] = array(codes, dtype='<i4')
+        null[:] = False
+    else:
+        spec['kind'] = 'json'
+        spec['values'] = [value if value is not ABSENT else None for value in values]
+        null[:] = False
+
+    if absent.any():
+        arrays['absent'] = absent
+    if null.any():
+        arrays['null'] = null
+
+    return spec, arrays
+
+
+def _decode_column(spec, values, null, absent):
+    kind = spec['kind']
+    if kind == 'json':
+        column = list(spec['values'])
+    elif kind == 'category':
+        categories = spec['categories']
+        column = [categories[code] if code >= 0 else None for code in values.tolist()]
+    else:
+        column = values.tolist()
+    if null is not None:
+        for index in nonzero(null)[0].tolist():
+            column[index] = None
+    if absent is not None:
+        for index in nonzero(absent)[0].tolist():
+            column[index] = ABSENT
+    return column
+
+
+def _compiled(defaults, attr):
+    compiled = defaults.copy()
+    compiled.update(attr)
+    return compiled
+
+
+def _encode_attributes(names, attrs):
+    columns = {}
+    arrays = {}
+    for name in names:
+        values = [attr.get(name, ABSENT) for attr in attrs]
+        spec, data = _encode_column(values)
+        columns[name] = spec
+        arrays[name] = data
+    return columns, arrays
+
+
+# ==============================================================================
+# Snapshot
+# ==============================================================================
+
+class MeshSnapshot(object):
+    """A columnar, memory-mapped view of the data of a mesh stored in a snapshot file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the snapshot file.
+    mmap : bool, optional
+        Map the arrays into memory instead of reading them.
+        Default is ``True``.
+
+    Notes
+    -----
+    Only the header of the file is read when the snapshot is opened.
+    The arrays are loaded (or mapped) on first access.
+
+    A snapshot file consists of a short preamble, a JSON header describing the
+    mesh attributes, the default attributes and the layout of the arrays,
+    followed by the raw (little-endian, 64-byte aligned) array data.
+
+    * ``vertex/keys``, ``face/keys`` : the identifiers of vertices and faces.
+    * ``vertex/xyz`` : the vertex coordinates (if stored as a block).
+    * ``face/offsets``, ``face/vertices``, ``face/indices`` : the face vertices (keys and indices) in compressed row format.
+    * ``halfedge/vertices``, ``halfedge/faces`` : the halfedges of the faces as pairs of vertex indices, and the index of their face.
+    * ``adjacency/offsets``, ``adjacency/vertices``, ``adjacency/faces`` : the halfedge dictionary of the mesh, i.e. the neighbours of every vertex and the index of the face on the left of each halfedge (``-1`` for none), in compressed row format.
+    * ``edge/keys`` : the vertex keys of the edges with data.
+    * ``vertex:<name>/...``, ``face:<name>/...``, ``edge:<name>/...`` : attribute columns.
+
+    Examples
+    --------
+    >>> snapshot = MeshSnapshot('data.snapshot')
+    >>> xyz = snapshot.xyz
+    >>> q = snapshot.edge_attribute('q')
+    >>> shell = snapshot.to_mesh(Shell)
+
+    """
+
+    def __init__(self, filepath, mmap=True):
+        self.filepath = filepath
+        self.mmap = mmap
+        self._arrays = {}
+        with open(filepath, 'rb') as fp:
+            magic = fp.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError('Not a snapshot file: {}'.format(filepath))
+            size, = struct.unpack('<Q', fp.read(8))
+            self.header = json.loads(fp.read(size).decode('utf-8'))
+        self._start = _aligned(len(MAGIC) + 8 + size)
+
+    # --------------------------------------------------------------------------
+    # header
+    # --------------------------------------------------------------------------
+
+    @property
+    def attributes(self):
+        return self.header['attributes']
+
+    @property
+    def settings(self):
+        return self.header.get('settings')
+
+    def number_of_vertices(self):
+        return self.header['layout']['vertex/keys']['shape'][0]
+
+    def number_of_faces(self):
+        return self.header['layout']['face/keys']['shape'][0]
+
+    # --------------------------------------------------------------------------
+    # arrays
+    # --------------------------------------------------------------------------
+
+    def array(self, name):
+        """Get one of the arrays of the snapshot.
+
+        Parameters
+        ----------
+        name : str
+            The name of the array.
+
+        Returns
+        -------
+        array
+            The array, as a read-only memory map if the snapshot was opened with ``mmap=True``.
+
+        """
+        if name not in self._arrays:
+            layout = self.header['layout'][name]
+            shape = tuple(layout['shape'])
+            kind = dtype(layout['dtype'])
+            offset = self._start + layout['offset']
+            count = 1
+            for n in shape:
+                count *= n
+            if count == 0:
+                data = empty(shape, dtype=kind)
+            elif self.mmap:
+                data = memmap(self.filepath, dtype=kind, mode='r', offset=offset, shape=shape)
+            else:
+                with open(self.filepath, 'rb') as fp:
+                    fp.seek(offset)
+                    data = fromfile(fp, dtype=kind, count=count).reshape(shape)
+            self._arrays[name] = data
+        return self._arrays[name]
+
+    def has_array(self, name):
+        return name in self.header['layout']
+
+    @property
+    def vertex_keys(self):
+        return self.array('vertex/keys')
+
+    @property
+    def face_keys(self):
+        return self.array('face/keys')
+
+    @property
+    def edge_keys(self):
+        return self.array('edge/keys')
+
+    @property
+    def xyz(self):
+        """array : The vertex coordinates as an array of shape (n, 3)."""
+        if self.has_array('vertex/xyz'):
+            return self.array('vertex/xyz')
+        return array([self.vertex_attribute(name) for name in 'xyz'], dtype=float).T
+
+    @property
+    def face_offsets(self):
+        return self.array('face/offsets')
+
+    @property
+    def face_indices(self):
+        return self.array('face/indices')
+
+    @property
+    def halfedges(self):
+        """tuple : The vertex index pairs and face indices of the halfedges of all faces."""
+        return self.array('halfedge/vertices'), self.array('halfedge/faces')
+
+    def faces(self):
+        """Iterate over the faces as lists of vertex indices."""
+        offsets = self.face_offsets.tolist()
+        indices = self.face_indices.tolist()
+        for i in range(len(offsets) - 1):
+            yield indices[offsets[i]:offsets[i + 1]]
+
+    # --------------------------------------------------------------------------
+    # attributes
+    # --------------------------------------------------------------------------
+
+    def _column(self, element, name):
+        columns = self.header['columns'][element]
+        if name not in columns:
+            raise KeyError('No {} attribute named {}'.format(element, name))
+        spec = columns[name]
+        prefix = '{}:{}/'.format(element, name)
+        values = self.array(prefix + 'values') if self.has_array(prefix + 'values') else None
+        null = self.array(prefix + 'null') if self.has_array(prefix + 'null') else None
+        absent = self.array(prefix + 'absent') if self.has_array(prefix + 'absent') else None
+        return spec, values, null, absent
+
+    def _attribute(self, element, name):
+        spec, values, null, absent = self._column(element, name)
+        if spec['kind'] in ('bool', 'int', 'float') and null is None and absent is None:
+            return values
+        column = _decode_column(spec, values, null, absent)
+        return [None if value is ABSENT else value for value in column]
+
+    def vertex_attribute(self, name):
+        """Get the values of a vertex attribute.
+
+        Numerical and boolean attributes without missing values are returned as arrays,
+        all others as lists.
+        """
+        if name in 'xyz' and self.has_array('vertex/xyz'):
+            return self.array('vertex/xyz')[:, 'xyz'.index(name)]
+        return self._attribute('vertex', name)
+
+    def face_attribute(self, name):
+        """Get the values of a face attribute."""
+        return self._attribute('face', name)
+
+    def edge_attribute(self, name):
+        """Get the values of an edge attribute."""
+        return self._attribute('edge', name)
+
+    def _rows(self, element, count):
+        names = []
+        columns = []
+        for name, spec in self.header['columns'][element].items():
+            names.append(name)
+            columns.append(_decode_column(*self._column(element, name)))
+        if element == 'vertex' and self.has_array('vertex/xyz'):
+            xyz = self.array('vertex/xyz').T.tolist()
+            names = list('xyz') + names
+            columns = xyz + columns
+        if not names:
+            return [{} for _ in range(count)]
+        rows = [dict(zip(names, values)) for values in zip(*columns)]
+        for name, spec in self.header['columns'][element].items():
+            if self.has_array('{}:{}/absent'.format(element, name)):
+                for row in rows:
+                    if row[name] is ABSENT:
+                        del row[name]
+        return rows
+
+    # --------------------------------------------------------------------------
+    # conversion
+    # --------------------------------------------------------------------------
+
+    def to_data(self):
+        """Convert the snapshot to the data dict of a COMPAS mesh."""
+        header = self.header
+        data = {
+            'attributes'  : header['attributes'],
+            'dva'         : header['dva'],
+            'dea'         : header['dea'],
+            'dfa'         : header['dfa'],
+            'vertex'      : {},
+            'face'        : {},
+            'facedata'    : {},
+            'edgedata'    : {},
+            'max_int_key' : header['max_int_key'],
+            'max_int_fkey': header['max_int_fkey'],
+        }
+        vkeys = self.vertex_keys.tolist()
+        fkeys = self.face_keys.tolist()
+        for key, attr in zip(vkeys, self._rows('vertex', len(vkeys))):
+            data['vertex'][repr(key)] = attr
+        for fkey, vertices in zip(fkeys, self._face_vertices()):
+            data['face'][repr(fkey)] = [repr(key) for key in vertices]
+        for fkey, attr, present in zip(fkeys, self._rows('face', len(fkeys)), self._facedata_mask()):
+            if present:
+                data['facedata'][repr(fkey)] = attr
+        for uv, attr in zip(self._edge_keys(), self._rows('edge', self.edge_keys.shape[0])):
+            data['edgedata'][repr(uv)] = attr
+        return data
+
+    def to_mesh(self, cls=None):
+        """Construct a mesh from the data in the snapshot.
+
+        Parameters
+        ----------
+        cls : type, optional
+            The mesh class.
+            Default is :class:`compas.datastructures.Mesh`.
+
+        Returns
+        -------
+        Mesh
+            A mesh of type ``cls``, identical to the one that was stored.
+
+        Notes
+        -----
+        The dictionaries of the mesh are populated directly from the stored arrays,
+        in their original order, without the detour through the repr of keys
+        and the generic ``add_vertex`` and ``add_face`` methods.
+
+        """
+        if cls is None:
+            from compas.datastructures import Mesh
+            cls = Mesh
+
+        header = self.header
+
+        mesh = cls()
+        mesh.attributes.update(header['attributes'])
+        mesh.default_vertex_attributes.update(header['dva'])
+        mesh.default_face_attributes.update(header['dfa'])
+        mesh.default_edge_attributes.update(header['dea'])
+        mesh.clear()
+
+        dva = mesh.default_vertex_attributes
+        dfa = mesh.default_face_attributes
+
+        vertex = mesh.vertex
+        halfedge = mesh.halfedge
+        face = mesh.face
+        facedata = mesh.facedata
+        edgedata = mesh.edgedata
+
+        vkeys = self.vertex_keys.tolist()
+        fkeys = self.face_keys.tolist()
+
+        rows = self._rows('vertex', len(vkeys))
+        if not self._complete('vertex', dva):
+            rows = [_compiled(dva, attr) for attr in rows]
+        for key, attr in zip(vkeys, rows):
+            vertex[key] = attr
+
+        rows = self._rows('face', len(fkeys))
+        if not self._complete('face', dfa):
+            rows = [_compiled(dfa, attr) for attr in rows]
+        for fkey, vertices, fattr in zip(fkeys, self._face_vertices(), rows):
+            face[fkey] = vertices
+            facedata[fkey] = fattr
+
+        offsets = self.array('adjacency/offsets').tolist()
+        nbrs = self.array('adjacency/vertices').tolist()
+        faces = fkeys + [None]
+        faces = [faces[index] for index in self.array('adjacency/faces').tolist()]
+        for i, key in enumerate(vkeys):
+            a = offsets[i]
+            b = offsets[i + 1]
+            halfedge[key] = dict(zip(nbrs[a:b], faces[a:b]))
+
+        for uv, attr in zip(self._edge_keys(), self._rows('edge', self.edge_keys.shape[0])):
+            edgedata[uv] = attr
+
+        mesh._max_int_key = header['max_int_key']
+        mesh._max_int_fkey = header['max_int_fkey']
+        return mesh
+
+    def _complete(self, element, defaults):
+        columns = self.header['columns'][element]
+        if element == 'vertex' and self.has_array('vertex/xyz'):
+            columns = dict(columns, x=None, y=None, z=None)
+        for name in defaults:
+            if name not in columns:
+                return False
+        for name in columns:
+            if self.has_array('{}:{}/absent'.format(element, name)):
+                return False
+        return True
+
+    def _face_vertices(self):
+        offsets = self.face_offsets.tolist()
+        keys = self.array('face/vertices').tolist()
+        for i in range(len(offsets) - 1):
+            yield keys[offsets[i]:offsets[i + 1]]
+
+    def _facedata_mask(self):
+        if self.has_array('face/facedata'):
+            return self.array('face/facedata').tolist()
+        return [True] * self.number_of_faces()
+
+    def _edge_keys(self):
+        uv = self.edge_keys
+        return list(zip(uv[:, 0].tolist(), uv[:, 1].tolist()))
+
+
+# ==============================================================================
+# Writing
+# ==============================================================================
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _check_keys(keys, element):
+    for key in keys:
+        if type(key) is not int:
+            raise TypeError('Snapshots only support integer {} keys: {!r}'.format(element, key))
+
+
+def _write(filepath, header, arrays):
+    layout = {}
+    blocks = []
+    offset = 0
+    for name in sorted(arrays):
+        data = ascontiguousarray(arrays[name])
+        data = data.astype(data.dtype.newbyteorder('<'), copy=False)
+        layout[name] = {'dtype': data.dtype.str, 'shape': list(data.shape), 'offset': offset}
+        blocks.append((offset, data))
+        offset = _aligned(offset + data.nbytes)
+    header = dict(header)
+    header['layout'] = layout
+    header = json.dumps(header).encode('utf-8')
+    start = _aligned(len(MAGIC) + 8 + len(header))
+    with open(filepath, 'wb') as fp:
+        fp.write(MAGIC)
+        fp.write(struct.pack('<Q', len(header)))
+        fp.write(header)
+        for offset, data in blocks:
+            fp.write(b'\x00' * (start + offset - fp.tell()))
+            fp.write(data.tobytes())
+
+
+def mesh_to_snapshot_numpy(mesh, filepath, settings=None):
+    """Write the data of a mesh to a snapshot file.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A COMPAS mesh, or a mesh of a derived type such as a ``Shell``.
+        All vertex and face keys have to be integers.
+    filepath : str
+        Path to the snapshot file.
+    settings : dict, optional
+        Additional settings to store in the header, for example the settings
+        of a session file.
+
+    Notes
+    -----
+    The conversion is lossless.
+    The type of every attribute value is preserved, as well as the order of the
+    vertices, faces and edge data.
+
+    See Also
+    --------
+    :class:`MeshSnapshot`, :func:`mesh_from_snapshot_numpy`
+
+    """
+    vkeys = list(mesh.vertex)
+    fkeys = list(mesh.face)
+    uvs = list(mesh.edgedata)
+
+    _check_keys(vkeys, 'vertex')
+    _check_keys(fkeys, 'face')
+
+    key_index = {key: index for index, key in enumerate(vkeys)}
+
+    arrays = {}
+    arrays['vertex/keys'] = array(vkeys, dtype=int64)
+    arrays['face/keys'] = array(fkeys, dtype=int64)
+    arrays['edge/keys'] = array(uvs, dtype=int64).reshape((-1, 2))
+
+    sizes = [len(mesh.face[fkey]) for fkey in fkeys]
+    offsets = zeros(len(fkeys) + 1, dtype=int64)
+    offsets[1:] = cumsum(sizes)
+    vertices = [key for fkey in fkeys for key in mesh.face[fkey]]
+    indices = array([key_index[key] for key in vertices], dtype=int64)
+    arrays['face/offsets'] = offsets
+    arrays['face/vertices'] = array(vertices, dtype=int64)
+    arrays['face/indices'] = indices
+
+    following = arange(1, len(indices) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    arrays['halfedge/vertices'] = vstack((indices, indices[following])).T
+    arrays['halfedge/faces'] = repeat(arange(len(fkeys)), sizes)
+
+    fkey_index = {fkey: index for index, fkey in enumerate(fkeys)}
+    offsets = zeros(len(vkeys) + 1, dtype=int64)
+    offsets[1:] = cumsum([len(mesh.halfedge[key]) for key in vkeys])
+    arrays['adjacency/offsets'] = offsets
+    arrays['adjacency/vertices'] = array([nbr for key in vkeys for nbr in mesh.halfedge[key]], dtype=int64)
+    arrays['adjacency/faces'] = array([-1 if fkey is None else fkey_index[fkey] for key in vkeys for fkey in mesh.halfedge[key].values()], dtype=int64)
+
+    vattrs = [mesh.vertex[key] for key in vkeys]
+    fattrs = [mesh.facedata.get(fkey, {}) for fkey in fkeys]
+    eattrs = [mesh.edgedata[uv] or {} for uv in uvs]
+
+    arrays['face/facedata'] = array([fkey in mesh.facedata for fkey in fkeys], dtype=bool)
+
+    vnames = _names(vattrs)
+    fnames = _names(fattrs)
+    enames = _names(eattrs)
+
+    packed = all(type(attr.get(name)) is float for attr in vattrs for name in 'xyz')
+    if packed:
+        arrays['vertex/xyz'] = array([[attr['x'], attr['y'], attr['z']] for attr in vattrs], dtype=float).reshape((-1, 3))
+        vnames = [name for name in vnames if name not in 'xyz']
+
+    columns = {}
+    for element, names, attrs in (('vertex', vnames, vattrs), ('face', fnames, fattrs), ('edge', enames, eattrs)):
+        specs, data = _encode_attributes(names, attrs)
+        columns[element] = specs
+        for name in data:
+            for part in data[name]:
+                arrays['{}:{}/{}'.format(element, name, part)] = data[name][part]
+
+    header = {
+        'version'     : 1,
+        'attributes'  : mesh.attributes,
+        'dva'         : mesh.default_vertex_attributes,
+        'dea'         : mesh.default_edge_attributes,
+        'dfa'         : mesh.default_face_attributes,
+        'max_int_key' : mesh._max_int_key,
+        'max_int_fkey': mesh._max_int_fkey,
+        'columns'     : columns,
+    }
+    if settings is not None:
+        header['settings'] = settings
+
+    _write(filepath, header, arrays)
+
+
+def _names(attrs):
+    names = []
+    seen = set()
+    for attr in attrs:
+        for name in attr:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names
+
+
+def mesh_from_snapshot_numpy(filepath, cls=None, mmap=True):
+    """Construct a mesh from a snapshot file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the snapshot file.
+    cls : type, optional
+        The mesh class.
+        Default is :class:`compas.datastructures.Mesh`.
+    mmap : bool, optional
+        Map the arrays of the file into memory instead of reading them.
+        Default is ``True``.
+
+    Returns
+    -------
+    Mesh
+        A mesh of type ``cls``.
+
+    """
+    return MeshSnapshot(filepath, mmap=mmap).to_mesh(cls)
+
+
+def json_to_snapshot_numpy(filepath, snapshot, cls=None):
+    """Convert a JSON data file to a snapshot file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a JSON file with mesh data, or to a session file of the form
+        ``{'settings': ..., 'shell': ...}``.
+    snapshot : str
+        Path to the snapshot file.
+    cls : type, optional
+        The mesh class used to interpret the data.
+        Default is :class:`compas.datastructures.Mesh`.
+
+    Returns
+    -------
+    Mesh
+        The mesh that was stored.
+
+    """
+    if cls is None:
+        from compas.datastructures import Mesh
+        cls = Mesh
+    with open(filepath, 'r') as fp:
+        data = json.load(fp)
+    settings = None
+    if 'shell' in data and 'vertex' not in data:
+        settings = data.get('settings')
+        data = data['shell']
+    mesh = cls.from_data(data)
+    mesh_to_snapshot_numpy(mesh, snapshot, settings=settings)
+    return mesh
@@ -0,0 +1,76 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.datastructures import mesh_split_edge
+
+
+__all__ = [
+    'mesh_subdivide_quad_tracked',
+]
+
+
+def mesh_subdivide_quad_tracked(mesh, k=1):
+    """Subdivide a mesh such that all faces are quads, and keep track of the parents of the new elements.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The mesh.
+    k : int, optional
+        The number of levels of subdivision.
+        Default is ``1``.
+
+    Returns
+    -------
+    list
+        For every level, a tuple with the subdivided mesh and three maps from the elements
+        of the mesh of the previous level to the elements of the subdivided mesh:
+
+        * ``edge_vertex``: every edge (in both directions) to the vertex inserted on the edge,
+        * ``face_vertex``: every face to the vertex inserted at its centroid,
+        * ``face_children``: every face to the list of faces it is split into,
+          in the order of the vertices of the face, such that the vertex ``i`` of the face
+          is a corner of child ``i``.
+
+    Notes
+    -----
+    The subdivided meshes are identical to those of
+    :func:`compas.datastructures.mesh_subdivide` with ``scheme='quad'``,
+    including the keys of the new vertices and faces.
+    The maps are recorded while subdividing,
+    such that they do not have to be reconstructed from the topology of the subdivided mesh.
+
+    Examples
+    --------
+    >>> (S1, E0, V0, F0), (S2, E1, V1, F1) = mesh_subdivide_quad_tracked(shell, k=2)
+    >>> for u, v in shell.edges():
+    ...     w = E0[u, v]
+    ...     S2.set_edge_attribute((u, E1[u, w]), 'q', 10.0)
+
+    """
+    levels = []
+    for _ in range(k):
+        subd = mesh.copy()
+        edge_vertex = {}
+        face_vertex = {}
+        face_children = {}
+        for u, v in list(subd.edges()):
+            w = mesh_split_edge(subd, u, v, allow_boundary=True)
+            edge_vertex[u, v] = edge_vertex[v, u] = w
+        for fkey in mesh.faces():
+            descendant = {i: j for i, j in subd.face_halfedges(fkey)}
+            ancestor = {j: i for i, j in subd.face_halfedges(fkey)}
+            x, y, z = mesh.face_centroid(fkey)
+            c = subd.add_vertex(x=x, y=y, z=z)
+            children = []
+            for key in mesh.face_vertices(fkey):
+                a = ancestor[key]
+                d = descendant[key]
+                children.append(subd.add_face([a, key, d, c]))
+            del subd.face[fkey]
+            face_vertex[fkey] = c
+            face_children[fkey] = children
+        levels.append((subd, edge_vertex, face_vertex, face_children))
+        mesh = subd
+    return levels
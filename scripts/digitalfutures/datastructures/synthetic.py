@@ -0,0 +1,196 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from digitalfutures.datastructures.subdivision import mesh_subdivide_quad_tracked
+
+
+__all__ = [
+    'shell_subdivide_labelled',
+    'shell_synthetic',
+]
+
+
+LENGTHS = ['f', 'l', 'l0']
+
+
+def _halved(attr):
+    attr = attr.copy()
+    for name in LENGTHS:
+        if isinstance(attr.get(name), float):
+            attr[name] = 0.5 * attr[name]
+    return attr
+
+
+def _edge_attr(mesh, u, v):
+    attr = mesh.default_edge_attributes.copy()
+    attr.update(mesh.edgedata.get((u, v)) or mesh.edgedata.get((v, u)) or {})
+    return attr
+
+
+def _face_counts(mesh, fkey, count, names):
+    # the number of the children of a face along its strip
+    # the children at the edge shared with the next face of the strip come second
+    vertices = mesh.face_vertices(fkey)
+    label = [mesh.facedata[fkey].get(name) for name in names]
+    forward = backward = None
+    for a, b in zip(vertices, vertices[1:] + vertices[:1]):
+        nbr = mesh.halfedge[b][a]
+        if nbr is None or [mesh.facedata.get(nbr, {}).get(name) for name in names] != label:
+            continue
+        other = mesh.facedata[nbr].get('count')
+        if other == count + 1:
+            forward = a, b
+        elif other == count - 1:
+            backward = a, b
+    if forward:
+        return [2 * count + 1 if key in forward else 2 * count for key in vertices]
+    if backward:
+        return [2 * count if key in backward else 2 * count + 1 for key in vertices]
+    return [2 * count for key in vertices]
+
+
+def shell_subdivide_labelled(shell, names=('panel', 'strip')):
+    """Subdivide a shell once into quads, and label the new elements like the elements of the shell.
+
+    Parameters
+    ----------
+    shell : Shell
+        A shell, typically a form found cablenet.
+    names : tuple of str, optional
+        The names of the face attributes identifying the strips of the shell.
+        Default is ``('panel', 'strip')``.
+
+    Returns
+    -------
+    Shell
+        The subdivided shell.
+
+    Notes
+    -----
+    The subdivision is the same as :func:`mesh_subdivide_quad_tracked`.
+    The new elements are labelled as follows.
+
+    * Vertices inserted on a boundary edge between two anchors are anchors,
+      such that anchored boundary beams remain anchored,
+      and their thickness ``'t'`` is the mean of the thickness of the vertices of the edge.
+      Vertices inserted at the centroids of faces have the mean thickness of the vertices of the face.
+    * Faces inherit the attributes of the face they are part of.
+      The ``'count'`` of the faces along the strips identified by ``names`` is renumbered,
+      such that the children of a face with count ``c`` have count ``2c`` or ``2c + 1``,
+      in the direction of the strip.
+    * Edges inherit the attributes of the edge they are part of.
+      Edges from the centroid of a face to the middle of a face edge inherit the attributes
+      of the previous edge of the face, with the mean force density ``'q'``
+      of the two face edges adjacent to the face edge.
+      The forces and lengths ``'f'``, ``'l'`` and ``'l0'`` of all edges are halved,
+      such that every edge keeps its force density,
+      and the force per unit width of the net, of which the cables are half as far apart, is preserved.
+
+    Examples
+    --------
+    >>> fabric = Shell.from_json(FILE_I)
+    >>> subd = shell_subdivide_labelled(fabric)
+    >>> subd.face_groups(['panel', 'strip'], sort_by='count')
+
+    """
+    (subd, edge_vertex, face_vertex, face_children), = mesh_subdivide_quad_tracked(shell, k=1)
+
+    for u, v in shell.edges():
+        w = edge_vertex[u, v]
+        attr = subd.vertex[w]
+        attr['t'] = 0.5 * (shell.vertex[u].get('t', 0.0) + shell.vertex[v].get('t', 0.0))
+        if shell.is_edge_on_boundary(u, v):
+            for name in ('is_anchor', 'is_fixed'):
+                if shell.vertex[u].get(name) and shell.vertex[v].get(name):
+                    attr[name] = True
+
+    edgedata = {}
+    for u, v in shell.edges():
+        w = edge_vertex[u, v]
+        attr = _halved(_edge_attr(shell, u, v))
+        edgedata[u, w] = edgedata[w, u] = attr
+        edgedata[w, v] = edgedata[v, w] = attr.copy()
+
+    facedata = {}
+    for fkey, children in face_children.items():
+        vertices = shell.face_vertices(fkey)
+        c = face_vertex[fkey]
+        subd.vertex[c]['t'] = sum(shell.vertex[key].get('t', 0.0) for key in vertices) / len(vertices)
+
+        attr = shell.facedata.get(fkey)
+        if attr:
+            count = attr.get('count')
+            counts = _face_counts(shell, fkey, count, names) if isinstance(count, int) else None
+            for i, child in enumerate(children):
+                facedata[child] = attr.copy()
+                if counts:
+                    facedata[child]['count'] = counts[i]
+
+        for i, (a, b) in enumerate(zip(vertices, vertices[1:] + vertices[:1])):
+            before = _edge_attr(shell, vertices[i - 1], a)
+            after = _edge_attr(shell, b, vertices[(i + 2) % len(vertices)])
+            attr = _halved(before)
+            if isinstance(before.get('q'), float) and isinstance(after.get('q'), float):
+                attr['q'] = 0.5 * (before['q'] + after['q'])
+            w = edge_vertex[a, b]
+            edgedata[w, c] = edgedata[c, w] = attr
+
+    subd.edgedata = edgedata
+    subd.facedata = facedata
+    return subd
+
+
+def shell_synthetic(shell, vertices=None, k=None, names=('panel', 'strip')):
+    """Construct a larger shell with the structure of a given shell.
+
+    Parameters
+    ----------
+    shell : Shell
+        The shell, typically one of the workshop designs.
+    vertices : int, optional
+        The minimum number of vertices of the synthetic shell.
+    k : int, optional
+        The number of subdivisions.
+        Ignored if a number of vertices is provided.
+        Default is ``1``.
+    names : tuple of str, optional
+        The names of the face attributes identifying the strips of the shell.
+        Default is ``('panel', 'strip')``.
+
+    Returns
+    -------
+    Shell
+        The synthetic shell.
+
+    Notes
+    -----
+    The shell is subdivided and relabelled with :func:`shell_subdivide_labelled`,
+    until the requested number of vertices or subdivisions is reached.
+    Every subdivision multiplies the number of vertices by roughly four.
+    For example, the 335 vertices of ``data/data.json`` become 79519 vertices after four subdivisions,
+    and about 1.3M vertices after six.
+
+    The synthetic shell is not in equilibrium.
+    The forces and lengths are estimated from those of the shell.
+    To compute the equilibrium of the force densities,
+    and the unstressed lengths of the cables, see ``scripts/synthetic.py``.
+
+    Examples
+    --------
+    >>> shell = Shell.from_json(FILE_I)
+    >>> synthetic = shell_synthetic(shell, vertices=100000)
+    >>> synthetic.number_of_vertices() >= 100000
+    True
+
+    """
+    if vertices is None and k is None:
+        k = 1
+    synthetic = shell
+    level = 0
+    while (synthetic.number_of_vertices() < vertices) if vertices is not None else (level < k):
+        synthetic = shell_subdivide_labelled(synthetic, names=names)
+        level += 1
+    if synthetic is shell:
+        synthetic = shell.copy()
+    return synthetic
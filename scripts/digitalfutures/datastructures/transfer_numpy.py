@@ -0,0 +1,188 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import nonzero
+
+from digitalfutures.geometry import match_points_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_xyz_numpy
+
+
+__all__ = [
+    'mesh_vertex_pairs_numpy',
+    'mesh_vertex_map_numpy',
+    'mesh_transfer_attributes_numpy',
+]
+
+
+def mesh_vertex_pairs_numpy(source, target, tol=1e-3):
+    """Pair the vertices of a mesh with the vertices of another mesh at the same location.
+
+    Parameters
+    ----------
+    source : Mesh
+        The mesh of which the vertices are searched.
+    target : Mesh
+        The mesh of which the vertices are paired.
+    tol : float, optional
+        The maximum distance between vertices at the same location.
+        Default is ``1e-3``.
+
+    Returns
+    -------
+    list
+        For every vertex of the target with a vertex of the source within the tolerance,
+        the index of the vertex of the target and the index of the nearest vertex of the source,
+        in the order of ``target.vertices()`` and ``source.vertices()``.
+
+    See Also
+    --------
+    :func:`digitalfutures.geometry.match_points_numpy`
+
+    Notes
+    -----
+    The pairs are lists of indices instead of a dict of keys,
+    such that they can be returned through a :class:`compas.rpc.Proxy`,
+    of which the JSON serialisation turns the keys of dicts into strings.
+
+    Examples
+    --------
+    >>> skeys = list(shell.vertices())
+    >>> tkeys = list(subd.vertices())
+    >>> for i, j in datastructures.mesh_vertex_pairs_numpy(shell, subd):
+    ...     subd.vertex[tkeys[i]]['is_anchor'] = shell.vertex[skeys[j]]['is_anchor']
+
+    """
+    index, distance = match_points_numpy(mesh_xyz_numpy(source), mesh_xyz_numpy(target), tol=tol)
+    found = nonzero(index >= 0)[0]
+    return [[i, j] for i, j in zip(found.tolist(), index[found].tolist())]
+
+
+def mesh_vertex_map_numpy(source, target, tol=1e-3):
+    """Map the vertices of a mesh to the vertices of another mesh at the same location.
+
+    Parameters
+    ----------
+    source : Mesh
+        The mesh of which the vertices are searched.
+    target : Mesh
+        The mesh of which the vertices are mapped.
+    tol : float, optional
+        The maximum distance between vertices at the same location.
+        Default is ``1e-3``.
+
+    Returns
+    -------
+    dict
+        A dict mapping the vertices of the target to the nearest vertices of the source.
+        Vertices of the target without a vertex of the source within the tolerance are not included.
+
+    See Also
+    --------
+    :func:`mesh_vertex_pairs_numpy`
+
+    """
+    skeys = list(source.vertices())
+    tkeys = list(target.vertices())
+    return {tkeys[i]: skeys[j] for i, j in mesh_vertex_pairs_numpy(source, target, tol=tol)}
+
+
+def _names(attr, names, exclude=()):
+    if names is True:
+        return [name for name in attr if name not in exclude]
+    return [name for name in names if name in attr]
+
+
+def mesh_transfer_attributes_numpy(source, target, vertices=True, edges=True, faces=True, tol=1e-3):
+    """Transfer the attributes of the vertices, edges and faces of a mesh to the elements of another mesh at the same location.
+
+    Parameters
+    ----------
+    source : Mesh
+        The mesh with the attributes.
+    target : Mesh
+        The mesh to which the attributes are transferred.
+    vertices : bool or list of str, optional
+        The names of the vertex attributes that are transferred,
+        ``True`` for all attributes except the coordinates, or ``False`` for none.
+        Default is ``True``.
+    edges : bool or list of str, optional
+        The names of the edge attributes that are transferred, ``True`` for all, or ``False`` for none.
+        Default is ``True``.
+    faces : bool or list of str, optional
+        The names of the face attributes that are transferred, ``True`` for all, or ``False`` for none.
+        Default is ``True``.
+    tol : float, optional
+        The maximum distance between vertices at the same location.
+        Default is ``1e-3``.
+
+    Returns
+    -------
+    tuple
+        Three dicts, mapping the vertices, edges and faces of the target
+        to the corresponding elements of the source.
+
+    Notes
+    -----
+    The vertices are mapped with :func:`mesh_vertex_map_numpy`.
+    An edge of the target corresponds to an edge of the source if its vertices
+    are mapped to the vertices of that edge.
+    A face of the target corresponds to a face of the source if its vertices
+    are mapped to the vertices of that face, regardless of their order.
+    Therefore, the transfer does not depend on the keys of the elements.
+    It works for meshes that were welded or renumbered, or of which the cycles of the faces were flipped,
+    and for the elements that a remeshed or subdivided mesh shares with the original.
+
+    The default values of the attributes of the source that the target does not have
+    are added to the default attributes of the target.
+
+    Examples
+    --------
+    >>> subd = mesh_subdivide_quad(shell, k=2)
+    >>> vertex_map, edge_map, face_map = mesh_transfer_attributes_numpy(shell, subd, edges=False, faces=False)
+
+    """
+    vertex_map = mesh_vertex_map_numpy(source, target, tol=tol)
+    edge_map = {}
+    face_map = {}
+
+    if vertices:
+        dva = source.default_vertex_attributes
+        target.update_default_vertex_attributes({name: dva[name] for name in _names(dva, vertices, 'xyz') if name not in target.default_vertex_attributes})
+        for key, skey in vertex_map.items():
+            attr = source.vertex[skey]
+            target.vertex[key].update({name: attr[name] for name in _names(attr, vertices, 'xyz')})
+
+    if edges:
+        uv_attr = {}
+        for u, v, attr in source.edges(True):
+            uv_attr[u, v] = uv_attr[v, u] = attr
+        dea = source.default_edge_attributes
+        target.update_default_edge_attributes({name: dea[name] for name in _names(dea, edges) if name not in target.default_edge_attributes})
+        for u, v, attr in target.edges(True):
+            if u not in vertex_map or v not in vertex_map:
+                continue
+            uv = vertex_map[u], vertex_map[v]
+            if uv not in uv_attr:
+                continue
+            edge_map[u, v] = uv
+            sattr = uv_attr[uv]
+            attr.update({name: sattr[name] for name in _names(sattr, edges)})
+
+    if faces:
+        vertices_fkey = {frozenset(source.face_vertices(fkey)): fkey for fkey in source.faces()}
+        dfa = source.default_face_attributes
+        target.update_default_face_attributes({name: dfa[name] for name in _names(dfa, faces) if name not in target.default_face_attributes})
+        for fkey in target.faces():
+            keys = target.face_vertices(fkey)
+            if not all(key in vertex_map for key in keys):
+                continue
+            sfkey = vertices_fkey.get(frozenset(vertex_map[key] for key in keys))
+            if sfkey is None:
+                continue
+            face_map[fkey] = sfkey
+            sattr = source.facedata.get(sfkey) or {}
+            attr = target.facedata.setdefault(fkey, {})
+            attr.update({name: sattr[name] for name in _names(sattr, faces)})
+
+    return vertex_map, edge_map, face_map
@@ -0,0 +1,69 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from digitalfutures.geometry import unroll_triangles
+
+
+__all__ = [
+    'mesh_unroll',
+]
+
+
+def mesh_unroll(mesh, edge):
+    """Unroll a triangle mesh into the XY plane.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A triangle mesh.
+    edge : tuple
+        The first (directed) edge of the layout.
+        The first vertex of the edge is placed at the origin, the second along the positive X axis.
+        The face on the left of the edge is unrolled first.
+        If there is no face on the left, the edge is reversed.
+
+    Returns
+    -------
+    dict
+        A dict mapping the vertices of the mesh to their flattened XYZ coordinates.
+        Vertices that cannot be reached from the first face are not included.
+
+    Raises
+    ------
+    ValueError
+        If the mesh contains faces that are not triangles.
+
+    Examples
+    --------
+    >>> trimesh = quadmesh.copy()
+    >>> mesh_quads_to_triangles(trimesh)
+    >>> flat = mesh_unroll(trimesh, (u, v))
+    >>> for key, attr in quadmesh.vertices(True):
+    ...     attr['x'], attr['y'], attr['z'] = flat[key]
+
+    """
+    u, v = edge
+    root = mesh.halfedge[u][v]
+    if root is None:
+        root = mesh.halfedge[v][u]
+        u, v = v, u
+
+    key_index = mesh.key_index()
+    xyz = [mesh.vertex_coordinates(key) for key in mesh.vertices()]
+
+    fkeys = []
+    triangles = []
+    for fkey in mesh.faces():
+        vertices = mesh.face_vertices(fkey)
+        if len(vertices) != 3:
+            raise ValueError('Face {} is not a triangle: {}'.format(fkey, vertices))
+        fkeys.append(fkey)
+        triangles.append([key_index[key] for key in vertices])
+
+    index = fkeys.index(root)
+    start = mesh.face_vertices(root).index(u)
+
+    flat = unroll_triangles(xyz, triangles, root=index, start=start)
+
+    return {key: flat[key_index[key]] for key in mesh.vertices() if flat[key_index[key]] is not None}
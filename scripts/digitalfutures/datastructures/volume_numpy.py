@@ -0,0 +1,114 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from digitalfutures.geometry import offset_solid_numpy
+from digitalfutures.geometry import offset_volumes_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_face_indices_numpy
+from digitalfutures.datastructures.offsets_numpy import mesh_offsets_numpy
+
+
+__all__ = [
+    'mesh_solid_numpy',
+    'shell_volume_numpy',
+]
+
+
+def _offsets(mesh, thickness, name):
+    xyz_e, xyz_i = mesh_offsets_numpy(mesh, thickness, name)
+    offsets, indices = mesh_face_indices_numpy(mesh)
+    return xyz_e, xyz_i, offsets, indices
+
+
+def mesh_solid_numpy(mesh, thickness=None, name='t'):
+    """Construct the closed solid between the extrados and intrados of a mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh object.
+    thickness : float or list, optional
+        The distance between extrados and intrados.
+        A single value for all vertices, or one value per vertex in the order of ``mesh.vertices()``.
+        If no value is provided, the thickness is taken from a vertex attribute.
+    name : str, optional
+        The name of the vertex attribute containing the thickness.
+        Default is ``'t'``.
+
+    Returns
+    -------
+    tuple
+        The vertices and faces of the solid, as lists.
+        The first half of the vertices is on the intrados, the second half on the extrados,
+        both in the order of ``mesh.vertices()``.
+
+    Notes
+    -----
+    The extrados and intrados are the same as those of :func:`mesh_offsets_numpy`.
+    The solid is closed along all boundaries of the mesh, including the boundaries of holes.
+
+    Examples
+    --------
+    >>> vertices, faces = mesh_solid_numpy(shell, 0.04)
+    >>> volume = Mesh.from_vertices_and_faces(vertices, faces)
+
+    """
+    xyz_e, xyz_i, offsets, indices = _offsets(mesh, thickness, name)
+    xyz, offsets, indices = offset_solid_numpy(xyz_e, xyz_i, offsets, indices)
+    indices = indices.tolist()
+    faces = [indices[i:j] for i, j in zip(offsets[:-1], offsets[1:])]
+    return xyz.tolist(), faces
+
+
+def shell_volume_numpy(shell, thickness=None, name='t', group=None):
+    """Compute the exact volume of the solid between the extrados and intrados of a shell.
+
+    Parameters
+    ----------
+    shell : Shell
+        A shell.
+    thickness : float or list, optional
+        The distance between extrados and intrados.
+        A single value for all vertices, or one value per vertex in the order of ``shell.vertices()``.
+        If no value is provided, the thickness is taken from a vertex attribute.
+    name : str, optional
+        The name of the vertex attribute containing the thickness.
+        Default is ``'t'``.
+    group : str, optional
+        The name of a face attribute, for example ``'panel'``.
+        If provided, the volume is also summed per value of this attribute.
+
+    Returns
+    -------
+    tuple
+        The total volume, a dict mapping every face to its part of the volume,
+        and a dict mapping every value of the group attribute to the volume of the corresponding faces
+        (``None`` if no group attribute is provided).
+
+    Notes
+    -----
+    The volume of every face is the volume of the prism between the face on the intrados
+    and the face on the extrados, such that the sum over all faces
+    is the volume of the closed solid of :func:`mesh_solid_numpy`.
+    Unlike the area of the shell times the thickness, this takes into account
+    the curvature of the shell and variations of the thickness.
+
+    Examples
+    --------
+    >>> volume, volumes, panels = shell_volume_numpy(shell, 0.04, group='panel')
+    >>> for panel in sorted(panels):
+    ...     print(panel, panels[panel])
+
+    """
+    xyz_e, xyz_i, offsets, indices = _offsets(shell, thickness, name)
+    volumes = offset_volumes_numpy(xyz_e, xyz_i, offsets, indices)
+    volume = float(volumes.sum())
+    fkeys = list(shell.faces())
+    face_volume = {fkey: float(v) for fkey, v in zip(fkeys, volumes)}
+    if group is None:
+        return volume, face_volume, None
+    groups = {}
+    for fkey in fkeys:
+        value = shell.get_face_attribute(fkey, group)
+        groups[value] = groups.get(value, 0.0) + face_volume[fkey]
+    return volume, face_volume, groups
@@ -0,0 +1,89 @@
+"""
+********************************************************************************
+digitalfutures.geometry
+********************************************************************************
+
+.. currentmodule:: digitalfutures.geometry
+
+
+Unrolling
+=========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    unroll_triangles
+
+
+Normals
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    face_normals_numpy
+    vertex_normals_numpy
+
+
+Areas
+=====
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    face_areas_numpy
+    vertex_areas_numpy
+
+
+Volumes
+=======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    volume_polyhedron_numpy
+    offset_solid_numpy
+    offset_volumes_numpy
+
+
+Intersections
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    intersection_lines_planes_numpy
+
+
+Matching
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    match_points_numpy
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas
+
+from .unroll import *
+
+if not compas.IPY:
+    from .normals_numpy import *
+    from .areas_numpy import *
+    from .volume_numpy import *
+    from .intersections_numpy import *
+    from .matching_numpy import *
+
+
+__all__ = [name for name in dir() if not name.startswith('_')]
@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import arange
+from numpy import asarray
+from numpy import bincount
+from numpy import cross
+from numpy import diff
+from numpy import int64
+from numpy import repeat
+from numpy import sign
+
+from compas.numerical import normrow
+
+from digitalfutures.geometry.normals_numpy import _face_sums
+
+
+__all__ = [
+    'face_areas_numpy',
+    'vertex_areas_numpy',
+]
+
+
+def face_areas_numpy(xyz, offsets, indices):
+    """Compute the areas of all faces of a mesh in one pass.
+
+    Parameters
+    ----------
+    xyz : array
+        The vertex coordinates.
+    offsets : array
+        The face offsets, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces.
+
+    Returns
+    -------
+    array
+        The areas of the faces.
+
+    Notes
+    -----
+    The area of a face is the sum of the areas of the triangles formed by its edges and its centroid,
+    with triangles facing away from the triangle of the last edge counted negatively,
+    which is the same as :func:`compas.geometry.area_polygon`.
+
+    """
+    xyz = asarray(xyz, dtype=float).reshape((-1, 3))
+    offsets = asarray(offsets, dtype=int64)
+    indices = asarray(indices, dtype=int64)
+    f = len(offsets) - 1
+    sizes = diff(offsets)
+    faces = repeat(arange(f), sizes)
+    following = arange(1, len(indices) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    points = xyz[indices]
+    centroids = _face_sums(points, faces, f) / sizes.reshape((-1, 1))
+    a = points - centroids[faces]
+    n = cross(a, a[following])
+    n0 = n[offsets[1:] - 1][faces]
+    s = sign((n * n0).sum(axis=1))
+    s[s == 0] = -1
+    s[offsets[1:] - 1] = 1
+    return 0.5 * bincount(faces, weights=s * normrow(n).ravel(), minlength=f)
+
+
+def vertex_areas_numpy(xyz, offsets, indices):
+    """Compute the tributary areas of all vertices of a mesh in one pass.
+
+    Parameters
+    ----------
+    xyz : array
+        The vertex coordinates.
+    offsets : array
+        The face offsets, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces.
+
+    Returns
+    -------
+    array
+        The tributary areas of the vertices.
+        Vertices without faces have a zero area.
+
+    Notes
+    -----
+    The tributary area of a vertex in a face is the area of the two triangles formed by
+    the vertex, the face centroid, and the midpoints of the edges of the face at the vertex,
+    which is the same as :meth:`compas.datastructures.Mesh.vertex_area`.
+
+    Examples
+    --------
+    >>> offsets, indices = mesh_face_indices_numpy(mesh)
+    >>> areas = vertex_areas_numpy(mesh_xyz_numpy(mesh), offsets, indices)
+
+    """
+    xyz = asarray(xyz, dtype=float).reshape((-1, 3))
+    offsets = asarray(offsets, dtype=int64)
+    indices = asarray(indices, dtype=int64)
+    f = len(offsets) - 1
+    sizes = diff(offsets)
+    faces = repeat(arange(f), sizes)
+    following = arange(1, len(indices) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    preceding = arange(-1, len(indices) - 1)
+    preceding[offsets[:-1]] = offsets[1:] - 1
+    points = xyz[indices]
+    centroids = _face_sums(points, faces, f) / sizes.reshape((-1, 1))
+    c = centroids[faces] - points
+    a = normrow(cross(points[following] - points, c)) + normrow(cross(points[preceding] - points, c))
+    return 0.25 * bincount(indices, weights=a.ravel(), minlength=xyz.shape[0])
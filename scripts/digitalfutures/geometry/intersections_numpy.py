@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import absolute
+from numpy import asarray
+from numpy import nan
+from numpy import where
+
+
+__all__ = [
+    'intersection_lines_planes_numpy',
+]
+
+
+def intersection_lines_planes_numpy(lines, planes, tol=1e-6):
+    """Compute the intersections of lines and planes in one pass.
+
+    Parameters
+    ----------
+    lines : array
+        The lines, as pairs of points, with shape ``(n, 2, 3)``.
+    planes : array
+        The planes, as pairs of a base point and a normal, with shape ``(n, 2, 3)``,
+        or a single plane with shape ``(2, 3)`` that is intersected with all lines.
+    tol : float, optional
+        A tolerance for parallel lines and planes.
+        Default is ``1e-6``.
+
+    Returns
+    -------
+    tuple
+        The intersection points, with shape ``(n, 3)``,
+        the parameters of the intersection points along the lines, with shape ``(n,)``,
+        such that the points are ``a + t * (b - a)``,
+        and a mask, with shape ``(n,)``, that is ``False`` for lines parallel to their plane.
+        The points and parameters of parallel lines are ``nan``.
+
+    Notes
+    -----
+    Lines and planes are parallel if the dot product of the direction of the line
+    and the normal of the plane is not larger than the tolerance,
+    exactly as in :func:`compas.geometry.intersection_line_plane`.
+    The lines are infinite: the parameters can be smaller than zero and larger than one.
+
+    Examples
+    --------
+    >>> lines = [[a, add_vectors(a, r)] for a, r in zip(xyz, reactions)]
+    >>> points, t, mask = intersection_lines_planes_numpy(lines, plane)
+
+    """
+    lines = asarray(lines, dtype=float).reshape((-1, 2, 3))
+    planes = asarray(planes, dtype=float)
+    a = lines[:, 0]
+    ab = lines[:, 1] - a
+    o = planes[..., 0, :].reshape((-1, 3))
+    n = planes[..., 1, :].reshape((-1, 3))
+    cosa = (n * ab).sum(axis=1)
+    mask = absolute(cosa) > tol
+    t = - (n * (a - o)).sum(axis=1) / where(mask, cosa, 1.0)
+    t[~mask] = nan
+    return a + t.reshape((-1, 1)) * ab, t, mask
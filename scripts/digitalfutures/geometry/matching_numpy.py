@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import asarray
+from numpy import where
+
+from scipy.spatial import cKDTree
+
+
+__all__ = [
+    'match_points_numpy',
+]
+
+
+def match_points_numpy(points, targets, tol=1e-3):
+    """Find the nearest point of a cloud for every point of another cloud, within a tolerance.
+
+    Parameters
+    ----------
+    points : array
+        The XYZ coordinates of the points that are searched, with shape ``(n, 3)``.
+    targets : array
+        The XYZ coordinates of the points for which a match is searched, with shape ``(m, 3)``.
+    tol : float, optional
+        The maximum distance between matching points.
+        Default is ``1e-3``.
+
+    Returns
+    -------
+    tuple
+        For every target, the index of the nearest point, or ``-1`` if no point is closer than the tolerance,
+        and the distance to that point, or ``inf``.
+
+    Notes
+    -----
+    The points are stored in a KD tree, such that matching ``m`` targets takes ``O(m log n)`` time,
+    instead of comparing geometric keys, which are strings of rounded coordinates
+    that do not match if coordinates are close but rounded differently.
+    If several points are within the tolerance, the nearest one is returned.
+
+    Examples
+    --------
+    >>> index, distance = match_points_numpy(shell_xyz, subd_xyz)
+    >>> found = index >= 0
+
+    """
+    points = asarray(points, dtype=float).reshape((-1, 3))
+    targets = asarray(targets, dtype=float).reshape((-1, 3))
+    distance, index = cKDTree(points).query(targets, distance_upper_bound=tol)
+    index = where(index < len(points), index, -1)
+    return index, distance
@@ -0,0 +1,107 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import arange
+from numpy import asarray
+from numpy import bincount
+from numpy import cross
+from numpy import diff
+from numpy import int64
+from numpy import repeat
+from numpy import zeros
+
+from compas.numerical import normrow
+
+
+__all__ = [
+    'face_normals_numpy',
+    'vertex_normals_numpy',
+]
+
+
+def _face_sums(values, faces, f):
+    return asarray([bincount(faces, weights=values[:, axis], minlength=f) for axis in range(3)]).T
+
+
+def face_normals_numpy(xyz, offsets, indices, unitized=True):
+    """Compute the normals of all faces of a mesh in one pass.
+
+    Parameters
+    ----------
+    xyz : array
+        The vertex coordinates.
+    offsets : array
+        The face offsets, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces.
+    unitized : bool, optional
+        Return unit vectors.
+        Default is ``True``.
+
+    Returns
+    -------
+    array
+        The face normals.
+        If not unitized, the length of each normal is twice the area of the face,
+        exactly as in :func:`compas.geometry.normal_polygon`.
+
+    Notes
+    -----
+    The normal of every face is the sum of the normals of the triangles
+    formed by its edges and its centroid.
+
+    """
+    xyz = asarray(xyz, dtype=float).reshape((-1, 3))
+    offsets = asarray(offsets, dtype=int64)
+    indices = asarray(indices, dtype=int64)
+    f = len(offsets) - 1
+    sizes = diff(offsets)
+    faces = repeat(arange(f), sizes)
+    following = arange(1, len(indices) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    centroids = _face_sums(xyz[indices], faces, f) / sizes.reshape((-1, 1))
+    a = xyz[indices] - centroids[faces]
+    normals = _face_sums(cross(a, a[following]), faces, f)
+    if unitized:
+        lengths = normrow(normals)
+        lengths[lengths == 0] = 1.0
+        normals /= lengths
+    return normals
+
+
+def vertex_normals_numpy(xyz, offsets, indices):
+    """Compute the area-weighted normals of all vertices of a mesh in one pass.
+
+    Parameters
+    ----------
+    xyz : array
+        The vertex coordinates.
+    offsets : array
+        The face offsets, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces.
+
+    Returns
+    -------
+    array
+        The unit vertex normals.
+        Vertices without faces have a zero normal.
+
+    Notes
+    -----
+    The normal of a vertex is the normalised sum of the (area-weighted) normals
+    of the faces around it, which is the same as :meth:`compas.datastructures.Mesh.vertex_normal`.
+
+    """
+    xyz = asarray(xyz, dtype=float).reshape((-1, 3))
+    offsets = asarray(offsets, dtype=int64)
+    indices = asarray(indices, dtype=int64)
+    normals = face_normals_numpy(xyz, offsets, indices, unitized=False)
+    faces = repeat(arange(len(offsets) - 1), diff(offsets))
+    vectors = zeros(xyz.shape, dtype=float)
+    for axis in range(3):
+        vectors[:, axis] = bincount(indices, weights=normals[faces, axis], minlength=xyz.shape[0])
+    lengths = normrow(vectors)
+    lengths[lengths == 0] = 1.0
+    return vectors / lengths
@@ -0,0 +1,110 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import deque
+from math import sqrt
+
+
+__all__ = [
+    'unroll_triangles',
+]
+
+
+def _distance_squared(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+def _place(pa, pb, dab, dac, dbc):
+    # place the third vertex of a triangle in the XY plane,
+    # to the left of the (already placed) edge from a to b,
+    # at the intersection of the circles around a and b
+    ex = pb[0] - pa[0]
+    ey = pb[1] - pa[1]
+    d = sqrt(ex ** 2 + ey ** 2)
+    ex /= d
+    ey /= d
+    ab = sqrt(dab)
+    x = 0.5 * (dac - dbc + dab) / ab
+    y = sqrt(max(dac - x ** 2, 0.0))
+    return [pa[0] + x * ex - y * ey, pa[1] + x * ey + y * ex, 0.0]
+
+
+def unroll_triangles(xyz, triangles, root=0, start=0):
+    """Unroll a connected set of triangles into the XY plane.
+
+    Parameters
+    ----------
+    xyz : list
+        The XYZ coordinates of the vertices.
+    triangles : list
+        The triangles, as triplets of vertex indices with consistent cycle directions.
+    root : int, optional
+        The index of the triangle that is unrolled first.
+        Default is ``0``.
+    start : int, optional
+        The position of the first vertex in the root triangle.
+        This vertex is placed at the origin, and the next vertex of the triangle along the positive X axis.
+        Default is ``0``.
+
+    Returns
+    -------
+    list
+        The flattened XYZ coordinates of the vertices.
+        Vertices that are not part of the triangles reached from the root are ``None``.
+
+    Notes
+    -----
+    The triangles are visited breadth-first from the root.
+    For every neighbour of a visited triangle, the opposite vertex is placed
+    at the intersection of the circles around the vertices of the shared edge,
+    with radii equal to the lengths of the other two edges of the neighbour in 3D.
+    The cycle directions of the triangles are preserved, such that the normals
+    of the flattened triangles point in the positive Z direction.
+
+    The result is identical to placing the opposite vertices with a frame-to-frame
+    transformation from the plane of the neighbour to the XY plane.
+
+    Examples
+    --------
+    >>> xyz = [[0, 0, 0], [1, 0, 0], [1, 1, 1], [0, 1, 1]]
+    >>> flat = unroll_triangles(xyz, [[0, 1, 2], [0, 2, 3]])
+
+    """
+    halfedge = {}
+    for index, (a, b, c) in enumerate(triangles):
+        halfedge[a, b] = index
+        halfedge[b, c] = index
+        halfedge[c, a] = index
+
+    flat = [None] * len(xyz)
+
+    a = triangles[root][start % 3]
+    b = triangles[root][(start + 1) % 3]
+    c = triangles[root][(start + 2) % 3]
+    dab = _distance_squared(xyz[a], xyz[b])
+    flat[a] = [0.0, 0.0, 0.0]
+    flat[b] = [sqrt(dab), 0.0, 0.0]
+    flat[c] = _place(flat[a], flat[b], dab, _distance_squared(xyz[a], xyz[c]), _distance_squared(xyz[b], xyz[c]))
+
+    tovisit = deque([root])
+    visited = set([root])
+    while tovisit:
+        index = tovisit.popleft()
+        u, v, w = triangles[index]
+        for a, b in ((u, v), (v, w), (w, u)):
+            nbr = halfedge.get((b, a))
+            if nbr is None or nbr in visited:
+                continue
+            tovisit.append(nbr)
+            visited.add(nbr)
+            for c in triangles[nbr]:
+                if c != a and c != b:
+                    break
+            flat[c] = _place(
+                flat[b], flat[a],
+                _distance_squared(xyz[a], xyz[b]),
+                _distance_squared(xyz[b], xyz[c]),
+                _distance_squared(xyz[a], xyz[c]))
+
+    return flat
@@ -0,0 +1,191 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import arange
+from numpy import asarray
+from numpy import bincount
+from numpy import concatenate
+from numpy import cross
+from numpy import cumsum
+from numpy import diff
+from numpy import int64
+from numpy import repeat
+from numpy import unique
+from numpy import vstack
+from numpy import zeros
+
+from digitalfutures.geometry.normals_numpy import _face_sums
+
+
+__all__ = [
+    'volume_polyhedron_numpy',
+    'offset_solid_numpy',
+    'offset_volumes_numpy',
+]
+
+
+def _faces(offsets, indices):
+    offsets = asarray(offsets, dtype=int64)
+    indices = asarray(indices, dtype=int64)
+    f = len(offsets) - 1
+    sizes = diff(offsets)
+    faces = repeat(arange(f), sizes)
+    following = arange(1, len(indices) + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    return offsets, indices, f, sizes, faces, following
+
+
+def _triple(a, b, c):
+    return (a * cross(b, c)).sum(axis=1)
+
+
+def volume_polyhedron_numpy(xyz, offsets, indices):
+    """Compute the volume enclosed by a closed mesh in one pass.
+
+    Parameters
+    ----------
+    xyz : array
+        The vertex coordinates.
+    offsets : array
+        The face offsets, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces.
+
+    Returns
+    -------
+    float
+        The signed volume.
+        The volume is positive if the face normals point outwards.
+
+    Notes
+    -----
+    Every face is split into triangles connecting its edges to its centroid,
+    and the volume is the sum of the signed volumes of the tetrahedra formed by
+    these triangles and a common point.
+
+    """
+    xyz = asarray(xyz, dtype=float).reshape((-1, 3))
+    offsets, indices, f, sizes, faces, following = _faces(offsets, indices)
+    origin = xyz.mean(axis=0)
+    points = xyz[indices] - origin
+    centroids = _face_sums(points, faces, f) / sizes.reshape((-1, 1))
+    return _triple(centroids[faces], points, points[following]).sum() / 6.0
+
+
+def offset_solid_numpy(xyz_e, xyz_i, offsets, indices):
+    """Construct the closed solid between the extrados and intrados of a mesh.
+
+    Parameters
+    ----------
+    xyz_e : array
+        The coordinates of the vertices of the extrados.
+    xyz_i : array
+        The coordinates of the vertices of the intrados.
+    offsets : array
+        The face offsets of the mesh, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces of the mesh.
+
+    Returns
+    -------
+    tuple
+        The vertex coordinates, face offsets and vertex indices of the faces of the solid.
+        The first ``n`` vertices are those of the intrados, the next ``n`` those of the extrados.
+        The faces are the (reversed) faces of the intrados, the faces of the extrados,
+        and one quad per boundary edge of the mesh, all oriented outwards
+        if the extrados is on the side of the face normals of the mesh.
+
+    Notes
+    -----
+    The boundary edges are found as the halfedges of the faces without an opposite halfedge,
+    such that meshes with holes are closed as well.
+
+    """
+    xyz_e = asarray(xyz_e, dtype=float).reshape((-1, 3))
+    xyz_i = asarray(xyz_i, dtype=float).reshape((-1, 3))
+    offsets, indices, f, sizes, faces, following = _faces(offsets, indices)
+    n = len(xyz_e)
+
+    a = indices
+    b = indices[following]
+    boundary = ~_isin(b * n + a, a * n + b)
+    a = a[boundary]
+    b = b[boundary]
+
+    starts = repeat(offsets[:-1], sizes)
+    ends = repeat(offsets[1:], sizes)
+    flipped = indices[starts + ends - 1 - arange(len(indices))]
+
+    sides = vstack([a, b, b + n, a + n]).T.ravel()
+
+    xyz = concatenate([xyz_i, xyz_e])
+    solid_indices = concatenate([flipped, indices + n, sides])
+    solid_sizes = concatenate([sizes, sizes, zeros(len(a), dtype=int64) + 4])
+    solid_offsets = zeros(len(solid_sizes) + 1, dtype=int64)
+    solid_offsets[1:] = cumsum(solid_sizes)
+    return xyz, solid_offsets, solid_indices
+
+
+def _isin(values, test):
+    test = unique(test)
+    positions = test.searchsorted(values)
+    positions[positions == len(test)] = 0
+    return test[positions] == values
+
+
+def offset_volumes_numpy(xyz_e, xyz_i, offsets, indices):
+    """Compute the volume of the solid between the extrados and intrados of a mesh, per face.
+
+    Parameters
+    ----------
+    xyz_e : array
+        The coordinates of the vertices of the extrados.
+    xyz_i : array
+        The coordinates of the vertices of the intrados.
+    offsets : array
+        The face offsets of the mesh, of length ``f + 1``.
+    indices : array
+        The vertex indices of all faces of the mesh.
+
+    Returns
+    -------
+    array
+        The signed volume of the part of the solid of every face.
+        The volumes are positive if the extrados is on the side of the face normals of the mesh.
+
+    Notes
+    -----
+    The part of the solid of a face is the (closed) prism between the face on the intrados
+    and the face on the extrados.
+    Every face of a prism is split into triangles connecting its edges to its centroid.
+    Since the side faces shared by neighbouring prisms are split in the same way,
+    with opposite orientations, the sum of the volumes of all prisms is the volume
+    of the closed solid (see :func:`offset_solid_numpy`).
+
+    """
+    xyz_e = asarray(xyz_e, dtype=float).reshape((-1, 3))
+    xyz_i = asarray(xyz_i, dtype=float).reshape((-1, 3))
+    offsets, indices, f, sizes, faces, following = _faces(offsets, indices)
+
+    p = xyz_i[indices]
+    q = xyz_e[indices]
+    cp = _face_sums(p, faces, f) / sizes.reshape((-1, 1))
+    cq = _face_sums(q, faces, f) / sizes.reshape((-1, 1))
+
+    # the centroid of the intrados face is the common point of the tetrahedra
+    o = cp[faces]
+    p = p - o
+    q = q - o
+    cq = cq[faces] - o
+    p1 = p[following]
+    q1 = q[following]
+    m = 0.25 * (p + p1 + q + q1)
+
+    volumes = _triple(cq, q, q1)
+    volumes += _triple(m, p, p1)
+    volumes += _triple(m, p1, q1)
+    volumes += _triple(m, q1, q)
+    volumes += _triple(m, q, p)
+
+    return bincount(faces, weights=volumes, minlength=f) / 6.0
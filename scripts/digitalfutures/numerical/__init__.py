@@ -0,0 +1,58 @@
+"""
+********************************************************************************
+digitalfutures.numerical
+********************************************************************************
+
+.. currentmodule:: digitalfutures.numerical
+
+
+Force density
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    FDSolver
+    fd_numpy
+    mesh_pillows_numpy
+
+
+Analysis
+========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    DRSolver
+    dr_numpy
+    shell_dr_numpy
+    shell_load_steps_numpy
+
+
+Loads
+=====
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    SelfweightCalculator
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas
+
+if not compas.IPY:
+    from .dr_numpy import *
+    from .fd_numpy import *
+    from .loads_numpy import *
+    from .pillows_numpy import *
+    from .relaxation_numpy import *
+
+
+__all__ = [name for name in dir() if not name.startswith('_')]
@@ -0,0 +1,433 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import array
+from numpy import asarray
+from numpy import errstate
+from numpy import arange
+from numpy import hstack
+from numpy import int64
+from numpy import isfinite
+from numpy import load
+from numpy import savez
+from numpy import setdiff1d
+from numpy import sqrt
+from numpy import zeros
+from scipy.linalg import norm
+from scipy.sparse import coo_matrix
+
+
+__all__ = [
+    'DRSolver',
+    'dr_numpy',
+]
+
+
+class DRSolver(object):
+    """Dynamic relaxation solver for networks of axial-force members, with kinetic damping.
+
+    Parameters
+    ----------
+    edges : list
+        The edges of the network, as pairs of vertex indices.
+    fixed : list
+        The indices of the fixed vertices.
+    number_of_vertices : int
+        The number of vertices.
+    qpre : list, optional
+        Prescribed force densities of the edges.
+    fpre : list, optional
+        Prescribed forces in the edges.
+    lpre : list, optional
+        Prescribed lengths of the edges.
+    linit : list, optional
+        Initial (unstressed) lengths of the edges.
+        If all are zero, the lengths at the start of the first relaxation are used.
+    E : list, optional
+        Stiffness of the edges.
+    radius : list, optional
+        Radius of the edges.
+
+    Attributes
+    ----------
+    xyz : array
+        The current coordinates of the vertices.
+    v : array
+        The current velocities of the vertices.
+    history : list
+        The iteration number, the norm of the residual forces at the free vertices,
+        and the kinetic energy of the system, recorded at every check.
+    iterations : int
+        The number of iterations of the last relaxation.
+
+    Notes
+    -----
+    The internal forces are computed with products of the sparse connectivity matrix
+    and its transpose, for all edges and vertices at once.
+
+    The solver uses kinetic damping [1]_ instead of viscous damping.
+    The system moves undamped until its kinetic energy reaches a peak,
+    at which point the geometry is reset to the (estimated) position of the peak
+    and all velocities are set to zero.
+    The fictitious masses of the vertices are derived from their current axial
+    stiffness, such that every vertex moves with the largest stable time step.
+    The masses are updated every ``stride`` iterations, as the stiffness of the
+    edges changes with the forces.
+
+    The solver keeps its state (geometry, velocities, forces) between calls to
+    :meth:`relax`, such that a subsequent relaxation with modified loads
+    can start from the previous state.
+
+    References
+    ----------
+    .. [1] Barnes M. R., *Form finding and analysis of tension structures by dynamic relaxation*,
+           International Journal of Space Structures 14(2), 1999.
+
+    Examples
+    --------
+    >>> solver = DRSolver(edges, fixed, len(vertices), linit=l0, E=E, radius=radius)
+    >>> xyz, q, f, l, r = solver.relax(vertices, loads, kmax=15000, tol1=0.01)
+    >>> solver.iterations
+    >>> solver.history[-1]
+
+    >>> solver.save_state(FILE_S)
+    >>> solver.load_state(FILE_S)
+    >>> xyz, q, f, l, r = solver.relax(solver.xyz, loads, warmstart=True)
+
+    """
+
+    def __init__(self, edges, fixed, number_of_vertices, qpre=None, fpre=None, lpre=None, linit=None, E=None, radius=None):
+        edges = asarray(edges, dtype=int64).reshape((-1, 2))
+        m = len(edges)
+        n = number_of_vertices
+
+        def column(values):
+            if values is None:
+                return zeros((m, 1), dtype=float)
+            return array(values, dtype=float).reshape((-1, 1))
+
+        self.edges = edges
+        self.fixed = asarray(fixed, dtype=int64).reshape((-1, ))
+        self.free = setdiff1d(arange(n), self.fixed)
+        rows = arange(m).repeat(2)
+        data = array([1.0, -1.0] * m)
+        self.C = coo_matrix((data, (rows, edges.ravel())), shape=(m, n)).tocsr()
+        self.Ct = self.C.transpose().tocsr()
+        self.Ct2 = self.Ct.copy()
+        self.Ct2.data **= 2
+        self.qpre = column(qpre)
+        self.fpre = column(fpre)
+        self.lpre = column(lpre)
+        self.linit = column(linit)
+        self.EA = column(E) * 3.14159 * column(radius) ** 2
+        self.xyz = None
+        self.v = zeros((n, 3), dtype=float)
+        self.f = None
+        self.history = []
+        self.iterations = 0
+
+    def forces(self, xyz):
+        """Compute the force densities, forces and lengths of the edges and the residual forces at the vertices.
+
+        Parameters
+        ----------
+        xyz : array
+            The coordinates of the vertices.
+
+        Returns
+        -------
+        tuple
+            The connection vectors, force densities, forces and lengths of the edges,
+            and the (unloaded) internal forces at the vertices.
+
+        """
+        uvw = self.C.dot(xyz)
+        l = sqrt((uvw ** 2).sum(axis=1)).reshape((-1, 1))
+        if self.f is None:
+            self.f = l.copy()
+        with errstate(divide='ignore', invalid='ignore'):
+            q_fpre = self.fpre / l
+            q_lpre = self.f / self.lpre
+            q_EA = self.EA * (l - self.linit) / (self.linit * l)
+        q_lpre[~isfinite(q_lpre)] = 0
+        q_EA[~isfinite(q_EA)] = 0
+        q = self.qpre + q_fpre + q_lpre + q_EA
+        f = q * l
+        self.f = f
+        return uvw, q, f, l, self.Ct.dot(q * uvw)
+
+    def masses(self, l):
+        """Compute the fictitious masses of the vertices from the axial stiffness of the edges.
+
+        Parameters
+        ----------
+        l : array
+            The lengths of the edges.
+
+        Returns
+        -------
+        array
+            The masses of the vertices.
+
+        """
+        with errstate(divide='ignore', invalid='ignore'):
+            q_fpre = self.fpre / l
+            q_lpre = self.f / self.lpre
+            k_EA = self.EA / self.linit
+        q_lpre[~isfinite(q_lpre)] = 0
+        k_EA[~isfinite(k_EA)] = 0
+        k = self.qpre + q_fpre + q_lpre + k_EA
+        mass = 0.5 * self.Ct2.dot(abs(k))
+        mass[mass == 0] = 1.0
+        return hstack([mass, mass, mass])
+
+    def matches_state(self, data):
+        """Verify that a saved state belongs to the same problem as the solver.
+
+        Parameters
+        ----------
+        data : dict
+            The arrays of a state written by :meth:`save_state`.
+
+        Returns
+        -------
+        bool
+            ``True`` if the state has the same edges, fixed vertices, unstressed lengths
+            and axial stiffness as the solver, and, if the solver has coordinates,
+            the same coordinates of the fixed vertices.
+            ``False`` otherwise.
+
+        """
+        names = ['edges', 'fixed', 'linit', 'EA']
+        for name in names:
+            if name not in data:
+                return False
+            if data[name].shape != getattr(self, name).shape or (data[name] != getattr(self, name)).any():
+                return False
+        if self.xyz is not None:
+            anchors = data['xyz'][self.fixed]
+            if (anchors != self.xyz[self.fixed]).any():
+                return False
+        return True
+
+    def save_state(self, filepath, **data):
+        """Save the state of the solver to a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file (``.npz``).
+
+        Other Parameters
+        ----------------
+        data : dict
+            Additional arrays to store with the state, such as the loads.
+
+        Notes
+        -----
+        The state consists of the coordinates and velocities of the vertices,
+        and the forces in the edges.
+        The edges, fixed vertices, unstressed lengths and axial stiffness of the solver
+        are stored with the state, such that it is only loaded into the same problem.
+
+        """
+        savez(filepath, xyz=self.xyz, v=self.v, f=self.f, edges=self.edges, fixed=self.fixed, linit=self.linit, EA=self.EA, **data)
+
+    def load_state(self, filepath):
+        """Load the state of the solver from a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to a file written by :meth:`save_state`.
+
+        Returns
+        -------
+        dict
+            All arrays stored in the file.
+
+        Raises
+        ------
+        ValueError
+            If the state does not match the solver (see :meth:`matches_state`).
+
+        Notes
+        -----
+        Only the coordinates and velocities of the free vertices are loaded.
+        If the solver has coordinates, the fixed vertices keep their current coordinates.
+
+        """
+        with load(filepath) as npz:
+            data = {name: npz[name] for name in npz.files}
+        if not self.matches_state(data):
+            raise ValueError('The state does not match the edges, supports or materials of the solver: {}'.format(filepath))
+        free = self.free
+        if self.xyz is None:
+            self.xyz = data['xyz'].copy()
+        else:
+            self.xyz = self.xyz.copy()
+            self.xyz[free] = data['xyz'][free]
+        self.v[:] = 0
+        self.v[free] = data['v'][free]
+        self.f = data['f'].copy()
+        return data
+
+    def relax(self, vertices, loads, kmax=10000, tol1=1e-3, tol2=1e-6, stride=10, callback=None, warmstart=False):
+        """Relax the network under the given loads.
+
+        Parameters
+        ----------
+        vertices : list
+            The XYZ coordinates of the vertices at the start of the relaxation.
+        loads : list or callable
+            The XYZ components of the loads on the vertices,
+            or a function that computes them from the coordinates of the vertices.
+            A function is evaluated at the start and at every check,
+            such that the loads can follow the deformation of the network.
+        kmax : int, optional
+            The maximum number of iterations.
+            Default is ``10000``.
+        tol1 : float, optional
+            Convergence criterion for the norm of the residual forces at the free vertices.
+            Default is ``1e-3``.
+        tol2 : float, optional
+            Convergence criterion for the norm of the displacements of the free vertices
+            in one iteration.
+            Default is ``1e-6``.
+        stride : int, optional
+            The number of iterations between convergence checks, updates of the masses and loads,
+            and calls to the callback.
+            Default is ``10``.
+        callback : callable, optional
+            A function that is called at every check, with the iteration number,
+            the coordinates of the vertices, and the values of the two criteria.
+        warmstart : bool, optional
+            Continue from the velocities of the previous relaxation.
+            Default is ``False``.
+
+        Returns
+        -------
+        tuple
+            The coordinates of the vertices, the force densities, forces and lengths
+            of the edges, and the residual forces at the vertices,
+            in the same format as :func:`compas.numerical.dr_numpy`.
+
+        """
+        free = self.free
+        xyz = array(vertices, dtype=float).reshape((-1, 3))
+        update = loads if callable(loads) else None
+        p = asarray(update(xyz) if update else loads, dtype=float).reshape((-1, 3))
+
+        if not warmstart:
+            self.v[:] = 0
+            self.f = None
+
+        uvw, q, f, l, fi = self.forces(xyz)
+
+        if not self.linit.any():
+            self.linit = l.copy()
+            uvw, q, f, l, fi = self.forces(xyz)
+
+        r = p - fi
+        mass = self.masses(l)
+        v = self.v
+        ke0 = (mass[free] * v[free] ** 2).sum()
+        half = not warmstart or ke0 == 0
+
+        self.history = []
+        self.iterations = 0
+
+        crit1 = norm(r[free])
+        crit2 = 0.0
+
+        for k in range(1, kmax + 1):
+            a = r[free] / mass[free]
+            if half:
+                v[free] = 0.5 * a
+                half = False
+            else:
+                v[free] += a
+            dx = v[free]
+            xyz[free] += dx
+
+            ke = (mass[free] * v[free] ** 2).sum()
+            if ke < ke0:
+                # the kinetic energy has passed its peak
+                # estimate the position at the peak and restart from rest
+                xyz[free] -= 1.5 * dx - 0.5 * a
+                v[:] = 0
+                ke = 0.0
+                half = True
+            ke0 = ke
+
+            uvw, q, f, l, fi = self.forces(xyz)
+            r = p - fi
+
+            if k % stride == 0 or k == kmax:
+                if update:
+                    p = asarray(update(xyz), dtype=float).reshape((-1, 3))
+                    r = p - fi
+                crit1 = norm(r[free])
+                crit2 = norm(dx)
+                self.history.append((k, crit1, ke))
+                if callback:
+                    callback(k, xyz, [crit1, crit2])
+                if crit1 < tol1 or crit2 < tol2:
+                    break
+                mass = self.masses(l)
+
+        self.iterations = k if kmax > 0 else 0
+        self.xyz = xyz
+        self.v = v
+        return xyz, q, f, l, r
+
+
+def dr_numpy(vertices, edges, fixed, loads, qpre, fpre, lpre, linit, E, radius, callback=None, **kwargs):
+    """Implementation of the dynamic relaxation method with kinetic damping.
+
+    Parameters
+    ----------
+    vertices : list
+        XYZ coordinates of the vertices.
+    edges : list
+        Connectivity of the vertices.
+    fixed : list
+        Indices of the fixed vertices.
+    loads : list
+        XYZ components of the loads on the vertices.
+    qpre : list
+        Prescribed force densities in the edges.
+    fpre : list
+        Prescribed forces in the edges.
+    lpre : list
+        Prescribed lengths of the edges.
+    linit : list
+        Initial length of the edges.
+    E : list
+        Stiffness of the edges.
+    radius : list
+        Radius of the edges.
+    callback : callable, optional
+        User-defined function that is called at every convergence check.
+
+    Other Parameters
+    ----------------
+    kwargs : dict
+        The settings of the relaxation (``kmax``, ``tol1``, ``tol2``, ``stride``).
+        See :meth:`DRSolver.relax`.
+
+    Returns
+    -------
+    tuple
+        The coordinates of the vertices, the force densities, forces and lengths
+        of the edges, and the residual forces at the vertices.
+
+    Notes
+    -----
+    This is a drop-in replacement for :func:`compas.numerical.dr_numpy`.
+    See :class:`DRSolver` for details.
+
+    """
+    solver = DRSolver(edges, fixed, len(vertices), qpre=qpre, fpre=fpre, lpre=lpre, linit=linit, E=E, radius=radius)
+    return solver.relax(vertices, loads, callback=callback, **kwargs)
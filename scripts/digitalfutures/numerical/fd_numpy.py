@@ -0,0 +1,226 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from hashlib import sha1
+
+from numpy import array
+from numpy import asarray
+from numpy import array_equal
+from numpy import int64
+from numpy import setdiff1d
+from numpy import arange
+from numpy import hstack
+from scipy.sparse import coo_matrix
+from scipy.sparse import diags
+from scipy.sparse.linalg import splu
+
+from compas.numerical import normrow
+
+
+__all__ = [
+    'FDSolver',
+    'fd_numpy',
+]
+
+
+class FDSolver(object):
+    """Force density solver for a fixed topology, with a cached factorisation.
+
+    Parameters
+    ----------
+    edges : list
+        The edges of the network, as pairs of vertex indices.
+    fixed : list
+        The indices of the fixed vertices.
+    number_of_vertices : int, optional
+        The number of vertices.
+        Defaults to the highest vertex index of the edges plus one.
+
+    Notes
+    -----
+    The connectivity matrices are built once, when the solver is created.
+    The stiffness matrix of the free vertices is factorised when the solver is used
+    with a new set of force densities, and the factorisation is reused as long as the
+    force densities don't change.
+    Therefore, repeated solves with different loads or different positions
+    of the fixed vertices only cost a forward and backward substitution.
+
+    Examples
+    --------
+    >>> solver = FDSolver(edges, fixed)
+    >>> xyz, q, f, l, r = solver.solve(vertices, q, loads)
+
+    """
+
+    def __init__(self, edges, fixed, number_of_vertices=None):
+        edges = asarray(edges, dtype=int64).reshape((-1, 2))
+        if number_of_vertices is None:
+            number_of_vertices = int(edges.max()) + 1 if len(edges) else 0
+        m = len(edges)
+        n = number_of_vertices
+        rows = arange(m).repeat(2)
+        data = array([1.0, -1.0] * m)
+        self.edges = edges
+        self.fixed = asarray(fixed, dtype=int64).reshape((-1, ))
+        self.free = setdiff1d(arange(n), self.fixed)
+        self.C = coo_matrix((data, (rows, edges.ravel())), shape=(m, n)).tocsr()
+        self.Ct = self.C.transpose().tocsr()
+        self.Ci = self.C[:, self.free]
+        self.Cf = self.C[:, self.fixed]
+        self.Cit = self.Ci.transpose().tocsr()
+        self._q = None
+        self._lu = None
+        self._Df = None
+
+    @property
+    def number_of_vertices(self):
+        return self.C.shape[1]
+
+    def factorize(self, q):
+        """Factorise the stiffness matrix of the free vertices for a set of force densities.
+
+        Parameters
+        ----------
+        q : list
+            The force densities of the edges.
+
+        Returns
+        -------
+        bool
+            ``True`` if a new factorisation was computed,
+            ``False`` if the cached one could be used.
+
+        """
+        q = asarray(q, dtype=float).reshape((-1, ))
+        if self._lu is not None and array_equal(q, self._q):
+            return False
+        Q = diags([q], [0])
+        CitQ = self.Cit.dot(Q)
+        self._lu = splu(CitQ.dot(self.Ci).tocsc())
+        self._Df = CitQ.dot(self.Cf).tocsr()
+        self._q = q.copy()
+        return True
+
+    def solve(self, vertices, q, loads):
+        """Compute the equilibrium of the network.
+
+        Parameters
+        ----------
+        vertices : list
+            The XYZ coordinates of the vertices.
+            Only the coordinates of the fixed vertices are used.
+        q : list
+            The force densities of the edges.
+        loads : list
+            The XYZ components of the loads on the vertices.
+
+        Returns
+        -------
+        tuple
+            The coordinates of the vertices, the force densities, forces and lengths
+            of the edges, and the residual forces at the vertices,
+            in the same format as :func:`compas.numerical.fd_numpy`.
+
+        """
+        return self.solve_cases([vertices], q, [loads])[0]
+
+    def solve_cases(self, vertices, q, loads):
+        """Compute the equilibrium of the network for multiple cases at once.
+
+        Parameters
+        ----------
+        vertices : list
+            For every case, the XYZ coordinates of the vertices.
+            Only the coordinates of the fixed vertices are used.
+        q : list
+            The force densities of the edges, shared by all cases.
+        loads : list
+            For every case, the XYZ components of the loads on the vertices.
+
+        Returns
+        -------
+        list
+            For every case, the coordinates of the vertices, the force densities,
+            forces and lengths of the edges, and the residual forces at the vertices.
+
+        Notes
+        -----
+        The stiffness matrix is factorised (at most) once,
+        and the right-hand sides of all cases are solved together.
+
+        Examples
+        --------
+        >>> (xyz_e, q, f_e, l_e, r_e), (xyz_i, q, f_i, l_i, r_i) = solver.solve_cases([xyz_e, xyz_i], q, [p_e, p_i])
+
+        """
+        self.factorize(q)
+        q = self._q.reshape((-1, 1))
+        xyz = [array(case, dtype=float).reshape((-1, 3)) for case in vertices]
+        p = [asarray(case, dtype=float).reshape((-1, 3)) for case in loads]
+        b = hstack([p_[self.free] - self._Df.dot(xyz_[self.fixed]) for xyz_, p_ in zip(xyz, p)])
+        x = self._lu.solve(b)
+        results = []
+        for i, (xyz_, p_) in enumerate(zip(xyz, p)):
+            xyz_[self.free] = x[:, 3 * i:3 * i + 3]
+            uvw = self.C.dot(xyz_)
+            l = normrow(uvw)
+            f = q * l
+            r = p_ - self.Ct.dot(q * uvw)
+            results.append((xyz_, q, f, l, r))
+        return results
+
+
+_SOLVERS = {}
+
+
+def _solver(edges, fixed, number_of_vertices):
+    edges = asarray(edges, dtype=int64).reshape((-1, 2))
+    fixed = asarray(fixed, dtype=int64).reshape((-1, ))
+    key = sha1(edges.tobytes() + b'|' + fixed.tobytes()).hexdigest(), number_of_vertices
+    solver = _SOLVERS.get(key)
+    if solver is None or not array_equal(solver.edges, edges) or not array_equal(solver.fixed, fixed):
+        if len(_SOLVERS) > 16:
+            _SOLVERS.clear()
+        solver = _SOLVERS[key] = FDSolver(edges, fixed, number_of_vertices)
+    return solver
+
+
+def fd_numpy(vertices, edges, fixed, q, loads):
+    """Implementation of the force density method, with caching of the solver.
+
+    Parameters
+    ----------
+    vertices : list
+        XYZ coordinates of the vertices.
+    edges : list
+        Connectivity of the vertices.
+    fixed : list
+        Indices of the fixed vertices.
+    q : list
+        Force densities of the edges.
+    loads : list
+        XYZ components of the loads on the vertices.
+
+    Returns
+    -------
+    tuple
+        The coordinates of the vertices, the force densities, forces and lengths
+        of the edges, and the residual forces at the vertices.
+
+    Notes
+    -----
+    This is a drop-in replacement for :func:`compas.numerical.fd_numpy`.
+    The solvers of recently used topologies (edges and fixed vertices) are kept,
+    such that subsequent calls for the same topology only pay for the parts
+    of the computation that actually changed (see :class:`FDSolver`).
+    This pays off especially when the function is called repeatedly through
+    an RPC server, which stays alive between calls.
+
+    Examples
+    --------
+    >>> xyz, q, f, l, r = fd_numpy(vertices, edges, fixed, q, loads)
+
+    """
+    solver = _solver(edges, fixed, len(vertices))
+    return solver.solve(vertices, q, loads)
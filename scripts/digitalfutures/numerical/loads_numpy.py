@@ -0,0 +1,109 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import array
+from numpy import zeros
+
+from digitalfutures.geometry import vertex_areas_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_face_indices_numpy
+
+
+__all__ = [
+    'SelfweightCalculator',
+]
+
+
+class SelfweightCalculator(object):
+    """Calculator of the self-weight of the vertices of a mesh, for any geometry of the mesh.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The mesh.
+    density : float, optional
+        The density of the material.
+        Default is ``1.0``.
+    thickness_attr_name : str, optional
+        The name of the vertex attribute with the thickness of the material at the vertex.
+        Default is ``'t'``.
+
+    Attributes
+    ----------
+    thickness : array
+        The thickness at the vertices, in the order of ``mesh.vertices()``.
+        The thickness can be modified without recreating the calculator.
+
+    Notes
+    -----
+    This is a drop-in replacement for :class:`compas_fofin.loads.SelfweightCalculator`.
+    The face index arrays of the mesh are collected once, at construction,
+    after which the tributary areas of all vertices are computed in a single vectorised pass
+    (see :func:`digitalfutures.geometry.vertex_areas_numpy`) for every new geometry.
+    This makes it cheap enough to update the self-weight during a relaxation,
+    as the net deforms (see :meth:`loads`).
+
+    Examples
+    --------
+    >>> calculate_sw = SelfweightCalculator(shell, density=22, thickness_attr_name='t')
+    >>> sw = calculate_sw(xyz)
+    >>> p[:, 2] = - 1.0 * sw[:, 0]
+
+    >>> shell_dr_numpy(shell, loads=calculate_sw.loads(p), kmax=15000, tol1=0.01)
+
+    """
+
+    def __init__(self, mesh, density=1.0, thickness_attr_name='t'):
+        self.offsets, self.indices = mesh_face_indices_numpy(mesh)
+        self.density = density
+        self.thickness = array(mesh.get_vertices_attribute(thickness_attr_name), dtype=float)
+
+    def __call__(self, xyz):
+        """Compute the self-weight of the vertices.
+
+        Parameters
+        ----------
+        xyz : array
+            The coordinates of the vertices, in the order of ``mesh.vertices()``.
+
+        Returns
+        -------
+        array
+            The self-weight of the vertices, as a column vector.
+
+        """
+        areas = vertex_areas_numpy(xyz, self.offsets, self.indices)
+        return (areas * self.thickness * self.density).reshape((-1, 1))
+
+    def loads(self, loads=None):
+        """Construct a function that computes the loads on the vertices, including the self-weight, for any geometry.
+
+        Parameters
+        ----------
+        loads : array, optional
+            Additional loads on the vertices.
+            Default is ``None``.
+
+        Returns
+        -------
+        callable
+            A function that takes the coordinates of the vertices
+            and returns the loads, with the self-weight acting in the negative Z direction.
+
+        Notes
+        -----
+        The self-weight is not added to the Z component of the additional loads,
+        but replaces it, as in the loading scripts.
+        The resulting function can be passed as the loads of :meth:`digitalfutures.numerical.DRSolver.relax`,
+        which re-evaluates it at every check of the relaxation.
+
+        """
+        n = len(self.thickness)
+        p = zeros((n, 3), dtype=float) if loads is None else array(loads, dtype=float).reshape((-1, 3))
+
+        def update(xyz):
+            q = p.copy()
+            q[:, 2] = - self(xyz)[:, 0]
+            return q
+
+        return update
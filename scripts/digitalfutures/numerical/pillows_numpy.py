@@ -0,0 +1,61 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from digitalfutures.geometry import vertex_normals_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_xyz_numpy
+from digitalfutures.datastructures.arrays_numpy import mesh_face_indices_numpy
+from digitalfutures.numerical.fd_numpy import FDSolver
+
+
+__all__ = [
+    'mesh_pillows_numpy',
+]
+
+
+def mesh_pillows_numpy(mesh, offsets, loads):
+    """Form find pillows on any number of offsets of a mesh, in one solve.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        A mesh with force densities in the edge attribute ``'q'``
+        and the anchors of the pillows identified by the vertex attribute ``'is_anchor'``.
+    offsets : list
+        For every pillow layer, the offset distance of the layer along the vertex normals.
+    loads : list
+        For every pillow layer, the magnitude of the load on the vertices along the vertex normals.
+
+    Returns
+    -------
+    list
+        For every pillow layer, the coordinates of the vertices, in the order of ``mesh.vertices()``.
+
+    Notes
+    -----
+    All layers share the topology and force densities of the mesh.
+    Therefore, the stiffness matrix of the layers is factorised only once,
+    and the equilibrium of all layers is computed in a single solve with
+    multiple right-hand sides.
+
+    Examples
+    --------
+    >>> xyz_e, xyz_i = mesh_pillows_numpy(mesh, [+0.02, -0.02], [+0.01, -0.01])
+
+    """
+    key_index = mesh.key_index()
+    xyz = mesh_xyz_numpy(mesh)
+    offsets_, indices = mesh_face_indices_numpy(mesh)
+    normals = vertex_normals_numpy(xyz, offsets_, indices)
+
+    edges = [(key_index[u], key_index[v]) for u, v in mesh.edges()]
+    fixed = [key_index[key] for key in mesh.vertices_where({'is_anchor': True})]
+    q = mesh.get_edges_attribute('q')
+
+    solver = FDSolver(edges, fixed, len(xyz))
+    results = solver.solve_cases(
+        [xyz + distance * normals for distance in offsets],
+        q,
+        [load * normals for load in loads])
+
+    return [result[0] for result in results]
@@ -0,0 +1,217 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import glob
+import hashlib
+
+from math import ceil
+
+from numpy import array
+from numpy import float64
+from numpy import load
+from numpy.linalg import norm
+
+from digitalfutures.numerical.dr_numpy import DRSolver
+
+
+__all__ = [
+    'shell_dr_numpy',
+    'shell_load_steps_numpy',
+]
+
+
+def _shell_solver(shell):
+    key_index = shell.key_index()
+    fixed = [key_index[key] for key in shell.vertices_where({'is_anchor': True})]
+    edges = [(key_index[u], key_index[v]) for u, v in shell.edges_where({'is_edge': True})]
+    qpre = array([0.0] * len(edges), dtype=float64).reshape((-1, 1))
+    fpre = array([0.0] * len(edges), dtype=float64).reshape((-1, 1))
+    lpre = array([0.0] * len(edges), dtype=float64).reshape((-1, 1))
+    l0 = array([attr['l0'] for u, v, attr in shell.edges_where({'is_edge': True}, True)], dtype=float64).reshape((-1, 1))
+    E = array([attr['E'] * 1e+6 for u, v, attr in shell.edges_where({'is_edge': True}, True)], dtype=float64).reshape((-1, 1))
+    radius = array([attr['r'] for u, v, attr in shell.edges_where({'is_edge': True}, True)], dtype=float64).reshape((-1, 1))
+    return DRSolver(edges, fixed, len(key_index), qpre=qpre, fpre=fpre, lpre=lpre, linit=l0, E=E, radius=radius)
+
+
+def _shell_update(shell, xyz, f, l, r):
+    key_index = shell.key_index()
+
+    for key, attr in shell.vertices(True):
+        index = key_index[key]
+        attr['x'] = xyz[index, 0]
+        attr['y'] = xyz[index, 1]
+        attr['z'] = xyz[index, 2]
+        attr['rx'] = r[index, 0]
+        attr['ry'] = r[index, 1]
+        attr['rz'] = r[index, 2]
+
+    for index, (u, v, attr) in enumerate(shell.edges_where({'is_edge': True}, True)):
+        attr['f'] = f[index, 0]
+        attr['l'] = l[index, 0]
+
+    if hasattr(shell, 'invalidate_geometry'):
+        shell.invalidate_geometry()
+
+
+def _step(update, p0, t):
+    def loads(xyz):
+        return p0 + t * (update(xyz) - p0)
+    return loads
+
+
+def _nearest_state(states, solver, loads):
+    nearest = None, None
+    for filepath in glob.glob(os.path.join(states, '*.npz')):
+        with load(filepath) as npz:
+            data = {name: npz[name] for name in npz.files}
+        if not solver.matches_state(data):
+            continue
+        distance = norm(loads - data['loads'])
+        if nearest[0] is None or distance < nearest[1]:
+            nearest = filepath, distance
+    return nearest
+
+
+def shell_dr_numpy(shell, loads=None, **kwargs):
+    """Compute the equilibrium of the materialised cables of a shell with dynamic relaxation.
+
+    Parameters
+    ----------
+    shell : Shell
+        A materialised shell (see :func:`digitalfutures.datastructures.shell_materialise_numpy`).
+    loads : array or callable, optional
+        The loads on the vertices, in the order of ``shell.vertices()``,
+        or a function that computes them from the coordinates of the vertices
+        (see :meth:`DRSolver.relax`).
+        Defaults to the loads stored in the vertex attributes ``'px'``, ``'py'``, ``'pz'``.
+
+    Other Parameters
+    ----------------
+    kwargs : dict
+        Settings of the solver, such as ``kmax``, ``tol1`` and ``stride`` (see :meth:`DRSolver.relax`).
+
+    Returns
+    -------
+    tuple
+        The number of iterations, and the history of the residual forces and kinetic energy
+        recorded at every check (see :attr:`DRSolver.history`).
+
+    Notes
+    -----
+    Only the edges with ``'is_edge'`` set to ``True`` are included.
+    The vertices with ``'is_anchor'`` set to ``True`` are fixed.
+    The coordinates and residual forces of the vertices are updated, as well as
+    the forces and lengths of the edges.
+
+    Examples
+    --------
+    >>> shell = Shell.from_json(FILE_I)
+    >>> shell_materialise_numpy(shell, E=210, r=2)
+    >>> iterations, history = shell_dr_numpy(shell, kmax=1000)
+
+    """
+    xyz = array(shell.get_vertices_attributes('xyz'), dtype=float64)
+    if loads is None:
+        loads = shell.get_vertices_attributes(('px', 'py', 'pz'))
+    p = loads if callable(loads) else array(loads, dtype=float64).reshape((-1, 3))
+
+    solver = _shell_solver(shell)
+    xyz, q, f, l, r = solver.relax(xyz, p, **kwargs)
+    _shell_update(shell, xyz, f, l, r)
+
+    return solver.iterations, solver.history
+
+
+def shell_load_steps_numpy(shell, loads, steps=5, states=None, **kwargs):
+    """Compute the equilibrium of the materialised cables of a shell under loads applied in increments.
+
+    Parameters
+    ----------
+    shell : Shell
+        A materialised shell, in equilibrium under the loads stored in the vertex
+        attributes ``'px'``, ``'py'``, ``'pz'`` (for example, the unloaded state).
+    loads : array or callable
+        The final loads on the vertices, in the order of ``shell.vertices()``,
+        or a function that computes them from the coordinates of the vertices
+        (see :meth:`DRSolver.relax`).
+    steps : int, optional
+        The number of load increments between the stored loads and the final loads.
+        Default is ``5``.
+    states : str, optional
+        Path to a folder for the intermediate equilibrium states.
+        If provided, every step is saved to this folder,
+        and the analysis starts from the saved state with the loads nearest to the final loads.
+
+    Other Parameters
+    ----------------
+    kwargs : dict
+        Settings of the solver, such as ``kmax``, ``tol1`` and ``stride`` (see :meth:`DRSolver.relax`).
+        These apply to every step.
+
+    Returns
+    -------
+    list
+        For every step, the fraction of the load increment applied so far,
+        the number of iterations, and the history of the residual forces and kinetic energy.
+
+    Notes
+    -----
+    Every step starts from the geometry, velocities and forces of the equilibrium of the previous step.
+    When the analysis starts from a saved state, the number of steps is reduced
+    in proportion to the remaining difference between the loads of the state and the final loads.
+    Saved states are only used if they have the same edges, anchors, unstressed lengths and materials as the shell,
+    and the same coordinates of the anchors (see :meth:`DRSolver.matches_state`).
+    The saved states only provide the coordinates and velocities of the free vertices.
+    If the loads are a function, the loads of every step are interpolated between the stored loads
+    and the result of the function for the current geometry,
+    and saved states are compared with the result of the function for the initial geometry.
+
+    Examples
+    --------
+    >>> shell = Shell.from_json(FILE_I)
+    >>> steps = shell_load_steps_numpy(shell, p, steps=5, states=STATES, kmax=15000, tol1=0.01)
+    >>> for t, iterations, history in steps:
+    ...     print(t, iterations, history[-1][1])
+
+    """
+    solver = _shell_solver(shell)
+    solver.xyz = array(shell.get_vertices_attributes('xyz'), dtype=float64)
+    warm = False
+
+    update = loads if callable(loads) else None
+    p = array(update(solver.xyz) if update else loads, dtype=float64).reshape((-1, 3))
+    p0 = array(shell.get_vertices_attributes(('px', 'py', 'pz')), dtype=float64)
+    total = norm(p - p0)
+
+    if states:
+        if not os.path.exists(states):
+            os.makedirs(states)
+        filepath, distance = _nearest_state(states, solver, p)
+        if filepath and distance < total:
+            p0 = solver.load_state(filepath)['loads']
+            steps = int(ceil(steps * distance / total))
+            warm = True
+
+    steps = max(steps, 1)
+    results = []
+
+    for i in range(1, steps + 1):
+        t = i / steps
+        if update:
+            pi = _step(update, p0, t)
+        else:
+            pi = p0 + t * (p - p0)
+        xyz, q, f, l, r = solver.relax(solver.xyz, pi, warmstart=warm, **kwargs)
+        warm = True
+        results.append((t, solver.iterations, solver.history))
+        if states:
+            if update:
+                pi = pi(xyz)
+            name = hashlib.sha1(pi.tobytes()).hexdigest()
+            solver.save_state(os.path.join(states, '{}.npz'.format(name)), loads=pi)
+
+    _shell_update(shell, xyz, f, l, r)
+
+    return results
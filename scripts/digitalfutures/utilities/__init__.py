@@ -0,0 +1,94 @@
+"""
+********************************************************************************
+digitalfutures.utilities
+********************************************************************************
+
+.. currentmodule:: digitalfutures.utilities
+
+
+Pipelines
+=========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Stage
+    Pipeline
+    file_hash
+    package_sources
+
+
+Benchmarks
+==========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Benchmark
+    benchmark
+    benchmark_compare
+
+
+Profiling
+=========
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    Profiler
+    profile_stage
+    profile_section
+
+
+Packed arrays
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    PackedProxy
+    pack_array
+    unpack_array
+    pack_arrays
+    unpack_arrays
+    is_packed
+    pack_array_numpy
+    unpack_array_numpy
+    call_packed_numpy
+
+
+Spreadsheets
+============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    SpreadsheetWriter
+    spreadsheet_filepaths
+    cumulative_lengths_numpy
+
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas
+
+from .pipeline import *
+from .benchmarks import *
+from .profiling import *
+from .packing import *
+from .proxy import *
+from .spreadsheets import *
+
+if not compas.IPY:
+    from .packing_numpy import *
+    from .marking_numpy import *
+
+
+__all__ = [name for name in dir() if not name.startswith('_')]
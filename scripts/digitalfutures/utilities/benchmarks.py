@@ -0,0 +1,229 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import gc
+import json
+import platform
+
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+__all__ = [
+    'Benchmark',
+    'benchmark',
+    'benchmark_compare',
+]
+
+
+def benchmark(func, setup=None, repeat=3, memory=True):
+    """Measure the time and peak memory of a function.
+
+    Parameters
+    ----------
+    func : callable
+        The function.
+    setup : callable, optional
+        A function returning the arguments of ``func``, as a tuple.
+        It is called before every run, and is not included in the measurements,
+        such that ``func`` can modify its arguments.
+    repeat : int, optional
+        The number of timed runs.
+        Default is ``3``.
+    memory : bool, optional
+        Measure the peak memory in an additional run.
+        Default is ``True``.
+
+    Returns
+    -------
+    dict
+        The fastest (``'best'``) and median (``'median'``) time of the runs, in seconds,
+        and the peak memory allocated during a run (``'peak'``), in bytes,
+        or ``None`` if the memory was not measured.
+
+    Notes
+    -----
+    The memory is measured with :mod:`tracemalloc`, which includes the arrays of numpy,
+    but slows down the run considerably. Therefore, it is measured in a separate run.
+    On IronPython, and on Python 2, the memory is not measured.
+
+    Examples
+    --------
+    >>> result = benchmark(mesh_offsets_numpy, lambda: (shell, 0.04))
+    >>> result['best']
+
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        gc.collect()
+        t0 = default_timer()
+        func(*args)
+        times.append(default_timer() - t0)
+    times.sort()
+
+    peak = None
+    if memory and tracemalloc:
+        args = setup() if setup else ()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {'best': times[0], 'median': times[len(times) // 2], 'peak': peak}
+
+
+def benchmark_compare(results, baseline, threshold=0.25, resolution=0.001):
+    """Compare the results of benchmarks with the results of a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        The results, as produced by :meth:`Benchmark.run`.
+    baseline : dict
+        The results of the baseline.
+    threshold : float, optional
+        The relative increase of the time or memory of a case
+        above which it counts as a regression.
+        Default is ``0.25``.
+    resolution : float, optional
+        The increase of the time of a case, in seconds,
+        below which it does not count as a regression, regardless of the threshold,
+        to ignore noise in the timings of very fast cases.
+        Default is ``0.001``.
+
+    Returns
+    -------
+    list of dict
+        For every case in both the results and the baseline, its name,
+        the ratios of the best time (``'time'``) and peak memory (``'peak'``) to those of the baseline,
+        and whether one of them exceeds the threshold (``'regression'``).
+        The ratio of the memory is ``None`` if it was not measured in both.
+
+    Notes
+    -----
+    The times are only comparable if the results and the baseline were produced on the same machine.
+
+    """
+    comparison = []
+    for name in results['cases']:
+        if name not in baseline['cases']:
+            continue
+        new = results['cases'][name]
+        old = baseline['cases'][name]
+        time = new['best'] / old['best'] if old['best'] else None
+        peak = new['peak'] / old['peak'] if new['peak'] is not None and old['peak'] else None
+        regression = peak is not None and peak > 1 + threshold
+        if time is not None and time > 1 + threshold and new['best'] - old['best'] > resolution:
+            regression = True
+        comparison.append({'name': name, 'time': time, 'peak': peak, 'regression': regression})
+    return comparison
+
+
+class Benchmark(object):
+    """A collection of benchmark cases.
+
+    Parameters
+    ----------
+    repeat : int, optional
+        The number of timed runs of every case.
+        Default is ``3``.
+    memory : bool, optional
+        Measure the peak memory of every case.
+        Default is ``True``.
+
+    Notes
+    -----
+    The name of a case should be unique.
+    Additional information about a case, such as the size of its input,
+    can be attached as tags, which are stored with its results.
+
+    Examples
+    --------
+    >>> bench = Benchmark(repeat=5)
+    >>> bench.add('data/offsets', mesh_offsets_numpy, lambda: (shell, 0.04), vertices=shell.number_of_vertices())
+    >>> results = bench.run()
+    >>> bench.to_json(results, FILE_O)
+
+    """
+
+    def __init__(self, repeat=3, memory=True):
+        self.repeat = repeat
+        self.memory = memory
+        self.cases = []
+
+    def add(self, name, func, setup=None, **tags):
+        """Add a case.
+
+        Parameters
+        ----------
+        name : str
+            The name of the case.
+        func : callable
+            The function that is measured.
+        setup : callable, optional
+            A function returning the arguments of ``func`` (see :func:`benchmark`).
+
+        Other Parameters
+        ----------------
+        tags : dict
+            Additional information about the case.
+            Callable values are called when the case is run,
+            such that the information does not have to be available in advance.
+
+        """
+        self.cases.append((name, func, setup, tags))
+
+    def run(self, names=None, verbose=True):
+        """Run the cases.
+
+        Parameters
+        ----------
+        names : list of str, optional
+            Only run the cases of which the name contains one of these strings.
+        verbose : bool, optional
+            Print the results of every case.
+            Default is ``True``.
+
+        Returns
+        -------
+        dict
+            Information about the machine (``'machine'``),
+            and the results of every case, with its tags, by name (``'cases'``).
+
+        """
+        cases = {}
+        for name, func, setup, tags in self.cases:
+            if names and not any(part in name for part in names):
+                continue
+            result = benchmark(func, setup, repeat=self.repeat, memory=self.memory)
+            result.update({tag: value() if callable(value) else value for tag, value in tags.items()})
+            cases[name] = result
+            if verbose:
+                peak = '-' if result['peak'] is None else '{:.1f} MB'.format(result['peak'] / 1e6)
+                print("{}: {:.4f}s (median {:.4f}s) {}".format(name, result['best'], result['median'], peak))
+        machine = {
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'python': platform.python_version()}
+        return {'machine': machine, 'repeat': self.repeat, 'cases': cases}
+
+    @staticmethod
+    def to_json(results, filepath):
+        """Write results to a JSON file."""
+        with open(filepath, 'w') as f:
+            json.dump(results, f, sort_keys=True, indent=4)
+
+    @staticmethod
+    def from_json(filepath):
+        """Read results from a JSON file."""
+        with open(filepath, 'r') as f:
+            return json.load(f)
@@ -0,0 +1,67 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from numpy import array
+from numpy import concatenate
+from numpy import cumsum
+from numpy import int64
+from numpy import repeat
+from numpy import round as round_
+from numpy import zeros
+
+
+__all__ = [
+    'cumulative_lengths_numpy',
+]
+
+
+def cumulative_lengths_numpy(lengths, scale=1.0, decimals=None, rounded=False):
+    """Compute the cumulative lengths along any number of cables in one pass.
+
+    Parameters
+    ----------
+    lengths : list
+        For every cable, the lengths of its segments.
+        The cables can have different numbers of segments.
+    scale : float, optional
+        A scale factor for the lengths, for example ``1e3`` to convert meters to millimeters.
+        Default is ``1.0``.
+    decimals : int, optional
+        Round the cumulative lengths to this number of decimals.
+        Default is ``None``.
+    rounded : bool, optional
+        Round the (scaled) lengths of the segments before adding them up,
+        such that the cumulative lengths are sums of rounded segment lengths.
+        Default is ``False``.
+
+    Returns
+    -------
+    list
+        For every cable, the cumulative lengths at the ends of its segments.
+
+    Notes
+    -----
+    The lengths of all cables are concatenated, added up with a single cumulative sum,
+    and split into cables again by subtracting the sum at the start of every cable.
+
+    Examples
+    --------
+    >>> cumulative_lengths_numpy([[0.1, 0.2], [0.3]], scale=1e3, decimals=1)
+    [[100.0, 300.0], [300.0]]
+
+    """
+    counts = array([len(values) for values in lengths], dtype=int64)
+    if not counts.sum():
+        return [[] for values in lengths]
+    values = concatenate([array(values, dtype=float) for values in lengths if len(values)]) * scale
+    if rounded and decimals is not None:
+        values = round_(values, decimals)
+    totals = zeros(len(values) + 1, dtype=float)
+    totals[1:] = cumsum(values)
+    ends = cumsum(counts)
+    totals = totals[1:] - repeat(totals[ends - counts], counts)
+    if decimals is not None:
+        totals = round_(totals, decimals)
+    rows = totals.tolist()
+    return [rows[end - count:end] for count, end in zip(counts.tolist(), ends.tolist())]
@@ -0,0 +1,196 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import sys
+import base64
+
+from array import array
+
+try:
+    NUMBERS = (int, long, float)
+except NameError:
+    NUMBERS = (int, float)
+
+
+__all__ = [
+    'pack_array',
+    'unpack_array',
+    'is_packed',
+    'pack_arrays',
+    'unpack_arrays',
+]
+
+
+TYPECODES = {'<f8': 'd', '<i4': 'i'}
+
+
+def _shape(data):
+    shape = []
+    while isinstance(data, (list, tuple)):
+        shape.append(len(data))
+        if not data:
+            break
+        data = data[0]
+    return shape
+
+
+def _flatten(data, depth):
+    for _ in range(depth - 1):
+        data = [item for items in data for item in items]
+    return data
+
+
+def _tobytes(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    try:
+        return values.tobytes()
+    except AttributeError:
+        return values.tostring()
+
+
+def _frombytes(values, data):
+    try:
+        values.frombytes(data)
+    except AttributeError:
+        values.fromstring(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+
+def is_packed(data):
+    """Verify that an object is a packed array.
+
+    Parameters
+    ----------
+    data : object
+        The object.
+
+    Returns
+    -------
+    bool
+        ``True`` if the object is a packed array.
+        ``False`` otherwise.
+
+    """
+    return isinstance(data, dict) and '__packed__' in data
+
+
+def pack_array(data):
+    """Pack a (nested) list of numbers into a compact, JSON serialisable form.
+
+    Parameters
+    ----------
+    data : list
+        A list of numbers, or a (nested) list of lists of numbers of equal length.
+
+    Returns
+    -------
+    dict or None
+        A dict with the data type, the shape, and the values as a base64 encoded
+        string of little-endian binary numbers.
+        Integers are stored as 32-bit integers, all other numbers as 64-bit floats.
+        ``None`` if the data cannot be packed.
+
+    Examples
+    --------
+    >>> packed = pack_array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    >>> packed['shape']
+    [2, 3]
+    >>> unpack_array(packed)
+    [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+
+    """
+    shape = _shape(data)
+    if not shape:
+        return None
+    try:
+        values = _flatten(data, len(shape))
+    except TypeError:
+        return None
+    size = 1
+    for dim in shape:
+        size *= dim
+    if not size or len(values) != size:
+        return None
+    if not all(isinstance(value, NUMBERS) and not isinstance(value, bool) for value in values):
+        return None
+    if all(isinstance(value, NUMBERS[:-1]) and -2147483648 <= value <= 2147483647 for value in values):
+        dtype = '<i4'
+    else:
+        dtype = '<f8'
+    values = array(TYPECODES[dtype], values)
+    return {
+        '__packed__': dtype,
+        'shape': shape,
+        'data': base64.b64encode(_tobytes(values)).decode('ascii')}
+
+
+def unpack_array(packed):
+    """Unpack a packed array into a (nested) list of numbers.
+
+    Parameters
+    ----------
+    packed : dict
+        A packed array.
+
+    Returns
+    -------
+    list
+        The (nested) list of numbers.
+
+    """
+    values = array(TYPECODES[packed['__packed__']])
+    _frombytes(values, base64.b64decode(packed['data']))
+    data = values.tolist()
+    for dim in reversed(packed['shape'][1:]):
+        data = [data[i:i + dim] for i in range(0, len(data), dim)]
+    return data
+
+
+def pack_arrays(data):
+    """Pack all lists of numbers in a (nested) structure of lists, tuples and dicts.
+
+    Parameters
+    ----------
+    data : object
+        The data.
+
+    Returns
+    -------
+    object
+        The data with all lists of numbers replaced by packed arrays.
+
+    """
+    if isinstance(data, (list, tuple)):
+        packed = pack_array(data)
+        if packed is not None:
+            return packed
+        return [pack_arrays(item) for item in data]
+    if isinstance(data, dict):
+        return {key: pack_arrays(value) for key, value in data.items()}
+    return data
+
+
+def unpack_arrays(data):
+    """Unpack all packed arrays in a (nested) structure of lists, tuples and dicts.
+
+    Parameters
+    ----------
+    data : object
+        The data.
+
+    Returns
+    -------
+    object
+        The data with all packed arrays replaced by (nested) lists.
+
+    """
+    if is_packed(data):
+        return unpack_array(data)
+    if isinstance(data, (list, tuple)):
+        return [unpack_arrays(item) for item in data]
+    if isinstance(data, dict):
+        return {key: unpack_arrays(value) for key, value in data.items()}
+    return data
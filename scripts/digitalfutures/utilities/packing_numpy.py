@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import base64
+import importlib
+
+from numpy import ndarray
+from numpy import generic
+from numpy import asarray
+from numpy import frombuffer
+
+from digitalfutures.utilities.packing import is_packed
+
+
+__all__ = [
+    'pack_array_numpy',
+    'unpack_array_numpy',
+    'call_packed_numpy',
+]
+
+
+def pack_array_numpy(data):
+    """Pack an array into a compact, JSON serialisable form.
+
+    Parameters
+    ----------
+    data : array
+        An array of numbers.
+
+    Returns
+    -------
+    dict
+        The packed array (see :func:`digitalfutures.utilities.pack_array`).
+
+    """
+    data = asarray(data)
+    dtype = '<i4' if data.dtype.kind in 'iub' else '<f8'
+    return {
+        '__packed__': dtype,
+        'shape': list(data.shape),
+        'data': base64.b64encode(data.astype(dtype).tobytes()).decode('ascii')}
+
+
+def unpack_array_numpy(packed):
+    """Unpack a packed array into an array.
+
+    Parameters
+    ----------
+    packed : dict
+        A packed array.
+
+    Returns
+    -------
+    array
+        The array.
+
+    """
+    data = frombuffer(base64.b64decode(packed['data']), dtype=packed['__packed__'])
+    return data.reshape(packed['shape'])
+
+
+def _unpack(data):
+    if is_packed(data):
+        return unpack_array_numpy(data)
+    if isinstance(data, (list, tuple)):
+        return [_unpack(item) for item in data]
+    if isinstance(data, dict):
+        return {key: _unpack(value) for key, value in data.items()}
+    return data
+
+
+def _pack(data):
+    if isinstance(data, ndarray):
+        return pack_array_numpy(data)
+    if isinstance(data, generic):
+        return data.item()
+    if isinstance(data, (list, tuple)):
+        return [_pack(item) for item in data]
+    if isinstance(data, dict):
+        return {key: _pack(value) for key, value in data.items()}
+    return data
+
+
+def call_packed_numpy(name, args=None, kwargs=None):
+    """Call a function with packed arrays as arguments and pack the arrays it returns.
+
+    Parameters
+    ----------
+    name : str
+        The full name of the function, including the module.
+        For example, ``'digitalfutures.numerical.fd_numpy'``.
+    args : list, optional
+        The positional arguments of the function.
+    kwargs : dict, optional
+        The named arguments of the function.
+
+    Returns
+    -------
+    object
+        The result of the function, with all arrays packed.
+
+    Notes
+    -----
+    This is the server side of :class:`digitalfutures.utilities.PackedProxy`.
+    Packed arrays in the arguments are passed to the function as (read-only) arrays.
+
+    """
+    modulename, functionname = name.rsplit('.', 1)
+    module = importlib.import_module(modulename)
+    function = getattr(module, functionname)
+    return _pack(function(*_unpack(args or []), **_unpack(kwargs or {})))
@@ -0,0 +1,320 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+
+from .profiling import profile_stage
+
+
+__all__ = [
+    'Stage',
+    'Pipeline',
+    'file_hash',
+    'package_sources',
+    'script_constant',
+]
+
+
+def file_hash(filepath, blocksize=1 << 20):
+    """Compute the SHA-1 hash of the contents of a file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the file.
+    blocksize : int, optional
+        The number of bytes read at a time.
+
+    Returns
+    -------
+    str
+        The hexadecimal digest of the contents of the file.
+
+    """
+    sha = hashlib.sha1()
+    with open(filepath, 'rb') as f:
+        while True:
+            block = f.read(blocksize)
+            if not block:
+                break
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def package_sources(package):
+    """Collect the source files of all modules of a package.
+
+    Parameters
+    ----------
+    package : module
+        The package, for example ``digitalfutures``.
+
+    Returns
+    -------
+    list of str
+        The paths to the Python files of the package and its subpackages, sorted.
+
+    Notes
+    -----
+    The source files of a package can be used as the sources of all stages of a pipeline,
+    such that any change to the code of the package invalidates the cached results,
+    without maintaining lists of the modules that every stage depends on.
+
+    Examples
+    --------
+    >>> import digitalfutures
+    >>> Stage('unload', unload, [FILE_M], [FILE_U], sources=package_sources(digitalfutures))
+
+    """
+    root = os.path.dirname(os.path.abspath(package.__file__))
+    sources = []
+    for folder, folders, files in os.walk(root):
+        folders[:] = [name for name in folders if not name.startswith(('.', '__'))]
+        sources += [os.path.join(folder, name) for name in files if name.endswith('.py')]
+    return sorted(sources)
+
+
+def script_constant(filepath, name):
+    """Read the value of a constant of a script, without running the script.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the script.
+    name : str
+        The name of the constant.
+
+    Returns
+    -------
+    object
+        The value of the constant.
+
+    Raises
+    ------
+    KeyError
+        If the script does not assign a literal value to the name at the top level.
+
+    Notes
+    -----
+    This is useful to declare the outputs of a stage that runs a script
+    with the names the script actually uses,
+    for example the titles of the sheets of a spreadsheet.
+
+    Examples
+    --------
+    >>> titles = script_constant(SCRIPT_R, 'TITLES')
+    >>> outputs = spreadsheet_filepaths(FILE_R, titles)
+
+    """
+    import ast
+    with open(filepath, 'r') as f:
+        tree = ast.parse(f.read(), filepath)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == name for target in node.targets):
+            try:
+                return ast.literal_eval(node.value)
+            except ValueError:
+                break
+    raise KeyError('The script does not define a literal {}: {}'.format(name, filepath))
+
+
+class Stage(object):
+    """A step of a pipeline, producing output files from input files.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+    action : callable
+        The function performing the work of the stage.
+        It is called as ``action(inputs, outputs, **params)``.
+    inputs : list of str
+        Paths to the input files.
+    outputs : list of str
+        Paths to the output files.
+        The file names should be unique, since they are also used in the cache.
+    params : dict, optional
+        Parameters of the action.
+        Values should be JSON serialisable.
+    sources : list of str, optional
+        Paths to files with code used by the action (scripts, modules)
+        that should invalidate the cached results when they change.
+        The source code of the action itself is always included.
+    cache : bool, optional
+        Use and store cached results of the stage.
+        Stages of which the results depend on files that are not part of their key,
+        for example a folder of saved states, should not be cached.
+        Default is ``True``.
+
+    """
+
+    def __init__(self, name, action, inputs, outputs, params=None, sources=None, cache=True):
+        self.name = name
+        self.action = action
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+        self.sources = list(sources or [])
+        self.cache = cache
+
+    def __str__(self):
+        return self.name
+
+    def key(self):
+        """Compute the key of the stage from the contents of its inputs, sources and parameters.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the combined contents.
+
+        """
+        sha = hashlib.sha1()
+        sha.update(self.name.encode('utf-8'))
+        sha.update(json.dumps(self.params, sort_keys=True).encode('utf-8'))
+        try:
+            sha.update(inspect.getsource(self.action).encode('utf-8'))
+        except (IOError, TypeError):
+            pass
+        for filepath in self.sources + self.inputs:
+            sha.update(os.path.basename(filepath).encode('utf-8'))
+            sha.update(file_hash(filepath).encode('utf-8'))
+        return sha.hexdigest()
+
+    def run(self):
+        """Run the action of the stage."""
+        for filepath in self.outputs:
+            folder = os.path.dirname(filepath)
+            if folder and not os.path.isdir(folder):
+                os.makedirs(folder)
+        self.action(self.inputs, self.outputs, **self.params)
+
+
+class Pipeline(object):
+    """A sequence of stages with results cached by the contents of their inputs.
+
+    Parameters
+    ----------
+    stages : list of Stage
+        The stages, in order of execution.
+    cache : str
+        Path to the folder in which the results of the stages are stored.
+
+    Notes
+    -----
+    Before a stage is run, a key is computed from the contents of its inputs,
+    the code of its action and sources, and its parameters.
+    If the results for that key are available in the cache, they are copied to
+    the outputs of the stage instead of running it.
+    Since the inputs of a stage are typically outputs of a previous stage,
+    only the stages affected by a change are run again.
+    Results for other keys are kept, such that switching back to previously
+    used parameters does not require running any stage.
+    Stages that are not cached are always run.
+    Stages that are run are recorded as stages of the global profiler
+    (see :func:`digitalfutures.utilities.profile_stage`).
+
+    Examples
+    --------
+    >>> pipeline = Pipeline([
+    ...     Stage('materialise', materialise, [FILE_I], [FILE_M], params={'E': 210, 'r': 2}),
+    ...     Stage('unload', unload, [FILE_M], [FILE_U], params={'kmax': 1000})],
+    ...     cache=CACHE)
+    >>> pipeline.run()
+
+    """
+
+    def __init__(self, stages, cache):
+        self.stages = list(stages)
+        self.cache = cache
+
+    def stage(self, name):
+        """Get a stage by name."""
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def cached(self, stage, key):
+        """Get the paths of the cached results of a stage.
+
+        Parameters
+        ----------
+        stage : Stage
+            The stage.
+        key : str
+            The key of the stage.
+
+        Returns
+        -------
+        list or None
+            The paths to the cached outputs, or ``None`` if they are not (all) available.
+
+        """
+        folder = os.path.join(self.cache, stage.name, key)
+        paths = [os.path.join(folder, os.path.basename(filepath)) for filepath in stage.outputs]
+        if all(os.path.isfile(path) for path in paths):
+            return paths
+        return None
+
+    def _store(self, stage, key, seconds):
+        folder = os.path.join(self.cache, stage.name, key)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        for filepath in stage.outputs:
+            shutil.copyfile(filepath, os.path.join(folder, os.path.basename(filepath)))
+        with open(os.path.join(folder, 'stage.json'), 'w') as f:
+            json.dump({'params': stage.params, 'seconds': seconds}, f, sort_keys=True, indent=4)
+
+    def _restore(self, stage, paths):
+        restored = False
+        for path, filepath in zip(paths, stage.outputs):
+            if os.path.isfile(filepath) and file_hash(filepath) == file_hash(path):
+                continue
+            shutil.copyfile(path, filepath)
+            restored = True
+        return restored
+
+    def run(self, force=None, verbose=True):
+        """Run the stages of the pipeline, skipping the ones with cached results.
+
+        Parameters
+        ----------
+        force : list of str, optional
+            The names of stages that should be run regardless of the cache.
+        verbose : bool, optional
+            Print the status of every stage.
+            Default is ``True``.
+
+        Returns
+        -------
+        list
+            For every stage, its name, its status (``'run'``, ``'cached'`` or ``'restored'``),
+            and the time spent on it.
+
+        """
+        force = set(force or [])
+        report = []
+        for stage in self.stages:
+            t0 = time.time()
+            key = stage.key()
+            paths = None if stage.name in force or not stage.cache else self.cached(stage, key)
+            if paths:
+                status = 'restored' if self._restore(stage, paths) else 'cached'
+            else:
+                with profile_stage(stage.name):
+                    stage.run()
+                status = 'run'
+            seconds = time.time() - t0
+            if status == 'run' and stage.cache:
+                self._store(stage, key, seconds)
+            report.append((stage.name, status, seconds))
+            if verbose:
+                print("{} [{}] {}: {:.3f}s".format(stage.name, key[:8], status, seconds))
+        return report
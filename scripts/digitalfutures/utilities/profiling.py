@@ -0,0 +1,385 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import sys
+import json
+import atexit
+
+from collections import OrderedDict
+from functools import wraps
+from timeit import default_timer
+
+from compas.datastructures import Mesh
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+__all__ = [
+    'Profiler',
+    'PROFILER',
+    'HOT_METHODS',
+    'profile_stage',
+    'profile_section',
+]
+
+
+HOT_METHODS = ['vertex_normal', 'faces_where', 'edge_length', 'face_halfedges']
+
+
+def _subclasses(cls):
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes += _subclasses(subclass)
+    return classes
+
+
+class _Stage(object):
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+        return self
+
+    def __exit__(self, *args):
+        self.profiler._exit()
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class Profiler(object):
+    """Record the wall time, calls of hot mesh methods, and peak memory of the stages of a script.
+
+    Parameters
+    ----------
+    methods : list of str, optional
+        The names of the methods of :class:`compas.datastructures.Mesh` and its subclasses
+        of which the calls are counted.
+        Default is :data:`HOT_METHODS`.
+    memory : bool, optional
+        Record the peak memory of every stage with :mod:`tracemalloc`.
+        Default is ``True``.
+        Before Python 3.9, only the peak memory of the root stage is recorded.
+
+    Notes
+    -----
+    A stage is identified by its name and the names of the stages it is nested in.
+    Entering a stage with the same path again adds to the records of that path.
+    Calls of hot methods are attributed to the innermost stage,
+    and calls of a hot method inside another call of the same method are not counted,
+    such that an override calling the method of its base class is counted once.
+
+    The profiler does nothing until it is enabled.
+    Enabling it enters the stage ``'<root>'``, which contains all other stages,
+    and records what happens outside of them.
+    The methods of ``Mesh`` and of all its subclasses defined so far are instrumented
+    when a stage is entered, and restored when the profiler is disabled.
+    Methods are instrumented in the classes that define them, which can be mixins,
+    such as ``EdgeGeometry`` for ``edge_length``, that are shared with other datastructures.
+    Tracing the allocations slows down the script considerably;
+    the wall times are therefore only comparable between runs with the same setting.
+
+    Examples
+    --------
+    >>> profiler = Profiler()
+    >>> profiler.enable()
+    >>> with profiler.stage('offsets'):
+    ...     xyz_e, xyz_i = mesh_offsets_numpy(fabric, 0.04)
+    >>> profiler.disable()
+    >>> print(profiler.report())
+
+    """
+
+    def __init__(self, methods=None, memory=True):
+        self.methods = list(HOT_METHODS if methods is None else methods)
+        self.memory = memory
+        self.enabled = False
+        self.records = OrderedDict()
+        self._stack = []
+        self._section = None
+        self._patched = []
+        self._active = {}
+
+    # ==========================================================================
+    # Switch
+    # ==========================================================================
+
+    def enable(self):
+        """Instrument the hot methods and start recording."""
+        if self.enabled:
+            return
+        self.enabled = True
+        if self.memory and tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._enter('<root>')
+
+    def disable(self):
+        """Close all open stages, restore the hot methods and stop recording."""
+        if not self.enabled:
+            return
+        while self._stack:
+            self._exit()
+        self._section = None
+        for cls, name, method in reversed(self._patched):
+            setattr(cls, name, method)
+        self._patched = []
+        if self.memory and tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = False
+
+    def _instrument(self):
+        patched = set((cls, name) for cls, name, method in self._patched)
+        for subclass in _subclasses(Mesh):
+            for cls in subclass.__mro__:
+                for name in self.methods:
+                    if name in cls.__dict__ and (cls, name) not in patched:
+                        patched.add((cls, name))
+                        self._patched.append((cls, name, cls.__dict__[name]))
+                        setattr(cls, name, self._counted(cls, name, cls.__dict__[name]))
+
+    def _counted(self, cls, name, method):
+        label = '{}.{}'.format(cls.__name__, name)
+        active = self._active
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if active.get(name):
+                return method(*args, **kwargs)
+            active[name] = True
+            t0 = default_timer()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = default_timer() - t0
+                active[name] = False
+                if self._stack:
+                    frame = self._stack[-1]
+                    frame['methods'] += seconds
+                    calls = self.records[frame['path']]['methods'].setdefault(label, [0, 0.0])
+                    calls[0] += 1
+                    calls[1] += seconds
+        return wrapper
+
+    # ==========================================================================
+    # Stages
+    # ==========================================================================
+
+    def stage(self, name):
+        """A stage, as context manager or as decorator.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+
+        Returns
+        -------
+        object
+            The stage.
+            If the profiler is disabled, entering the stage does nothing.
+
+        Examples
+        --------
+        >>> with PROFILER.stage('unroll'):
+        ...     flat = mesh_unroll(trimesh, (u, v))
+
+        >>> @PROFILER.stage('triangulate')
+        ... def triangulate_strip(fabric, faces):
+        ...     pass
+
+        """
+        return _Stage(self, name)
+
+    def section(self, name):
+        """Start a section of a script, ending the previous one.
+
+        Parameters
+        ----------
+        name : str
+            The name of the section.
+
+        Notes
+        -----
+        Sections are stages of the top level of a script without nesting,
+        such that they can mark the parts of a script that are separated by comments,
+        without indenting the code of every part.
+        The last section ends when the profiler is disabled.
+
+        """
+        if not self.enabled:
+            return
+        if self._section is not None:
+            depth = self._section
+            while len(self._stack) > depth:
+                self._exit()
+        self._enter(name)
+        self._section = len(self._stack) - 1
+
+    def _enter(self, name):
+        if not self.enabled:
+            return
+        self._instrument()
+        now = default_timer()
+        parent = self._stack[-1] if self._stack else None
+        path = parent['path'] + (name, ) if parent else (name, )
+        if path not in self.records:
+            self.records[path] = {'count': 0, 'time': 0.0, 'self': 0.0, 'peak': None, 'methods': {}}
+        start = None
+        if self._traces_peak(parent):
+            current, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent['peak'] = max(parent['peak'], peak)
+                tracemalloc.reset_peak()
+            start = current
+        self._stack.append({'path': path, 't0': now, 'children': 0.0, 'methods': 0.0, 'start': start, 'peak': start})
+
+    def _traces_peak(self, parent):
+        # without reset_peak (Python < 3.9), the peak of tracemalloc cannot be restarted
+        # and only the peak of the root stage, since tracing started, is known
+        if not self.memory or not tracemalloc or not tracemalloc.is_tracing():
+            return False
+        return parent is None or hasattr(tracemalloc, 'reset_peak')
+
+    def _exit(self):
+        if not self.enabled or not self._stack:
+            return
+        frame = self._stack.pop()
+        seconds = default_timer() - frame['t0']
+        record = self.records[frame['path']]
+        record['count'] += 1
+        record['time'] += seconds
+        record['self'] += seconds - frame['children'] - frame['methods']
+        if frame['start'] is not None:
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            record['peak'] = max(record['peak'] or 0, peak - frame['start'])
+        if self._stack:
+            parent = self._stack[-1]
+            parent['children'] += seconds
+            if frame['start'] is not None:
+                parent['peak'] = max(parent['peak'], peak)
+        if self._section is not None and self._section >= len(self._stack):
+            self._section = None
+
+    # ==========================================================================
+    # Output
+    # ==========================================================================
+
+    def report(self):
+        """Summarise the records as a table.
+
+        Returns
+        -------
+        str
+            For every stage, in the order in which they were first entered, indented by its depth, the number of times it was entered,
+            its total wall time, the time spent in the stage itself, excluding nested stages and hot methods,
+            its peak memory, and the calls of hot methods and the time spent in them.
+            Stages without a recorded peak memory show ``-``.
+
+        """
+        lines = ["{:<40} {:>6} {:>10} {:>10} {:>10}".format('stage', 'count', 'time (s)', 'self (s)', 'peak (MB)')]
+        for path in self.records:
+            record = self.records[path]
+            name = '  ' * (len(path) - 1) + path[-1]
+            peak = '-' if record['peak'] is None else '{:.1f}'.format(record['peak'] / 1e6)
+            lines.append("{:<40} {:>6} {:>10.3f} {:>10.3f} {:>10}".format(name, record['count'], record['time'], record['self'], peak))
+            for label in sorted(record['methods']):
+                calls, seconds = record['methods'][label]
+                lines.append("{:<40} {:>6} {:>10.3f}".format('  ' * len(path) + label, calls, seconds))
+        if self.memory and tracemalloc and not hasattr(tracemalloc, 'reset_peak'):
+            lines.append("peak memory of nested stages requires Python 3.9 (tracemalloc.reset_peak)")
+        return '\n'.join(lines)
+
+    def to_data(self):
+        """The records as a list of dicts, one per stage, with its path."""
+        data = []
+        for path in self.records:
+            record = dict(self.records[path])
+            record['path'] = list(path)
+            record['methods'] = {label: {'calls': calls, 'time': seconds} for label, (calls, seconds) in record['methods'].items()}
+            data.append(record)
+        return data
+
+    def to_json(self, filepath):
+        """Write the records to a JSON file."""
+        with open(filepath, 'w') as f:
+            json.dump(self.to_data(), f, sort_keys=True, indent=4)
+
+    def to_folded(self, filepath):
+        """Write the records to a file with folded stacks.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file.
+
+        Notes
+        -----
+        Every line contains the path of a stage, or of a hot method inside a stage,
+        separated by semicolons, and the time spent in it, in microseconds,
+        excluding nested stages and hot methods.
+        The file can be turned into a flame graph with ``flamegraph.pl``,
+        or opened in https://www.speedscope.app.
+
+        """
+        lines = []
+        for path in self.records:
+            record = self.records[path]
+            stack = ';'.join(name.replace(';', ':').replace(' ', '_') for name in path)
+            lines.append("{} {}".format(stack, int(round(max(record['self'], 0.0) * 1e6))))
+            for label in sorted(record['methods']):
+                lines.append("{};{} {}".format(stack, label, int(round(record['methods'][label][1] * 1e6))))
+        with open(filepath, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def save(self, filepath):
+        """Write the records to a JSON file if the extension of the path is ``.json``,
+        and to a file with folded stacks otherwise."""
+        if os.path.splitext(filepath)[1].lower() == '.json':
+            self.to_json(filepath)
+        else:
+            self.to_folded(filepath)
+
+
+PROFILER = Profiler()
+
+
+def profile_stage(name):
+    """A stage of the global profiler, as context manager or decorator (see :meth:`Profiler.stage`)."""
+    return PROFILER.stage(name)
+
+
+def profile_section(name):
+    """Start a section of the global profiler (see :meth:`Profiler.section`)."""
+    PROFILER.section(name)
+
+
+def _finish(filepath):
+    argv = getattr(sys, 'argv', None) or ['']
+    filepath = filepath.replace('{name}', os.path.splitext(os.path.basename(argv[0]))[0])
+    PROFILER.disable()
+    PROFILER.save(filepath)
+    print(PROFILER.report())
+    print("Profile written to {}".format(filepath))
+
+
+# the global profiler is enabled by setting the environment variable
+# DIGITALFUTURES_PROFILE to the path of the output file
+# the report is printed and the file is written when the script exits
+# {name} in the path is replaced by the name of the script,
+# such that scripts running other scripts do not overwrite each other's profile
+
+if os.environ.get('DIGITALFUTURES_PROFILE'):
+    PROFILER.enable()
+    atexit.register(_finish, os.environ['DIGITALFUTURES_PROFILE'])
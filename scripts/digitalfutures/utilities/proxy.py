@@ -0,0 +1,81 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from compas.rpc import Proxy
+from compas.rpc import RPCServerError
+
+from digitalfutures.utilities.packing import pack_arrays
+from digitalfutures.utilities.packing import unpack_arrays
+
+
+__all__ = [
+    'PackedProxy',
+]
+
+
+class PackedProxy(Proxy):
+    """Proxy that transfers lists of numbers as packed binary arrays.
+
+    Parameters
+    ----------
+    package : str
+        The package or module providing the remote functionality.
+
+    Other Parameters
+    ----------------
+    kwargs : dict
+        Additional parameters of :class:`compas.rpc.Proxy`.
+
+    Notes
+    -----
+    A regular proxy serialises every number of every list as JSON text,
+    in both directions, which dominates the cost of calling a fast function with large inputs.
+    This proxy packs every (nested) list of numbers of the arguments into a single
+    base64 string of binary numbers (see :func:`digitalfutures.utilities.pack_array`).
+    On the server, the packed arrays are passed to the function as Numpy arrays,
+    and the arrays in the result are packed in the same way.
+    The results are unpacked into (nested) lists of numbers.
+
+    Examples
+    --------
+    >>> numerical = PackedProxy('digitalfutures.numerical')
+    >>> xyz, q, f, l, r = numerical.fd_numpy(vertices, edges, fixed, q, loads)
+
+    """
+
+    def __init__(self, package=None, **kwargs):
+        self._target = None
+        super(PackedProxy, self).__init__(package=package, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        self._target = "{}.{}".format(self.package, name) if self.package else name
+        try:
+            self._function = getattr(self._server, 'digitalfutures.utilities.call_packed_numpy')
+        except Exception:
+            raise RPCServerError()
+        return self.proxy
+
+    def proxy(self, *args, **kwargs):
+        """Callable replacement for the requested functionality.
+
+        Parameters
+        ----------
+        args : list
+            Positional arguments to be passed to the remote function.
+        kwargs : dict
+            Named arguments to be passed to the remote function.
+
+        Returns
+        -------
+        object
+            The result returned by the remote function,
+            with all arrays converted to (nested) lists.
+
+        """
+        args = [pack_arrays(arg) for arg in args]
+        kwargs = {key: pack_arrays(value) for key, value in kwargs.items()}
+        result = super(PackedProxy, self).proxy(self._target, args, kwargs)
+        return unpack_arrays(result)
@@ -0,0 +1,158 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import csv
+
+import compas
+
+
+__all__ = [
+    'SpreadsheetWriter',
+    'spreadsheet_filepaths',
+]
+
+
+def spreadsheet_filepaths(filepath, titles, csv=True):
+    """The paths of the files written by a :class:`SpreadsheetWriter`.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the Excel file (``.xlsx``).
+    titles : list of str
+        The titles of the sheets.
+    csv : bool, optional
+        Include the CSV files of the sheets.
+        Default is ``True``.
+
+    Returns
+    -------
+    list of str
+        The path of the Excel file, followed by the paths of the CSV files of the sheets.
+
+    Examples
+    --------
+    >>> spreadsheet_filepaths('data-fabrication-rings.xlsx', ['CABLES'])
+    ['data-fabrication-rings.xlsx', 'data-fabrication-rings-CABLES.csv']
+
+    """
+    filepaths = [filepath]
+    if csv:
+        root, ext = os.path.splitext(filepath)
+        filepaths += ['{}-{}.csv'.format(root, title) for title in titles]
+    return filepaths
+
+
+class SpreadsheetWriter(object):
+    """Writer that streams rows to an Excel workbook and to CSV files side by side.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the Excel file (``.xlsx``).
+    csv : bool, optional
+        Also write every sheet to a CSV file, named after the Excel file and the sheet,
+        for example ``data-fabrication-cables-SOUTH.csv``.
+        Default is ``True``.
+
+    Attributes
+    ----------
+    filepaths : list
+        The paths of all files written by the writer.
+
+    Notes
+    -----
+    The workbook is created in write-only mode, and the CSV files are written row by row.
+    Therefore, the memory used by the writer does not depend on the number of rows.
+    Rows are appended to the most recently added sheet.
+
+    Requires ``openpyxl``.
+
+    Examples
+    --------
+    >>> with SpreadsheetWriter(FILE_O) as writer:
+    ...     writer.add_sheet('SOUTH')
+    ...     for row in rows:
+    ...         writer.append(row)
+
+    """
+
+    def __init__(self, filepath, csv=True):
+        from openpyxl import Workbook
+        self.filepath = filepath
+        self.csv = csv
+        self.filepaths = [filepath]
+        self._workbook = Workbook(write_only=True)
+        self._sheet = None
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def csv_filepath(self, title):
+        """The path of the CSV file of a sheet.
+
+        Parameters
+        ----------
+        title : str
+            The title of the sheet.
+
+        Returns
+        -------
+        str
+            The path of the file.
+
+        """
+        return spreadsheet_filepaths(self.filepath, [title])[1]
+
+    def _close_csv(self):
+        if self._file:
+            self._file.close()
+        self._file = None
+        self._writer = None
+
+    def add_sheet(self, title):
+        """Add a sheet to the workbook, and start a CSV file for it.
+
+        Parameters
+        ----------
+        title : str
+            The title of the sheet.
+
+        """
+        self._sheet = self._workbook.create_sheet(title)
+        if self.csv:
+            self._close_csv()
+            filepath = self.csv_filepath(title)
+            if compas.PY3:
+                self._file = open(filepath, 'w', newline='')
+            else:
+                self._file = open(filepath, 'wb')
+            self._writer = csv.writer(self._file)
+            self.filepaths.append(filepath)
+
+    def append(self, row):
+        """Append a row to the current sheet.
+
+        Parameters
+        ----------
+        row : list
+            The values of the row.
+
+        """
+        self._sheet.append(row)
+        if self._writer:
+            self._writer.writerow(row)
+
+    def close(self):
+        """Save the workbook and close the CSV files."""
+        self._close_csv()
+        if self._workbook:
+            self._workbook.save(self.filepath)
+            self._workbook = None
@@ -3,12 +3,15 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
+import sys
 
-from openpyxl import Workbook
+from itertools import islice
+
+from numpy import array
+from numpy import stack
 
 from compas.geometry import distance_point_point
 from compas.geometry import add_vectors
-from compas.geometry import intersection_line_plane
 from compas.geometry import cross_vectors
 from compas.geometry import subtract_vectors
 from compas.geometry import normalize_vector
@@ -16,11 +19,16 @@ from compas.geometry import scale_vector
 
 from compas_fofin.datastructures import Shell
 
+from digitalfutures.geometry import intersection_lines_planes_numpy
+from digitalfutures.datastructures import CableIndex
+from digitalfutures.utilities import SpreadsheetWriter
+from digitalfutures.utilities import cumulative_lengths_numpy
+
 # ==============================================================================
 # Helpers
 # ==============================================================================
 
-def append_to_sheet(sheet, beamA, beamB):
+def cable_lengths(beamA, beamB):
     for u in beamA:
         nbrs = SHELL.vertex_neighbors(u)
         v = None
@@ -31,29 +39,31 @@ def append_to_sheet(sheet, beamA, beamB):
             break
         if v is None:
             continue
-        edges = SHELL.get_continuous_edges((u, v), directed=False)
+        edges = INDEX.continuous_edges((u, v))
+        segments = INDEX.continuous_lengths((u, v))
         last = edges[-1][1]
         if last in beamB:
             values = LENGTHS[u][:]
-            values += [SHELL.edge_length(u, v) for u, v in edges]
+            values += segments
             values += LENGTHS[last][::-1]
-            accumulated = []
-            value = 0
-            for v in values:
-                value += v
-                accumulated.append(value)
-            sheet.append([u] + [round(1e3 * v, 1) for v in accumulated])
         else:
             values = LENGTHS[u][:]
-            values += [SHELL.edge_length(u, v) for u, v in edges[:-1]]
-            values += [SHELL.edge_length(* edges[-1]) - 0.100]
+            values += segments[:-1]
+            values += [segments[-1] - 0.100]
             values += [0.100, 0.100]
-            accumulated = []
-            value = 0
-            for v in values:
-                value += v
-                accumulated.append(value)
-            sheet.append([u] + [round(1e3 * v, 1) for v in accumulated])
+        yield u, values
+
+
+def cable_rows(beamA, beamB):
+    cables = cable_lengths(beamA, beamB)
+    while True:
+        chunk = list(islice(cables, CHUNK))
+        if not chunk:
+            break
+        keys, lengths = zip(*chunk)
+        marks = cumulative_lengths_numpy(lengths, scale=1e3, decimals=1)
+        for key, row in zip(keys, marks):
+            yield [key] + row
 
 
 def beam_plane(beam):
@@ -71,10 +81,11 @@ def beam_plane(beam):
 
 HERE = os.path.dirname(__file__)
 DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
-FILE_I = os.path.join(DATA, 'data.json')
-FILE_O = os.path.join(DATA, 'data-fabrication-cables.xlsx')
+FILE_I = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DATA, 'data.json')
+FILE_O = sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATA, 'data-fabrication-cables.xlsx')
 
 SHELL = Shell.from_json(FILE_I)
+INDEX = CableIndex(SHELL)
 
 # ==============================================================================
 # Beam vertices
@@ -105,40 +116,36 @@ PLANES = [
 # Connector cables
 # ==============================================================================
 
-LENGTHS = {}
+KEYS = [key for keys in BEAMS for key in keys]
+
+XYZ = array(SHELL.get_vertices_attributes('xyz', keys=KEYS), dtype=float)
+R = array(SHELL.get_vertices_attributes(['rx', 'ry', 'rz'], keys=KEYS), dtype=float)
 
-for i, keys in enumerate(BEAMS):
-    plane = PLANES[i]
+LINES = stack([XYZ, XYZ + R], axis=1)
+CONNECTIONS = [PLANES[i] for i, keys in enumerate(BEAMS) for key in keys]
 
-    points = []
-    for key in keys:
-        a = SHELL.vertex_coordinates(key)
-        r = SHELL.get_vertex_attributes(key, ['rx', 'ry', 'rz'])
-        b = add_vectors(a, r)
+X, _, _ = intersection_lines_planes_numpy(LINES, CONNECTIONS)
 
-        line = a, b
-        x = intersection_line_plane(line, plane)
-        direction = normalize_vector(subtract_vectors(a, x))
+LENGTHS = {}
 
-        points.append(x)
+for key, a, x in zip(KEYS, XYZ.tolist(), X.tolist()):
+    direction = normalize_vector(subtract_vectors(a, x))
 
-        x0 = x
-        x1 = add_vectors(x0, scale_vector(direction, 0.040))
-        x2 = add_vectors(x1, scale_vector(direction, 0.300))
-        x3 = add_vectors(x2, scale_vector(direction, 0.100))
-        x4 = a
+    x0 = x
+    x1 = add_vectors(x0, scale_vector(direction, 0.040))
+    x2 = add_vectors(x1, scale_vector(direction, 0.300))
+    x3 = add_vectors(x2, scale_vector(direction, 0.100))
+    x4 = a
 
-        LENGTHS[key] = [
-            0.1,
-            distance_point_point(x2, x3),
-            distance_point_point(x3, x4)]
+    LENGTHS[key] = [
+        0.1,
+        distance_point_point(x2, x3),
+        distance_point_point(x3, x4)]
 
 # ==============================================================================
 # Export
 # ==============================================================================
 
-wb = Workbook()
-
 boundary = set(SHELL.vertices_on_boundary())
 
 BEAMS = [116, 261, 282, 60, 79, 52, 260, 5]
@@ -147,21 +154,23 @@ beamN = [268, 258, 115, 106, 114, 269, 281, 145]
 BEAMSE = [146, 270, 117, 107]
 beamNE = [8, 144, 272, 175]
 
-ws_S = wb.active
-ws_S.title = "SOUTH"
-
-ws_W = wb.create_sheet()
-ws_W.title = "WEST"
+# the titles of the sheets are also read by scripts/pipeline.py
+# to declare the CSV files of the sheets as outputs
 
-ws_N = wb.create_sheet()
-ws_N.title = "NORTH"
+TITLES = ["SOUTH", "WEST", "NORTH", "EAST"]
 
-ws_E = wb.create_sheet()
-ws_E.title = "EAST"
+SHEETS = zip(TITLES, [
+    (BEAMS, beamN),
+    (beamW, []),
+    (beamN, BEAMS),
+    (BEAMSE, beamNE)])
 
-append_to_sheet(ws_S, BEAMS, beamN)
-append_to_sheet(ws_W, beamW, [])
-append_to_sheet(ws_N, beamN, BEAMS)
-append_to_sheet(ws_E, BEAMSE, beamNE)
+# the marks are computed for chunks of this number of cables
+# and every row is written before the next chunk is computed
+CHUNK = 100
 
-wb.save(FILE_O)
+with SpreadsheetWriter(FILE_O) as writer:
+    for title, (beamA, beamB) in SHEETS:
+        writer.add_sheet(title)
+        for row in cable_rows(beamA, beamB):
+            writer.append(row)
@@ -3,75 +3,69 @@ from __future__ import absolute_import
 from __future__ import division
 
 import os
+import sys
 
-from openpyxl import Workbook
-
-from compas.geometry import add_vectors
 from compas_fofin.datastructures import Shell
 
+from digitalfutures.datastructures import CableIndex
+from digitalfutures.utilities import SpreadsheetWriter
+from digitalfutures.utilities import cumulative_lengths_numpy
+
 # ==============================================================================
 # Initialise
 # ==============================================================================
 
 HERE = os.path.dirname(__file__)
 DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
-FILE_I = os.path.join(DATA, 'data.json')
-FILE_O = os.path.join(DATA, 'data-fabrication-rings.xlsx')
+FILE_I = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DATA, 'data.json')
+FILE_O = sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATA, 'data-fabrication-rings.xlsx')
 
 SHELL = Shell.from_json(FILE_I)
+INDEX = CableIndex(SHELL)
 
 # ==============================================================================
 # Select
 # ==============================================================================
 
-CABLES = []
+# the rings are closed cables
+# every ring starts with its seed edge and runs in the direction of the seed
+# the labels are the edges that name the rings in the spreadsheet
+# some name the seed edge in the opposite direction
+
+SEEDS = [(203, 136), (200, 45), (105, 103), (255, 156)]
+LABELS = [(136, 203), (45, 200), (103, 105), (255, 156)]
 
-for edge in [(136, 203), (45, 200), (103, 105), (156, 255)]:
-    cable = []
-    edges = SHELL.get_continuous_edges(edge)
-    for edge in edges:
-        if edge not in cable:
-            cable.append(edge)
-    CABLES.append(cable)
+CABLES = [INDEX.continuous_lengths(edge) for edge in SEEDS]
 
 # ==============================================================================
 # Lengths
 # ==============================================================================
 
+# the marks are sums of the rounded lengths of the segments, in mm
+
+MARKS = cumulative_lengths_numpy(CABLES, scale=1e3, decimals=1, rounded=True)
+
 LENGTHS = []
 
-for cable in CABLES:
+for (u, v), marks in zip(LABELS, MARKS):
     data = []
-    L = 0
-    u, v = cable[0]
-    l = SHELL.edge_length(u, v)
-    l = 1e3 * l
-    L += round(l, 1)
-
     data.append("{}-{}".format(u, v))
     data.append(50)
-    data.append(L - 50)
-
-    for u, v in cable[1:]:
-        l = SHELL.edge_length(u, v)
-        l = 1e3 * l
-        L += round(l, 1)
-        data.append(L)
-
-    L += 50
-    data.append(L)
+    data.append(marks[0] - 50)
+    data += marks[1:]
+    data.append(marks[-1] + 50)
     LENGTHS.append(data)
 
 # ==============================================================================
 # Export
 # ==============================================================================
 
-WB = Workbook()
-
-WS = WB.active
-WS.title = "CABLES"
+# the titles of the sheets are also read by scripts/pipeline.py
+# to declare the CSV files of the sheets as outputs
 
-for data in LENGTHS:
-    WS.append(data)
+TITLES = ["CABLES"]
 
-WB.save(FILE_O)
+with SpreadsheetWriter(FILE_O) as writer:
+    writer.add_sheet(TITLES[0])
+    for data in LENGTHS:
+        writer.append(data)
@@ -5,7 +5,7 @@ from __future__ import division
 import os
 
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+from digitalfutures.artists import ShellArtist
 
 # ==============================================================================
 # Initialise
@@ -34,3 +34,5 @@ ARTIST.draw_forces(scale=0.025)
 
 ARTIST.layer= "FoFin::Reactions"
 ARTIST.draw_reactions(scale=0.5)
+
+ARTIST.redraw()
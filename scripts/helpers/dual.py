@@ -8,7 +8,12 @@ import compas_fofin
 from compas.geometry import add_vectors
 from compas.datastructures import mesh_dual
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+
+# in Rhino, the package is not on the search path of the scripts in this folder
+if compas.IPY:
+    from compas_fofin.rhino import ShellArtist
+else:
+    from digitalfutures.artists import ShellArtist
 
 # ==============================================================================
 # Initialise
@@ -9,6 +9,9 @@ from math import sqrt
 import compas_fofin
 from compas_fofin.datastructures import Shell
 
+from digitalfutures.datastructures import CableIndex
+from digitalfutures.datastructures import shell_materialise_numpy
+
 # ==============================================================================
 # Initialise
 # ==============================================================================
@@ -25,33 +28,36 @@ shell = Shell.from_json(FILE_I)
 # Compute unstressed length
 # ==============================================================================
 
-force  = [] 
-stress = []
-strain = []
-
 E = 210
 r = 2
-A = 3.14159 * r**2
 
-for u, v, attr in shell.edges_where({'is_edge': True}, True):
-    f = attr['f']
+# the closed cables form the family 'ring', the other cables the family 'cable'
+# material properties per cable family
+# families that are not listed use E and r
+# for example, {'ring': {'E': 210, 'r': 3}}
+MATERIALS = {}
+
+INDEX = CableIndex(shell)
+
+force, stress, strain, families, cables = shell_materialise_numpy(
+    shell, MATERIALS, E=E, r=r, families=INDEX.edge_families(), cables=INDEX)
+
 
-    x = f / (E * A)
-    l  = shell.edge_length(u, v)
-    l0 = l / (1 + x)
+def report(label, stats):
+    print(label, stats['count'])
+    for name in ('force', 'stress', 'strain'):
+        values = stats[name]
+        print("    {:<8} min {:.6f} p50 {:.6f} p95 {:.6f} max {:.6f}".format(
+            name, values['min'], values['p50'], values['p95'], values['max']))
 
-    force.append(f)
-    stress.append(f / A)
-    strain.append(l / l0)
 
-    attr['E'] = E
-    attr['r'] = r
-    attr['l0'] = l0
+for family in families:
+    report(family, families[family])
 
-print(A)
-print(max(force))
-print(max(stress))
-print(max(strain))
+# the cables with the highest stress
+for cable in sorted(cables, key=lambda cable: cables[cable]['stress']['max'], reverse=True)[:5]:
+    u, v = INDEX.cables[cable][:2]
+    report("cable {}-{}".format(u, v), cables[cable])
 
 # ==============================================================================
 # Serialize
@@ -4,7 +4,8 @@ from __future__ import division
 
 import os
 
-from compas_fofin.datastructures import Shell
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import shell_volume_numpy
 
 # ==============================================================================
 # Initialise
@@ -17,7 +18,7 @@ FILE_I = os.path.join(DATA, 'data.json')
 shell = Shell.from_json(FILE_I)
 
 # ==============================================================================
-# Compute volume of concrete per vertex
+# Compute volume of concrete
 # ==============================================================================
 
 thickness = 0.04
@@ -27,5 +28,11 @@ for fkey in shell.faces():
     area = shell.face_area(fkey)
     A += area
 
+V, volumes, panels = shell_volume_numpy(shell, thickness, group='panel')
+
 print(A)
-print(A * thickness)
\ No newline at end of file
+print(A * thickness)
+print(V)
+
+for panel in sorted(panels, key=str):
+    print(panel, panels[panel])
\ No newline at end of file
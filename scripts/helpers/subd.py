@@ -7,8 +7,16 @@ import compas
 import compas_fofin
 from compas.geometry import add_vectors
 from compas.datastructures import mesh_subdivide_quad
+from compas.rpc import Proxy
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+
+# in Rhino, the package is not on the search path of the scripts in this folder
+if compas.IPY:
+    from compas_fofin.rhino import ShellArtist
+else:
+    from digitalfutures.artists import ShellArtist
+
+DATASTRUCTURES = Proxy('digitalfutures.datastructures')
 
 # ==============================================================================
 # Initialise
@@ -32,25 +40,19 @@ subd.name = 'Subd'
 # Update attributes
 # ==============================================================================
 
+# the vertices are matched by location, not by key
+# the edges and faces of the shell are split and have no counterpart in the subd
+
 subd.update_default_vertex_attributes(shell.default_vertex_attributes)
 subd.update_default_edge_attributes(shell.default_edge_attributes)
 
-for key, attr in shell.vertices(True):
-    if subd.has_vertex(key):
-        for name in attr:
-            subd.set_vertex_attribute(key, name, attr[name])
-        subd.set_vertex_attribute(key, 'is_anchor', True)
-
-# dva = shell.default_vertex_attributes
-# gkey_key = shell.gkey_key()
-#
-# for key, attr in subd.vertices(True):
-#     gkey = geometric_key(subd.vertex_coordinates(key))
-#     if gkey in gkey_key:
-#         key = gkey_key[gkey]
-#         for name in dva:
-#             subd.set_vertex_attribute(key, name, shell.get_vertex_attribute(key, name))
-#         subd.set_vertex_attribute(key, 'is_anchor', True)
+skeys = list(shell.vertices())
+tkeys = list(subd.vertices())
+
+for i, j in DATASTRUCTURES.mesh_vertex_pairs_numpy(shell, subd):
+    attr = shell.vertex[skeys[j]]
+    subd.vertex[tkeys[i]].update({name: attr[name] for name in attr if name not in ('x', 'y', 'z')})
+    subd.set_vertex_attribute(tkeys[i], 'is_anchor', True)
 
 # ==============================================================================
 # Serialize
@@ -7,8 +7,14 @@ import compas
 import compas_fofin
 from compas.geometry import add_vectors
 from compas.geometry import scale_vector
-from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+
+# in Rhino, the package is not on the search path of the scripts in this folder
+if compas.IPY:
+    from compas_fofin.datastructures import Shell
+    from compas_fofin.rhino import ShellArtist
+else:
+    from digitalfutures.datastructures import Shell
+    from digitalfutures.artists import ShellArtist
 
 # ==============================================================================
 # Initialise
@@ -4,14 +4,16 @@ from __future__ import division
 
 import os
 
-import rhinoscriptsyntax as rs
-
-from compas.datastructures import Mesh
 from compas.datastructures import mesh_flip_cycles
-from compas_rhino.artists import MeshArtist
+from compas.rpc import Proxy
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.artists import ShellArtist
 from compas.geometry import add_vectors
 from compas.geometry import scale_vector
-from compas.geometry import intersection_line_plane
+
+GEOMETRY = Proxy('digitalfutures.geometry')
+DATASTRUCTURES = Proxy('digitalfutures.datastructures')
 
 # ==============================================================================
 # Initialise
@@ -22,13 +24,14 @@ DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
 FILE_I1 = os.path.join(DATA, 'data.json')
 FILE_I2 = os.path.join(DATA, 'fabric.json')
 
-SHELL = Mesh.from_json(FILE_I1)
-FABRIC = Mesh.from_json(FILE_I2)
+SHELL = Shell.from_json(FILE_I1)
+FABRIC = Shell.from_json(FILE_I2)
 
 SHELL.name = 'Shell'
 FABRIC.name = 'Fabric'
 
 mesh_flip_cycles(FABRIC)
+FABRIC.invalidate_geometry()
 
 THICKNESS = 0.04
 
@@ -42,132 +45,90 @@ IDOS = FABRIC.copy()
 EDOS.name = 'Extrados'
 IDOS.name = 'Intrados'
 
-for key in FABRIC.vertices():
-    normal = FABRIC.vertex_normal(key)
-    xyz = FABRIC.vertex_coordinates(key)
+xyz_e, xyz_i = DATASTRUCTURES.mesh_offsets_numpy(FABRIC, THICKNESS)
+
+key_index = FABRIC.key_index()
 
-    xyz_e = add_vectors(xyz, scale_vector(normal, +0.5 * THICKNESS))
-    xyz_i = add_vectors(xyz, scale_vector(normal, -0.5 * THICKNESS))
+for key in FABRIC.vertices():
+    index = key_index[key]
 
-    EDOS.set_vertex_attributes(key, 'xyz', xyz_e)
-    IDOS.set_vertex_attributes(key, 'xyz', xyz_i)
+    EDOS.set_vertex_attributes(key, 'xyz', xyz_e[index])
+    IDOS.set_vertex_attributes(key, 'xyz', xyz_i[index])
 
 mesh_flip_cycles(IDOS)
+IDOS.invalidate_geometry()
 
 # ==============================================================================
 # Identify strips
 # ==============================================================================
 
-SOUTH = [
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '04'}))]
-
-WEST = [
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '04'}))]
-
-NORTH = [
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '04'}))]
+GROUPS = FABRIC.face_groups(['panel', 'strip'], sort_by='count')
+
+SOUTH = list(FABRIC.face_groups('strip', {'panel': 'SOUTH'}, sort_by='count').values())
+WEST = list(FABRIC.face_groups('strip', {'panel': 'WEST'}, sort_by='count').values())
+NORTH = list(FABRIC.face_groups('strip', {'panel': 'NORTH'}, sort_by='count').values())
 
 SW = [
-    list(FABRIC.faces_where({'panel': 'SW', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'WS', 'strip': '00'}))]
+    GROUPS['SW', '00'],
+    GROUPS['WS', '00']]
 
 NW = [
-    list(FABRIC.faces_where({'panel': 'WN', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'NW', 'strip': '00'}))]
-
-RING = [
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '04'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '05'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '06'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '07'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '08'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '09'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '10'})),
-]
+    GROUPS['WN', '00'],
+    GROUPS['NW', '00']]
+
+RING = list(FABRIC.face_groups('strip', {'panel': 'RING'}, sort_by='count').values())
 
 STRIPS = SOUTH + SW + WEST + NW + NORTH + RING
 
 # ==============================================================================
-# Visualise
+# Holes
 # ==============================================================================
 
-ARTIST = MeshArtist(FABRIC, layer="Fabric")
-ARTIST.clear_layer()
-
-# INTRADOS
+LAYERS = [('Intrados', IDOS, -0.5 * THICKNESS, (255, 0, 0)), ('Extrados', EDOS, +0.5 * THICKNESS, (0, 0, 255))]
 
-ARTIST.mesh = IDOS
+TASKS = []
+LINES = []
+PLANES = []
 
-ARTIST.layer = "Fabric::Intrados"
-
-for name, panel in [('SOUTH', SOUTH), ('WEST', WEST), ('NORTH', NORTH), ('RING', RING)]:
-    for strip, faces in enumerate(panel):
-        ARTIST.layer = "Fabric::Intrados::{}-{}".format(name, str(strip).zfill(2))
-        color = (255, 0, 0)
-        points = []
-        fkeys = []
-        for fkey in faces:
-            origin = IDOS.face_centroid(fkey)
-            normal = IDOS.face_normal(fkey, unitized=True)
-            plane = origin, normal
-            if SHELL.has_vertex(fkey):
-                fkeys.append(fkey)
-                normal = SHELL.vertex_normal(fkey)
+for side, mesh, offset, color in LAYERS:
+    for name, panel in [('SOUTH', SOUTH), ('WEST', WEST), ('NORTH', NORTH), ('RING', RING)]:
+        for strip, faces in enumerate(panel):
+            layer = "Fabric::{}::{}-{}".format(side, name, str(strip).zfill(2))
+            fkeys = [fkey for fkey in faces if SHELL.has_vertex(fkey)]
+            TASKS.append((mesh, layer, color, fkeys))
+            for fkey in fkeys:
                 xyz = SHELL.vertex_coordinates(fkey)
-                xyz_i = add_vectors(xyz, scale_vector(normal, -0.5 * THICKNESS))
-                line = xyz, xyz_i
-                x = intersection_line_plane(line, plane)
-                points.append({
-                    'pos' : x,
-                    'color' : color
-                })
-        guid = ARTIST.draw_faces(keys=fkeys, join_faces=True)
-        rs.ObjectColor(guid, color)
-        ARTIST.draw_points(points)
-
-# EXTRADOS
-
-ARTIST.mesh = EDOS
-
-ARTIST.layer = "Fabric::Extrados"
-
-for name, panel in [('SOUTH', SOUTH), ('WEST', WEST), ('NORTH', NORTH), ('RING', RING)]:
-    for strip, faces in enumerate(panel):
-        ARTIST.layer = "Fabric::Extrados::{}-{}".format(name, str(strip).zfill(2))
-        color = (0, 0, 255)
-        points = []
-        fkeys = []
-        for fkey in faces:
-            origin = EDOS.face_centroid(fkey)
-            normal = EDOS.face_normal(fkey, unitized=True)
-            plane = origin, normal
-            if SHELL.has_vertex(fkey):
-                fkeys.append(fkey)
                 normal = SHELL.vertex_normal(fkey)
-                xyz = SHELL.vertex_coordinates(fkey)
-                xyz_i = add_vectors(xyz, scale_vector(normal, +0.5 * THICKNESS))
-                line = xyz, xyz_i
-                x = intersection_line_plane(line, plane)
-                points.append({
-                    'pos' : x,
-                    'color' : color
-                })
-        guid = ARTIST.draw_faces(keys=fkeys, join_faces=True)
-        rs.ObjectColor(guid, color)
-        ARTIST.draw_points(points)
+                LINES.append([xyz, add_vectors(xyz, scale_vector(normal, offset))])
+                PLANES.append([mesh.face_centroid(fkey), mesh.face_normal(fkey, unitized=True)])
+
+POINTS, _, MASK = GEOMETRY.intersection_lines_planes_numpy(LINES, PLANES)
+
+# ==============================================================================
+# Visualise
+# ==============================================================================
+
+ARTIST = ShellArtist(FABRIC, layer="Fabric")
+ARTIST.clear_layer()
+
+FACEGROUPS = []
+index = 0
+
+for mesh, layer, color, fkeys in TASKS:
+    points = []
+    for fkey in fkeys:
+        if MASK[index]:
+            points.append({
+                'pos' : POINTS[index],
+                'color' : color
+            })
+        index += 1
+    FACEGROUPS.append({
+        'mesh'   : mesh,
+        'keys'   : fkeys,
+        'layer'  : layer,
+        'color'  : color,
+        'points' : points})
+
+ARTIST.draw_facegroups(FACEGROUPS)
+ARTIST.redraw()
@@ -5,11 +5,12 @@ from __future__ import division
 import os
 from random import sample
 
-from compas.datastructures import mesh_subdivide
 from compas.rpc import Proxy
 
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+from digitalfutures.artists import ShellArtist
+
+from digitalfutures.datastructures import FaceHierarchy
 
 PROXY = Proxy('compas_fofin.fofin')
 
@@ -23,58 +24,25 @@ FILE_I = os.path.join(DATA, 'data.json')
 
 SHELL = Shell.from_json(FILE_I)
 
-SHELL.update_default_face_attributes({'children': None})
-
 # ==============================================================================
 # Subdivide
 # ==============================================================================
 
-SUBD1 = mesh_subdivide(SHELL, scheme='quad', k=1)
-
-SUBD1.update_default_face_attributes({'children': None})
-
-for fkey in SHELL.faces():
-    children = []
-    for u, v in SHELL.face_halfedges(fkey):
-        u_nbrs = SUBD1.vertex_neighbors(u)
-        v_nbrs = SUBD1.vertex_neighbors(v)
-        shared = list(set(u_nbrs) & set(v_nbrs))
-        children += shared
-    key = list(set.intersection(*[set(SUBD1.vertex_neighbors(key)) for key in children]))[0]
-    children.append(key)
-    SHELL.set_face_attribute(fkey, 'children', children)
-
-SUBD2 = mesh_subdivide(SUBD1, scheme='quad', k=1)
-
-SUBD2.update_default_face_attributes({'children': None})
-
-for fkey in SUBD1.faces():
-    children = []
-    for u, v in SUBD1.face_halfedges(fkey):
-        u_nbrs = SUBD2.vertex_neighbors(u)
-        v_nbrs = SUBD2.vertex_neighbors(v)
-        shared = list(set(u_nbrs) & set(v_nbrs))
-        children += shared
-    key = list(set.intersection(*[set(SUBD2.vertex_neighbors(key)) for key in children]))[0]
-    children.append(key)
-    SUBD1.set_face_attribute(fkey, 'children', children)
+HIERARCHY = FaceHierarchy.from_mesh(SHELL, k=2)
 
+SUBD2 = HIERARCHY.meshes[2]
 
 # ==============================================================================
 # Descendants
 # ==============================================================================
 
+# the faces of SUBD2 per face of SHELL
+
+PATCHES = HIERARCHY.patches(2)
+
 descendants = {}
 for root in sample(list(SHELL.faces()), k=100):
-    children = SHELL.get_face_attribute(root, 'children')
-    u = children[-1]
-    faces = []
-    for v in children[:-1]:
-        faces.append(SUBD1.halfedge[u][v])
-    grandchildren = []
-    for fkey in faces:
-        grandchildren += SUBD1.get_face_attribute(fkey, 'children')
-    descendants[root] = children + grandchildren
+    descendants[root] = set(key for fkey in PATCHES[root] for key in SUBD2.face_vertices(fkey))
 
 # ==============================================================================
 # Visualise
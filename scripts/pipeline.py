@@ -0,0 +1,128 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import sys
+import subprocess
+
+import digitalfutures
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import CableIndex
+from digitalfutures.datastructures import shell_materialise_numpy
+from digitalfutures.numerical import SelfweightCalculator
+from digitalfutures.numerical import shell_dr_numpy
+from digitalfutures.numerical import shell_load_steps_numpy
+from digitalfutures.utilities import Stage
+from digitalfutures.utilities import Pipeline
+from digitalfutures.utilities import package_sources
+from digitalfutures.utilities import script_constant
+from digitalfutures.utilities import spreadsheet_filepaths
+
+# ==============================================================================
+# Stages
+# ==============================================================================
+
+def materialise(inputs, outputs, E, r, materials):
+    shell = Shell.from_json(inputs[0])
+    index = CableIndex(shell)
+    shell_materialise_numpy(shell, materials, E=E, r=r, families=index.edge_families(), cables=index)
+    shell.to_json(outputs[0])
+
+
+def unload(inputs, outputs, kmax):
+    shell = Shell.from_json(inputs[0])
+    shell_dr_numpy(shell, kmax=kmax)
+    shell.to_json(outputs[0])
+
+
+def load(inputs, outputs, density, thickness, steps, kmax, tol1, states=None):
+    shell = Shell.from_json(inputs[0])
+    shell.set_vertices_attribute('t', thickness)
+    p = shell.get_vertices_attributes(('px', 'py', 'pz'))
+    calculate_sw = SelfweightCalculator(shell, density=density, thickness_attr_name='t')
+    shell_load_steps_numpy(shell, calculate_sw.loads(p), steps=steps, states=states, kmax=kmax, tol1=tol1)
+    shell.to_json(outputs[0])
+
+
+def script(path):
+    def run(inputs, outputs):
+        subprocess.check_call([sys.executable, path] + inputs + outputs)
+    return run
+
+# ==============================================================================
+# Initialise
+# ==============================================================================
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
+TEMP = os.path.join(DATA, '__temp__')
+CACHE = os.path.join(TEMP, '__cache__')
+
+FILE_I = os.path.join(DATA, 'data.json')
+FILE_M = os.path.join(TEMP, 'data-materialised.json')
+FILE_U = os.path.join(TEMP, 'data-materialised-unloaded.json')
+FILE_L = os.path.join(TEMP, 'data-materialised-loaded.json')
+FILE_C = os.path.join(TEMP, 'data-materialised-loaded-cables.xlsx')
+FILE_R = os.path.join(TEMP, 'data-materialised-loaded-rings.xlsx')
+
+SCRIPT_C = os.path.join(HERE, 'fabrication-cables.py')
+SCRIPT_R = os.path.join(HERE, 'fabrication-rings.py')
+
+# the fabrication scripts write every sheet to a CSV file next to the workbook
+# the titles of the sheets are read from the scripts
+OUTPUTS_C = spreadsheet_filepaths(FILE_C, script_constant(SCRIPT_C, 'TITLES'))
+OUTPUTS_R = spreadsheet_filepaths(FILE_R, script_constant(SCRIPT_R, 'TITLES'))
+
+# the load stage can start from the nearest of the equilibrium states saved in this folder
+# the results then depend on the contents of the folder, which are not part of the key of the stage
+# therefore, the stage is not cached if a folder is provided
+# for example, os.path.join(CACHE, 'states')
+STATES = None
+
+# every stage depends on all modules of the package
+# such that any change of its code invalidates the cached results
+SOURCES = package_sources(digitalfutures)
+
+E = 210
+r = 2
+# material properties per cable family
+# the closed cables form the family 'ring', the other cables the family 'cable'
+# for example, {'ring': {'E': 210, 'r': 3}}
+materials = {}
+density = 22
+thickness = 0.04
+
+# ==============================================================================
+# Pipeline
+# ==============================================================================
+
+PIPELINE = Pipeline([
+    Stage('materialise', materialise, [FILE_I], [FILE_M],
+          params={'E': E, 'r': r, 'materials': materials},
+          sources=SOURCES),
+    Stage('unload', unload, [FILE_M], [FILE_U],
+          params={'kmax': 1000},
+          sources=SOURCES),
+    Stage('load', load, [FILE_U], [FILE_L],
+          params={'density': density, 'thickness': thickness, 'steps': 5, 'kmax': 15000, 'tol1': 0.01, 'states': STATES},
+          sources=SOURCES,
+          cache=STATES is None),
+    Stage('fabrication-cables', script(SCRIPT_C), [FILE_L], OUTPUTS_C,
+          sources=[SCRIPT_C] + SOURCES),
+    Stage('fabrication-rings', script(SCRIPT_R), [FILE_L], OUTPUTS_R,
+          sources=[SCRIPT_R] + SOURCES)],
+    cache=CACHE)
+
+# ==============================================================================
+# Run
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    # the names of stages that should run regardless of the cache
+    # can be passed on the command line
+    # python scripts/pipeline.py load
+
+    PIPELINE.run(force=sys.argv[1:])
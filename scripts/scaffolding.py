@@ -19,7 +19,7 @@ from compas.geometry import offset_polygon
 from compas.rpc import Proxy
 
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+from digitalfutures.artists import ShellArtist
 
 NUMERICAL = Proxy('compas.numerical')
 
@@ -4,13 +4,15 @@ from __future__ import division
 
 import os
 
-from compas.geometry import add_vectors
-from compas.geometry import scale_vector
-from compas.utilities import pairwise
+from compas.datastructures import Mesh
 from compas.datastructures import mesh_flip_cycles
+from compas.rpc import Proxy
 
 from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellArtist
+from digitalfutures.artists import ShellArtist
+
+DATASTRUCTURES = Proxy('digitalfutures.datastructures')
+GEOMETRY = Proxy('digitalfutures.geometry')
 
 # ==============================================================================
 # Initialise
@@ -34,15 +36,15 @@ IDOS = SHELL.copy()
 EDOS.name = 'Extrados'
 IDOS.name = 'Intrados'
 
-for key in SHELL.vertices():
-    normal = SHELL.vertex_normal(key)
-    xyz = SHELL.vertex_coordinates(key)
+xyz_e, xyz_i = DATASTRUCTURES.mesh_offsets_numpy(SHELL, THICKNESS)
+
+key_index = SHELL.key_index()
 
-    up = scale_vector(normal, 0.5 * THICKNESS)
-    down = scale_vector(normal, -0.5 * THICKNESS)
+for key in SHELL.vertices():
+    index = key_index[key]
 
-    EDOS.set_vertex_attributes(key, 'xyz', add_vectors(xyz, up))
-    IDOS.set_vertex_attributes(key, 'xyz', add_vectors(xyz, down))
+    EDOS.set_vertex_attributes(key, 'xyz', xyz_e[index])
+    IDOS.set_vertex_attributes(key, 'xyz', xyz_i[index])
 
 mesh_flip_cycles(IDOS)
 
@@ -50,25 +52,22 @@ mesh_flip_cycles(IDOS)
 # Construct VOLUME
 # ==============================================================================
 
-VOLUME = IDOS.copy()
-VOLUME.name = 'Volume'
+# the solid and its volume are computed from the offsets of the shell
+# the faces of the shell are passed as offsets and indices into the flat list of their vertices
 
-max_int_key = VOLUME._max_int_key + 1
-max_int_fkey = VOLUME._max_int_fkey + 1
+faces = [[key_index[key] for key in SHELL.face_vertices(fkey)] for fkey in SHELL.faces()]
 
-for key, attr in EDOS.vertices(True):
-    VOLUME.add_vertex(key=key + max_int_key, **attr)
+offsets = [0]
+for face in faces:
+    offsets.append(offsets[-1] + len(face))
 
-for fkey in EDOS.faces():
-    vertices = EDOS.face_vertices(fkey)
-    vertices = [key + max_int_key for key in vertices]
-    VOLUME.add_face(vertices)
+indices = [index for face in faces for index in face]
 
-boundary = EDOS.vertices_on_boundary(ordered=True)
-boundary.append(boundary[0])
+xyz, offsets_s, indices_s = GEOMETRY.offset_solid_numpy(xyz_e, xyz_i, offsets, indices)
 
-for a, b in pairwise(boundary):
-    VOLUME.add_face([b, a, a + max_int_key, b + max_int_key])
+VOLUME = Mesh.from_vertices_and_faces(xyz, [indices_s[i:j] for i, j in zip(offsets_s[:-1], offsets_s[1:])])
+VOLUME.name = 'Volume'
+VOLUME.attributes['volume'] = sum(GEOMETRY.offset_volumes_numpy(xyz_e, xyz_i, offsets, indices))
 
 # ==============================================================================
 # Visualise
@@ -0,0 +1,45 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import glob
+import time
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import json_to_snapshot_numpy
+
+# ==============================================================================
+# Initialise
+# ==============================================================================
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
+TEMP = os.path.join(DATA, '__temp__')
+
+FILES = [
+    os.path.join(DATA, 'data.json'),
+    os.path.join(DATA, 'fabric.json')]
+
+FILES += sorted(glob.glob(os.path.join(TEMP, 'iteration*.json')))
+FILES += sorted(glob.glob(os.path.join(TEMP, 'caged*.json')))
+FILES += [os.path.join(TEMP, 'torus4.json')]
+
+# ==============================================================================
+# Convert
+# ==============================================================================
+
+for FILE_I in FILES:
+    FILE_O = os.path.splitext(FILE_I)[0] + '.snapshot'
+
+    shell = json_to_snapshot_numpy(FILE_I, FILE_O, cls=Shell)
+
+    t0 = time.time()
+    Shell.from_snapshot(FILE_O)
+    t1 = time.time()
+
+    print("{}: {} vertices, {} faces, loaded in {:.3f}s".format(
+        os.path.relpath(FILE_O, DATA),
+        shell.number_of_vertices(),
+        shell.number_of_faces(),
+        t1 - t0))
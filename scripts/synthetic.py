@@ -0,0 +1,92 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import sys
+import time
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import shell_synthetic
+from digitalfutures.datastructures import shell_materialise_numpy
+from digitalfutures.numerical import fd_numpy
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+def equilibrium(shell):
+    key_index = shell.key_index()
+    xyz = shell.get_vertices_attributes('xyz')
+    fixed = [key_index[key] for key in shell.vertices_where({'is_anchor': True})]
+    uv = list(shell.edges_where({'is_edge': True}))
+    edges = [(key_index[u], key_index[v]) for u, v in uv]
+    q = [shell.get_edge_attribute((u, v), 'q') for u, v in uv]
+    loads = shell.get_vertices_attributes(('px', 'py', 'pz'))
+
+    xyz, q, f, l, r = fd_numpy(xyz, edges, fixed, q, loads)
+
+    for key, attr in shell.vertices(True):
+        index = key_index[key]
+        attr['x'], attr['y'], attr['z'] = xyz[index].tolist()
+        attr['rx'], attr['ry'], attr['rz'] = r[index].tolist()
+
+    for index, (u, v) in enumerate(uv):
+        shell.set_edge_attribute((u, v), 'f', f[index, 0])
+        shell.set_edge_attribute((u, v), 'l', l[index, 0])
+
+    shell.invalidate_geometry()
+
+# ==============================================================================
+# Initialise
+# ==============================================================================
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
+FILE_I = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DATA, 'data.json')
+VERTICES = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+
+NAME = os.path.splitext(os.path.basename(FILE_I))[0]
+FILE_O = os.path.join(DATA, '__temp__', 'synthetic', '{}-{}.json'.format(NAME, VERTICES))
+
+E = 210
+r = 2
+
+SHELL = Shell.from_json(FILE_I)
+
+# ==============================================================================
+# Generate
+# ==============================================================================
+
+t0 = time.time()
+
+SYNTHETIC = shell_synthetic(SHELL, vertices=VERTICES)
+SYNTHETIC.name = '{}-{}'.format(NAME, VERTICES)
+
+t1 = time.time()
+
+# ==============================================================================
+# Equilibrium and materialisation
+# ==============================================================================
+
+# the fabric has no anchors and is not a cablenet
+# its forces and lengths are the estimates of the subdivision
+
+if list(SYNTHETIC.vertices_where({'is_anchor': True})):
+    equilibrium(SYNTHETIC)
+    shell_materialise_numpy(SYNTHETIC, E=E, r=r, cables=False)
+
+t2 = time.time()
+
+# ==============================================================================
+# Export
+# ==============================================================================
+
+if not os.path.isdir(os.path.dirname(FILE_O)):
+    os.makedirs(os.path.dirname(FILE_O))
+
+SYNTHETIC.to_json(FILE_O)
+
+print("{}: {} vertices, {} faces, {} edges".format(
+    SYNTHETIC.name, SYNTHETIC.number_of_vertices(), SYNTHETIC.number_of_faces(), SYNTHETIC.number_of_edges()))
+print("generated in {:.1f}s, equilibrium in {:.1f}s".format(t1 - t0, t2 - t1))
@@ -0,0 +1,219 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import sys
+import time
+
+from multiprocessing import Pool
+
+from compas.utilities import pairwise
+from compas.datastructures import Mesh
+from compas.datastructures import mesh_quads_to_triangles
+from compas.datastructures import mesh_flip_cycles
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import mesh_unroll
+from digitalfutures.datastructures import mesh_offset_numpy
+
+# ==============================================================================
+# Helpers
+# ==============================================================================
+
+def fabric_layer(base, thickness):
+    fabric = base.copy()
+    mesh_flip_cycles(fabric)
+    fabric.invalidate_geometry()
+    xyz = mesh_offset_numpy(base, thickness)
+    key_index = base.key_index()
+    for key in base.vertices():
+        index = key_index[key]
+        fabric.set_vertex_attributes(key, 'xyz', xyz[index].tolist())
+    return fabric
+
+
+def split_ring(fabric, faces):
+    if len(faces) < 3:
+        return
+    fkey = faces[-1]
+    for u, v in fabric.face_halfedges(fkey):
+        if fabric.halfedge[v][u] == faces[0]:
+            break
+        else:
+            u = None
+            v = None
+    if u is None and v is None:
+        return
+    a = fabric.vertex_coordinates(u)
+    b = fabric.vertex_coordinates(v)
+    uu = fabric.add_vertex(x=a[0], y=a[1], z=a[2])
+    vv = fabric.add_vertex(x=b[0], y=b[1], z=b[2])
+    vertices = fabric.face_vertices(fkey)
+    i = vertices.index(u)
+    j = vertices.index(v)
+    vertices[i] = uu
+    vertices[j] = vv
+    for u, v in pairwise(vertices + vertices[:1]):
+        fabric.halfedge[u][v] = fkey
+
+
+def triangulate_strip(fabric, faces):
+    mesh = Mesh()
+    mesh.update_default_vertex_attributes(fabric.default_vertex_attributes)
+    mesh.update_default_edge_attributes(fabric.default_edge_attributes)
+    mesh.update_default_face_attributes(fabric.default_face_attributes)
+
+    for fkey in faces:
+        keys = fabric.face_vertices(fkey)
+        for key in keys:
+            if key not in mesh.vertex:
+                attr = fabric.vertex[key].copy()
+                mesh.add_vertex(key=key, attr_dict=attr)
+        attr = fabric.facedata[fkey].copy()
+        mesh.add_face(keys, fkey=fkey, attr_dict=attr)
+
+    for u, v, attr in mesh.edges(True):
+        for name in attr:
+            value = fabric.get_edge_attribute((u, v), name)
+            attr[name] = value
+
+    trimesh = mesh.copy()
+    mesh_quads_to_triangles(trimesh, check_angles=True)
+    return mesh, trimesh
+
+
+def strip_edge(trimesh):
+    for fkey in trimesh.faces_where({'count': 0}):
+        if len(trimesh.face_neighbors(fkey)) == 1:
+            root = fkey
+            break
+    else:
+        raise ValueError('The strip has no end face with count 0.')
+
+    for key in trimesh.face_vertices(root):
+        if trimesh.vertex_degree(key) == 2:
+            corner = key
+            break
+    else:
+        raise ValueError('The end face of the strip has no corner vertex.')
+
+    return corner, trimesh.face_vertex_descendant(root, corner)
+
+
+def ring_edge(mesh, faces):
+    # the end edge of the first face of the ring
+    # opposite the edge shared with the second face
+    # for closed rings, this is the edge along which the ring is cut open
+    vertices = mesh.face_vertices(faces[0])
+    halfedges = list(zip(vertices, vertices[1:] + vertices[:1]))
+    if len(faces) > 1:
+        for i, (u, v) in enumerate(halfedges):
+            if mesh.halfedge[v][u] == faces[1]:
+                return halfedges[(i + len(halfedges) // 2) % len(halfedges)]
+        raise ValueError('The first two faces of the ring are not adjacent.')
+    return halfedges[0]
+
+
+def initialise(data):
+    global FABRICS
+    FABRICS = {side: Shell.from_data(data[side]) for side in data}
+
+
+def unroll_strip(task):
+    side, panel, strip, faces = task
+
+    t0 = time.time()
+
+    quadmesh, trimesh = triangulate_strip(FABRICS[side], faces)
+
+    if panel == RING:
+        edge = ring_edge(quadmesh, faces)
+    else:
+        edge = strip_edge(trimesh)
+
+    flat = mesh_unroll(trimesh, edge)
+
+    for key, attr in quadmesh.vertices(True):
+        x, y, z = flat[key]
+        attr['x'] = x
+        attr['y'] = y
+        attr['z'] = z
+
+    name = '{}-{}'.format(panel, strip.zfill(2))
+    quadmesh.attributes['name'] = name
+    quadmesh.to_json(os.path.join(PATH_O, side, "{}.json".format(name)))
+
+    t1 = time.time()
+
+    return side, name, len(faces), t1 - t0
+
+# ==============================================================================
+# Initialise
+# ==============================================================================
+
+HERE = os.path.dirname(__file__)
+DATA = os.path.abspath(os.path.join(HERE, '..', 'data'))
+FILE_I = sys.argv[1] if len(sys.argv) > 1 else os.path.join(DATA, 'fabric.json')
+PATH_O = os.path.join(DATA, 'fabric', 'unrolled')
+
+SIDES = [('edos', +0.020), ('idos', -0.020)]
+
+PROCESSES = None
+
+# the strips of this panel are rings
+# closed rings are cut open between their first and last face before unrolling
+RING = 'RING'
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+if __name__ == '__main__':
+
+    t0 = time.time()
+
+    BASE = Shell.from_json(FILE_I)
+    mesh_flip_cycles(BASE)
+    BASE.invalidate_geometry()
+
+    # ==========================================================================
+    # Fabric layers and strips
+    # ==========================================================================
+
+    DATA_SIDES = {}
+    TASKS = []
+
+    for SIDE, THICKNESS in SIDES:
+        FABRIC = fabric_layer(BASE, THICKNESS)
+        GROUPS = FABRIC.face_groups(['panel', 'strip'], sort_by='count')
+
+        for (panel, strip), faces in GROUPS.items():
+            if panel == RING:
+                split_ring(FABRIC, faces)
+
+        for (panel, strip), faces in GROUPS.items():
+            TASKS.append((SIDE, panel, strip, faces))
+
+        DATA_SIDES[SIDE] = FABRIC.data
+
+        if not os.path.isdir(os.path.join(PATH_O, SIDE)):
+            os.makedirs(os.path.join(PATH_O, SIDE))
+
+    t1 = time.time()
+
+    # ==========================================================================
+    # Unroll
+    # ==========================================================================
+
+    POOL = Pool(PROCESSES, initialise, (DATA_SIDES, ))
+
+    for side, name, count, seconds in POOL.imap_unordered(unroll_strip, TASKS):
+        print("{}/{}: {} faces in {:.3f}s".format(side, name, count, seconds))
+
+    POOL.close()
+    POOL.join()
+
+    t2 = time.time()
+
+    print("{} strips: prepared in {:.3f}s, unrolled in {:.3f}s".format(len(TASKS), t1 - t0, t2 - t1))
@@ -5,26 +5,22 @@ from __future__ import division
 import os
 import compas
 
-from collections import deque
-
 from functools import partial
-from compas.geometry import Frame
-from compas.geometry import Transformation
-from compas.geometry import cross_vectors
-from compas.geometry import normalize_vector
-from compas.geometry import Point
 from compas.geometry import offset_polygon
-from compas.geometry import scale_vector
-from compas.geometry import add_vectors
 from compas.utilities import flatten
 from compas.utilities import pairwise
 from compas.datastructures import Mesh
 from compas.datastructures import mesh_quads_to_triangles
 from compas.datastructures import mesh_flip_cycles
+from compas.rpc import Proxy
 # from compas_plotters import MeshPlotter
-from compas_fofin.datastructures import Shell
-from compas_fofin.rhino import ShellHelper
-from compas_fofin.rhino import ShellArtist
+
+from digitalfutures.datastructures import Shell
+from digitalfutures.artists import ShellArtist
+from digitalfutures.utilities import profile_section
+from digitalfutures.datastructures import mesh_unroll
+
+DATASTRUCTURES = Proxy('digitalfutures.datastructures')
 
 # ==============================================================================
 # Helpers
@@ -58,7 +54,6 @@ def triangulate_strips(zone):
 def unroll(zone):
     unrolled = []
     for quadmesh, trimesh in zone:
-        flatmesh = trimesh.copy()
         fkeys = list(trimesh.faces_where({'count': 0}))
 
         for fkey in fkeys:
@@ -77,56 +72,10 @@ def unroll(zone):
         u = corner
         v = trimesh.face_vertex_descendant(root, u)
 
-        origin = trimesh.vertex_coordinates(u)
-        zaxis = trimesh.face_normal(root, unitized=True)
-        xaxis = normalize_vector(trimesh.edge_direction(u, v))
-        yaxis = normalize_vector(cross_vectors(zaxis, xaxis))
-        frame = Frame(origin, xaxis, yaxis)
-
-        frame_to = Frame.worldXY()
-
-        T = Transformation.from_frame_to_frame(frame, frame_to)
-
-        for key in trimesh.face_vertices(root):
-            x, y, z = trimesh.vertex_coordinates(key)
-            point = Point(x, y, z)
-            point.transform(T)
-            flatmesh.set_vertex_attributes(key, 'xyz', point)
-
-        tovisit = deque([root])
-        visited = set([root])
-        while tovisit:
-            fkey = tovisit.popleft()
-            for u, v in trimesh.face_halfedges(fkey):
-                nbr = trimesh.halfedge[v][u]
-                if nbr is None:
-                    continue
-                if nbr in visited:
-                    continue
-                tovisit.append(nbr)
-                visited.add(nbr)
-
-                origin = trimesh.vertex_coordinates(v)
-                zaxis = trimesh.face_normal(nbr, unitized=True)
-                xaxis = normalize_vector(trimesh.edge_direction(v, u))
-                yaxis = normalize_vector(cross_vectors(xaxis, zaxis))
-                frame = Frame(origin, xaxis, yaxis)
-
-                origin = flatmesh.vertex_coordinates(v)
-                zaxis = [0, 0, 1.0]
-                xaxis = normalize_vector(flatmesh.edge_direction(v, u))
-                yaxis = normalize_vector(cross_vectors(xaxis, zaxis))
-                frame_to = Frame(origin, xaxis, yaxis)
-
-                T = Transformation.from_frame_to_frame(frame, frame_to)
-                w = trimesh.face_vertex_ancestor(nbr, v)
-                x, y, z = trimesh.vertex_coordinates(w)
-                point = Point(x, y, z)
-                point.transform(T)
-                flatmesh.set_vertex_attributes(w, 'xyz', point)
+        flat = mesh_unroll(trimesh, (u, v))
 
         for key, attr in quadmesh.vertices(True):
-            x, y, z = flatmesh.vertex_coordinates(key)
+            x, y, z = flat[key]
             attr['x'] = x
             attr['y'] = y
             attr['z'] = z
@@ -139,12 +88,15 @@ def unroll(zone):
 # Initialise
 # ==============================================================================
 
+profile_section('Initialise')
+
 HERE = os.path.dirname(__file__)
 DATA = os.path.join(HERE, '..', 'data')
 FILE_I = os.path.join(DATA, 'fabric.json')
 
 BASE = Shell.from_json(FILE_I)
 mesh_flip_cycles(BASE)
+BASE.invalidate_geometry()
 
 SIDE = 'edos'
 SEEM = -0.020
@@ -156,73 +108,58 @@ THICKNESS = -0.020 if SIDE == 'idos' else +0.020
 # Fabric layer from extended dual
 # ==============================================================================
 
+profile_section('Fabric layer from extended dual')
+
 FABRIC = BASE.copy()
 mesh_flip_cycles(FABRIC)
+FABRIC.invalidate_geometry()
+
+xyz = DATASTRUCTURES.mesh_offset_numpy(BASE, THICKNESS)
+
+key_index = BASE.key_index()
 
 for key in BASE.vertices():
-    normal = BASE.vertex_normal(key)
-    xyz = BASE.vertex_coordinates(key)
-    offset = scale_vector(normal, THICKNESS)
-    point = add_vectors(xyz, offset)
-    FABRIC.set_vertex_attributes(key, 'xyz', point)
+    index = key_index[key]
+    FABRIC.set_vertex_attributes(key, 'xyz', xyz[index])
 
 # ==============================================================================
 # Identify strips
 # ==============================================================================
 
-SOUTH = [
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'SOUTH', 'strip': '04'}))]
-
-WEST = [
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'WEST', 'strip': '04'}))]
-
-NORTH = [
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'NORTH', 'strip': '04'}))]
+profile_section('Identify strips')
 
-SW = [
-    list(FABRIC.faces_where({'panel': 'SW', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'WS', 'strip': '00'}))]
+GROUPS = FABRIC.face_groups(['panel', 'strip'], sort_by='count')
 
-NW = [
-    list(FABRIC.faces_where({'panel': 'WN', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'NW', 'strip': '00'}))]
+SOUTH = list(FABRIC.face_groups('strip', {'panel': 'SOUTH'}, sort_by='count').values())
+WEST = list(FABRIC.face_groups('strip', {'panel': 'WEST'}, sort_by='count').values())
+NORTH = list(FABRIC.face_groups('strip', {'panel': 'NORTH'}, sort_by='count').values())
 
-# ==============================================================================
-# Sort faces
-# ==============================================================================
+SW = [
+    GROUPS['SW', '00'],
+    GROUPS['WS', '00']]
 
-SOUTH_sorted = [sorted(faces, key=lambda fkey: FABRIC.get_face_attribute(fkey, 'count')) for faces in SOUTH]
-WEST_sorted = [sorted(faces, key=lambda fkey: FABRIC.get_face_attribute(fkey, 'count')) for faces in WEST]
-NORTH_sorted = [sorted(faces, key=lambda fkey: FABRIC.get_face_attribute(fkey, 'count')) for faces in NORTH]
-SW_sorted = [sorted(faces, key=lambda fkey: FABRIC.get_face_attribute(fkey, 'count')) for faces in SW]
-NW_sorted = [sorted(faces, key=lambda fkey: FABRIC.get_face_attribute(fkey, 'count')) for faces in NW]
+NW = [
+    GROUPS['WN', '00'],
+    GROUPS['NW', '00']]
 
 # ==============================================================================
 # Triangulate
 # ==============================================================================
 
-SOUTH_triangulated = triangulate_strips(SOUTH_sorted)
-WEST_triangulated = triangulate_strips(WEST_sorted)
-NORTH_triangulated = triangulate_strips(NORTH_sorted)
-SW_triangulated = triangulate_strips(SW_sorted)
-NW_triangulated = triangulate_strips(NW_sorted)
+profile_section('Triangulate')
+
+SOUTH_triangulated = triangulate_strips(SOUTH)
+WEST_triangulated = triangulate_strips(WEST)
+NORTH_triangulated = triangulate_strips(NORTH)
+SW_triangulated = triangulate_strips(SW)
+NW_triangulated = triangulate_strips(NW)
 
 # ==============================================================================
 # Unroll
 # ==============================================================================
 
+profile_section('Unroll')
+
 SOUTH_unrolled = unroll(SOUTH_triangulated)
 WEST_unrolled = unroll(WEST_triangulated)
 NORTH_unrolled = unroll(NORTH_triangulated)
@@ -233,6 +170,8 @@ NW_unrolled = unroll(NW_triangulated)
 # Rename
 # ==============================================================================
 
+profile_section('Rename')
+
 for mesh in SOUTH_unrolled:
     fkey = mesh.get_any_face()
     strip = mesh.get_face_attribute(fkey, 'strip')
@@ -311,14 +250,18 @@ for mesh in NW_unrolled:
 
 ARTIST = ShellArtist(None)
 
+FACEGROUPS = []
+
 for mesh in SOUTH_unrolled:
     points = [mesh.vertex_coordinates(key) for key in mesh.vertices_on_boundary(ordered=True)]
     polygon = offset_polygon(points, SEEM)
-    polygons = [{'points': polygon + polygon[:1]}]
-
-    ARTIST.mesh = mesh
-    ARTIST.layer = "Unrolled::{}::{}".format(SIDE, mesh.attributes['name'])
-    ARTIST.clear_layer()
-    ARTIST.draw_faces()
-    ARTIST.draw_facelabels(text={key: "{}".format(attr['count']) for key, attr in mesh.faces(True)})
-    ARTIST.draw_polygons(polygons)
+
+    FACEGROUPS.append({
+        'mesh'     : mesh,
+        'layer'    : "Unrolled::{}::{}".format(SIDE, mesh.attributes['name']),
+        'clear'    : True,
+        'labels'   : {key: "{}".format(attr['count']) for key, attr in mesh.faces(True)},
+        'polygons' : [{'points': polygon + polygon[:1]}]})
+
+ARTIST.draw_facegroups(FACEGROUPS)
+ARTIST.redraw()
@@ -8,24 +8,22 @@ import compas
 from collections import deque
 
 from functools import partial
-from compas.geometry import Frame
-from compas.geometry import Transformation
-from compas.geometry import cross_vectors
-from compas.geometry import normalize_vector
-from compas.geometry import Point
 from compas.geometry import offset_polygon
-from compas.geometry import scale_vector
-from compas.geometry import add_vectors
 from compas.utilities import flatten
 from compas.utilities import pairwise
 from compas.datastructures import Mesh
 from compas.datastructures import mesh_quads_to_triangles
 from compas.datastructures import mesh_flip_cycles
+from compas.rpc import Proxy
 from compas_plotters import MeshPlotter
-from compas_fofin.datastructures import Shell
 from compas_fofin.rhino import ShellHelper
 from compas_fofin.rhino import ShellArtist
 
+from digitalfutures.datastructures import Shell
+from digitalfutures.datastructures import mesh_unroll
+
+DATASTRUCTURES = Proxy('digitalfutures.datastructures')
+
 # ==============================================================================
 # Helpers
 # ==============================================================================
@@ -84,69 +82,11 @@ def triangulate_strips(zone):
 
 def unroll(meshes, edge):
     quadmesh, trimesh = meshes
-    flatmesh = trimesh.copy()
-
-    u, v = edge
-    root = trimesh.halfedge[u][v]
-    if root is None:
-        root = trimesh.halfedge[v][u]
-        u, v = v, u
-
-    origin = trimesh.vertex_coordinates(u)
-    zaxis = trimesh.face_normal(root, unitized=True)
-    xaxis = normalize_vector(trimesh.edge_direction(u, v))
-    yaxis = normalize_vector(cross_vectors(zaxis, xaxis))
-    frame = Frame(origin, xaxis, yaxis)
-
-    frame_to = Frame.worldXY()
-
-    T = Transformation.from_frame_to_frame(frame, frame_to)
-
-    for key in trimesh.face_vertices(root):
-        x, y, z = trimesh.vertex_coordinates(key)
-        point = Point(x, y, z)
-        point.transform(T)
-        flatmesh.set_vertex_attributes(key, 'xyz', point)
-
-    tovisit = list(trimesh.faces())
-    tovisit.remove(root)
-
-    fkey = root
-
-    while tovisit:
-        for u, v in trimesh.face_halfedges(fkey):
-            nbr = trimesh.halfedge[v][u]
-            if nbr is None:
-                continue
-            if nbr not in tovisit:
-                continue
-            tovisit.remove(nbr)
-            break
-
-        fkey = nbr
-        u, v = v, u
-
-        origin = trimesh.vertex_coordinates(u)
-        zaxis = trimesh.face_normal(fkey, unitized=True)
-        xaxis = normalize_vector(trimesh.edge_direction(u, v))
-        yaxis = normalize_vector(cross_vectors(xaxis, zaxis))
-        frame = Frame(origin, xaxis, yaxis)
-
-        origin = flatmesh.vertex_coordinates(u)
-        zaxis = [0, 0, 1.0]
-        xaxis = normalize_vector(flatmesh.edge_direction(u, v))
-        yaxis = normalize_vector(cross_vectors(xaxis, zaxis))
-        frame_to = Frame(origin, xaxis, yaxis)
 
-        T = Transformation.from_frame_to_frame(frame, frame_to)
-        w = trimesh.face_vertex_ancestor(fkey, u)
-        x, y, z = trimesh.vertex_coordinates(w)
-        point = Point(x, y, z)
-        point.transform(T)
-        flatmesh.set_vertex_attributes(w, 'xyz', point)
+    flat = mesh_unroll(trimesh, edge)
 
     for key, attr in quadmesh.vertices(True):
-        x, y, z = flatmesh.vertex_coordinates(key)
+        x, y, z = flat[key]
         attr['x'] = x
         attr['y'] = y
         attr['z'] = z
@@ -163,6 +103,7 @@ FILE_I = os.path.join(DATA, 'fabric.json')
 
 BASE = Shell.from_json(FILE_I)
 mesh_flip_cycles(BASE)
+BASE.invalidate_geometry()
 
 SIDE = 'edos'
 SEEM = -0.020
@@ -176,37 +117,21 @@ THICKNESS = -0.020 if SIDE == 'idos' else +0.020
 
 FABRIC = BASE.copy()
 mesh_flip_cycles(FABRIC)
+FABRIC.invalidate_geometry()
+
+xyz = DATASTRUCTURES.mesh_offset_numpy(BASE, THICKNESS)
+
+key_index = BASE.key_index()
 
 for key in BASE.vertices():
-    normal = BASE.vertex_normal(key)
-    xyz = BASE.vertex_coordinates(key)
-    offset = scale_vector(normal, THICKNESS)
-    point = add_vectors(xyz, offset)
-    FABRIC.set_vertex_attributes(key, 'xyz', point)
+    index = key_index[key]
+    FABRIC.set_vertex_attributes(key, 'xyz', xyz[index])
 
 # ==============================================================================
 # Triangulate
 # ==============================================================================
 
-RING = [
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '00'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '01'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '02'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '03'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '04'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '05'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '06'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '07'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '08'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '09'})),
-    list(FABRIC.faces_where({'panel': 'RING', 'strip': '10'})),
-]
-
-RING_sorted = []
-
-for faces in RING:
-    strip = sorted(faces, key=lambda fkey: FABRIC.get_face_attribute(fkey, 'count'))
-    RING_sorted.append(strip)
+RING_sorted = list(FABRIC.face_groups('strip', {'panel': 'RING'}, sort_by='count').values())
 
 split_ring(RING_sorted[2])
 split_ring(RING_sorted[3])